@@ -1,8 +1,11 @@
 from fastapi import APIRouter
 
-from api.v1.jobs import route_jobs
+from api.v1.jobs import route_jobs, route_jobs_async
 from api.v1.users import route_users
 from api.v1.login import route_login
+from api.v1.monitoring import route_health, route_metrics, route_monitoring
+from api.v1.saved_searches import route_saved_searches
+from config import config_object
 
 # this acts like the main instance of FastAPI! think of it as a 'mini FastAPI' class
 # You then 'include' this in the main instance of FastAPI
@@ -11,6 +14,19 @@ api_router = APIRouter()
 # include all the APIRouter instances from other API file!
 # with tags... we're just adding metadata, saying that this route belongs to 'users'
 api_router.include_router(route_users.router, prefix='/users', tags=['users'])
-api_router.include_router(route_jobs.router, prefix='/jobs', tags=['jobs'])
+
+# DATABASE_ASYNC_MODE picks which implementation serves /jobs, same paths either way. Handy to benchmark both.
+if config_object.DATABASE_ASYNC_MODE:
+    api_router.include_router(route_jobs_async.router, prefix='/jobs', tags=['jobs'])
+else:
+    api_router.include_router(route_jobs.router, prefix='/jobs', tags=['jobs'])
+
+api_router.include_router(route_saved_searches.router, prefix='/saved-searches', tags=['saved-searches'])
 api_router.include_router(route_login.router, prefix='/login', tags=['login'])
+api_router.include_router(route_monitoring.router, prefix='/monitoring', tags=['monitoring'])
+
+# No prefix, Prometheus scrapes /metrics by default.
+api_router.include_router(route_metrics.router, tags=['monitoring'])
 
+# No prefix either, /healthz and /readyz are where probes look by convention.
+api_router.include_router(route_health.router, tags=['monitoring'])
@@ -1,26 +1,67 @@
-from typing import List, Optional
+from datetime import date
+from typing import List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-
-from api.v1.login.route_login import get_current_user_from_token
-from api_models.job import ShowJob, JobCreate, UpdateJob
+from starlette.concurrency import run_in_threadpool
+
+from api.v1.login.route_login import get_current_principal_from_token
+from api_models.job import ShowJob, JobCreate, UpdateJob, FacetedJobPage, JobFilters, JobPage, JobBulkCreateResult, JobSuggestions, JobStats
+from api_models.job_serializer import InvalidFieldsError, job_serializer
+from api_models.token import TokenPrincipal
+from config import config_object
+from database.daos.job_dao import JobMutationStatus
 from database.orm_models.job import Job
-from database.orm_models.user import User
 from database.session import get_database
+from services.conditional_request_service import JobValidator, conditional_request_service
+from services.cursor_service import InvalidCursorError
+from services.job_event_service import JobEventSubscribersExceededError, job_event_service
+from services.job_export_service import ExportFormat, job_export_service
+from services.job_import_service import ImportBodyTooLargeError, InvalidImportBodyError, job_import_service
 from services.job_service import job_service
+from services.job_stats_service import job_stats_service
 
 router: APIRouter = APIRouter()
 
 """
-Restricted endpoints are denoted with `user: User = Depends(get_current_user_from_token)`
+Restricted endpoints are denoted with `user: TokenPrincipal = Depends(get_current_principal_from_token)`
+
+Other endpoints that does not include `user: TokenPrincipal = Depends(get_current_principal_from_token)` will be available for access to anyone.
 
-Other endpoints that does not include `user: User = Depends(get_current_user_from_token)` will be available for access to anyone.
+The principal comes straight from the verified JWT claims, no user query per request.
+Use `user: User = Depends(get_current_user_from_token)` instead only if the route needs the full `User` row.
 """
 
 
+def get_sparse_fields(
+    fields: Optional[str] = Query(None, description="Comma separated, ex. `title,company,description_snippet`. Default: every field.")
+) -> Optional[Tuple[str, ...]]:
+    """
+    The `fields=` of list endpoints, see api_models/job_serializer.py. Shared with route_jobs_async.py.
+    """
+    try:
+        return job_serializer.parse_fields(fields)
+    except InvalidFieldsError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+
+
+def get_job_filters(
+    company: Optional[str] = Query(None, max_length=200),
+    location: Optional[str] = Query(None, max_length=200),
+    owner_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, description="Inclusive, on `date_posted`."),
+    date_to: Optional[date] = Query(None, description="Inclusive, on `date_posted`."),
+    is_active: bool = True
+) -> JobFilters:
+    """
+    The filters of list-jobs, exact values, AND-ed, run in SQL (see JobDao._job_filter_clauses). Shared with route_jobs_async.py.
+    """
+    return JobFilters(company=company, location=location, owner_id=owner_id, date_from=date_from, date_to=date_to, is_active=is_active)
+
+
 @router.post("/create-job", response_model=ShowJob)
-def create_job(job: JobCreate, user: User = Depends(get_current_user_from_token), session: Session = Depends(get_database)) -> ShowJob:
+def create_job(job: JobCreate, user: TokenPrincipal = Depends(get_current_principal_from_token), session: Session = Depends(get_database)) -> Response:
     if not user:
         HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
@@ -29,126 +70,255 @@ def create_job(job: JobCreate, user: User = Depends(get_current_user_from_token)
     if not job:
         HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Job could not be created.")
 
-    # job is an ORM Object, but since we put orm_mode = True, it will be converted to a dictionary object. But we shall return as ShowJob.
-    # Pydantic can only parse Pydantic objects, not other objects!
-    return ShowJob(
-        title=job.title,
-        company=job.company,
-        company_url=job.company_url,
-        description=job.description,
-        location=job.location,
-        date_posted=job.date_posted,
-        is_active=job.is_active
-    )
+    # Straight from the ORM object to JSON bytes, see api_models/job_serializer.py. No ShowJob(...) + response_model re-validation.
+    return job_serializer.response(job_serializer.show_job(job))
+
+
+@router.post("/bulk-create", response_model=JobBulkCreateResult)
+async def bulk_create_jobs(
+    request: Request,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> JobBulkCreateResult:
+    """
+    Body: a JSON array of jobs, or NDJSON (Content-Type: application/x-ndjson) with one job per line.
+    Jobs are inserted JOBS_BULK_BATCH_SIZE at a time. Bad items are listed in `errors` by index, the rest still go in.
+
+    `async def` so the NDJSON body can be streamed, the sync inserts run on the threadpool one batch at a time.
+    """
+    async def insert_batch(jobs: List[JobCreate]) -> List[Union[int, str]]:
+        return await run_in_threadpool(job_service.create_new_jobs, jobs, user.id, session)
+
+    try:
+        return await job_import_service.import_jobs(
+            job_import_service.iter_items(request.headers.get("content-type"), request.stream()),
+            insert_batch
+        )
+    except ImportBodyTooLargeError as error:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(error))
+    except InvalidImportBodyError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
 
 @router.get("/get-job/{job_id}", response_model=ShowJob)
 def get_job_by_id(
     job_id: int,
-    user: User = Depends(get_current_user_from_token),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
     session: Session = Depends(get_database)
-) -> ShowJob:
+) -> Response:
     if not user:
         HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
-    job: Job = job_service.retrieve_job(job_id, session)
+    # ETag / Last-Modified from an index-only query, a 304 needs nothing else. See services/conditional_request_service.py.
+    validator: Optional[JobValidator] = job_service.retrieve_job_validator(job_id, session)
 
-    if not job:
+    if validator is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
 
-    return ShowJob(
-        title=job.title,
-        company=job.company,
-        company_url=job.company_url,
-        description=job.description,
-        location=job.location,
-        date_posted=job.date_posted,
-        is_active=job.is_active
-    )
+    if conditional_request_service.is_not_modified(validator, if_none_match, if_modified_since):
+        return conditional_request_service.not_modified_response(validator)
+
+    # Cached JSON bytes, see services/job_cache_service.py.
+    content: Optional[bytes] = job_service.retrieve_job_json(job_id, validator, session)
+
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
 
+    return job_serializer.response(content, headers=conditional_request_service.headers(validator))
 
-@router.get("/list-jobs", response_model=List[ShowJob])
+
+@router.get("/list-jobs", response_model=FacetedJobPage)
 def list_jobs(
-    user: User = Depends(get_current_user_from_token),
+    limit: int = Query(config_object.JOBS_PAGE_SIZE_DEFAULT, ge=1),
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_sparse_fields),
+    filters: JobFilters = Depends(get_job_filters),
+    facets: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
     session: Session = Depends(get_database)
-) -> List[ShowJob]:
+) -> Response:
+    """
+    Keyset pagination: pass the `next_cursor` of the previous response as `cursor` to get the next page.
+    `limit` is capped at JOBS_PAGE_SIZE_MAX.
+    Send the page's ETag back as `If-None-Match` to get a 304 when the page did not change.
+    `fields=title,company,description_snippet` returns (and reads from the database) only those fields.
+    `company`, `location`, `owner_id`, `date_from` / `date_to` and `is_active` filter the jobs, keep them for the next pages.
+    `facets=true` adds the company / location / date_posted counts of every matching job (same query as the ETag).
+    """
     if not user:
         HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
-    jobs: List[Job] = job_service.list_jobs(session)
+    limit = min(limit, config_object.JOBS_PAGE_SIZE_MAX)
+    facets_limit: Optional[int] = config_object.JOB_FACETS_LIMIT if facets else None
+
+    try:
+        # with `facets=true` the facet counts come back from the same query as the page's ETag.
+        validator, facet_counts = job_service.list_jobs_page_validator(session, limit, cursor, fields, filters, facets_limit)
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
 
-    if not jobs:
+    if validator is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jobs not found.")
 
-    show_jobs: List[ShowJob] = list()
-
-    for job in jobs:
-        show_jobs.append(
-            ShowJob(
-                title=job.title,
-                company=job.company,
-                company_url=job.company_url,
-                description=job.description,
-                location=job.location,
-                date_posted=job.date_posted,
-                is_active=job.is_active,
-            )
+    if conditional_request_service.is_not_modified(validator, if_none_match):
+        return conditional_request_service.not_modified_response(validator)
+
+    content: Optional[bytes] = job_service.list_jobs_page_json(session, limit, cursor, validator, fields, filters, facet_counts)
+
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jobs not found.")
+
+    return job_serializer.response(content, headers=conditional_request_service.headers(validator))
+
+
+@router.get("/export")
+def export_jobs(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    gzip: bool = False,
+    is_active: Optional[bool] = None,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> StreamingResponse:
+    """
+    The whole job table as NDJSON or CSV, streamed from a server-side cursor, constant memory on our side.
+    `gzip=true` compresses on the fly (Content-Encoding: gzip).
+
+    The session stays open until the last byte is sent, dependencies with `yield` exit after the response.
+    """
+    batches = job_service.stream_jobs(session, config_object.JOBS_EXPORT_BATCH_SIZE, is_active)
+
+    return StreamingResponse(
+        job_export_service.iter_export(batches, export_format, gzip),
+        media_type=job_export_service.media_type(export_format),
+        headers={"Content-Encoding": "gzip"} if gzip else None
+    )
+
+
+@router.get("/suggest", response_model=JobSuggestions)
+async def suggest_jobs(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(config_object.JOB_SUGGEST_LIMIT_DEFAULT, ge=1),
+    field: Optional[str] = Query(None, pattern="^(title|company|location)$"),
+    user: TokenPrincipal = Depends(get_current_principal_from_token)
+) -> Response:
+    """
+    Typeahead: job titles, companies and locations with a word starting with `prefix`, most jobs first.
+    `limit` is capped at JOB_SUGGEST_LIMIT_MAX. Answered from memory (services/job_suggest_service.py), no database,
+    so `async def` without a session, not even a threadpool hop.
+    """
+    return job_serializer.response(job_serializer.suggestions(job_service.suggest(prefix, limit, field)))
+
+
+@router.get("/stats", response_model=JobStats)
+def get_job_stats(
+    limit: int = Query(config_object.JOB_STATS_LIMIT_DEFAULT, ge=1),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> Response:
+    """
+    Active jobs per company, per location and per posting date, most jobs first, at most `limit` values each
+    (capped at JOB_STATS_LIMIT_MAX). Read from counters every job write keeps up to date (database/daos/job_stat_dao.py),
+    one small query, no GROUP BY over the jobs.
+    """
+    limit = min(limit, config_object.JOB_STATS_LIMIT_MAX)
+    return job_serializer.response(job_serializer.job_stats(job_stats_service.job_stats(limit, session)))
+
+
+@router.get("/stream")
+async def stream_job_events(
+    last_event_id: Optional[str] = Header(None),
+    user: TokenPrincipal = Depends(get_current_principal_from_token)
+) -> StreamingResponse:
+    """
+    Server-Sent Events: `created` / `updated` / `deleted` as jobs change, the job's headline columns as data.
+    Reconnect with the last `id:` as Last-Event-ID to get the events missed meanwhile. A `reset` event means they are
+    gone (reload list-jobs), a `dropped` event that this client fell too far behind. See services/job_event_service.py.
+    """
+    try:
+        subscriber, backlog = job_event_service.subscribe(last_event_id)
+    except JobEventSubscribersExceededError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open job streams, please retry.",
+            headers={"Retry-After": "5"},
         )
 
-    return show_jobs
+    return StreamingResponse(
+        job_event_service.stream(subscriber, backlog),
+        media_type="text/event-stream",
+        # X-Accel-Buffering | nginx would otherwise hold events back until its buffer fills up.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/search", response_model=JobPage)
+def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(config_object.JOBS_PAGE_SIZE_DEFAULT, ge=1),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = True,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_sparse_fields),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> Response:
+    """
+    Full-text search over title, company, description and location, best match first.
+    Pass `next_cursor` back as `cursor` for the next page. An empty `items` list means nothing matched.
+    `fields=` works like in list-jobs.
+    """
+    limit = min(limit, config_object.JOBS_PAGE_SIZE_MAX)
+
+    try:
+        jobs, next_cursor = job_service.search_jobs_page(session, q, limit, cursor, is_active, date_from, date_to, fields)
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+    return job_serializer.response(job_serializer.job_page(jobs, next_cursor, fields))
 
 
 @router.put("/update-job/{job_id}", response_model=ShowJob)
 def update_job_by_id(
     job_id: int,
     update_job: UpdateJob,
-    user: User = Depends(get_current_user_from_token),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
     session: Session = Depends(get_database)
-) -> ShowJob:
+) -> Response:
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
-    db_job: Job = job_service.retrieve_job(job_id, session)
+    # One statement: the UPDATE only matches if the user owns the job (or is a superuser).
+    mutation_status, updated_job = job_service.update_job_by_id(job_id, update_job, user, session)
 
-    if not db_job:
+    if mutation_status == JobMutationStatus.NOT_FOUND:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
 
-    if db_job.owner_id == user.id or user.is_superuser:
-        updated_job: Optional[Job] = job_service.update_job_by_id(job_id, update_job, user, session)
-
-        if not updated_job:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not updated.")
-
-        if updated_job:
-            return ShowJob(
-                title=updated_job.title,
-                company=updated_job.company,
-                company_url=updated_job.company_url,
-                description=updated_job.description,
-                location=updated_job.location,
-                date_posted=updated_job.date_posted,
-                is_active=updated_job.is_active
-            )
-    else:
+    if mutation_status == JobMutationStatus.FORBIDDEN:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is not owner of job.")
 
+    return job_serializer.response(job_serializer.show_job(updated_job))
+
 
 @router.delete("/delete-job/{job_id}")
 def delete_job_by_id(
     job_id: int,
-    user: User = Depends(get_current_user_from_token),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
     session: Session = Depends(get_database)
 ):
     if not user:
         HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
-    db_job: Job = job_service.retrieve_job(job_id, session)
+    # One statement: the DELETE only matches if the user owns the job (or is a superuser).
+    mutation_status: JobMutationStatus = job_service.delete_job_by_id(job_id, user, session)
 
-    if not db_job:
+    if mutation_status == JobMutationStatus.NOT_FOUND:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
 
-    if db_job.owner_id == user.id or user.is_superuser:
-        job_service.delete_job_by_id(job_id, session)
-        return f"Success, job {job_id} has been deleted."
-    else:
+    if mutation_status == JobMutationStatus.FORBIDDEN:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is not owner of job.")
+
+    return f"Success, job {job_id} has been deleted."
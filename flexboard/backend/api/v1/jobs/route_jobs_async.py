@@ -0,0 +1,252 @@
+from datetime import date
+from typing import List, Optional, Tuple, Union
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.v1.jobs.route_jobs import get_job_filters, get_sparse_fields
+from api.v1.login.route_login import get_current_principal_from_token
+from api_models.job import ShowJob, JobCreate, UpdateJob, FacetedJobPage, JobFilters, JobPage, JobBulkCreateResult, JobSuggestions, JobStats
+from api_models.job_serializer import job_serializer
+from api_models.token import TokenPrincipal
+from config import config_object
+from database.daos.job_dao import JobMutationStatus
+from database.orm_models.job import Job
+from database.session import get_async_database
+from services.conditional_request_service import JobValidator, conditional_request_service
+from services.cursor_service import InvalidCursorError
+from services.job_event_service import JobEventSubscribersExceededError, job_event_service
+from services.job_export_service import ExportFormat, job_export_service
+from services.job_import_service import ImportBodyTooLargeError, InvalidImportBodyError, job_import_service
+from services.job_service import job_service
+from services.job_stats_service import job_stats_service
+
+router: APIRouter = APIRouter()
+
+"""
+Async twin of `route_jobs.py`, mounted instead of it when DATABASE_ASYNC_MODE is on (see api/api_routes.py).
+
+Same paths, same request / response models. The difference:
+- route_jobs.py       | `def` routes, sync Session, run on Starlette's threadpool (40 threads by default).
+- route_jobs_async.py | `async def` routes, AsyncSession, run on the event loop, no threadpool hop.
+
+Job payloads go through `job_serializer` (api_models/job_serializer.py) in both files.
+"""
+
+
+@router.post("/create-job", response_model=ShowJob)
+async def create_job(
+    job: JobCreate,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> Response:
+    job: Job = await job_service.create_new_job_async(job, user.id, session)
+
+    if not job:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Job could not be created.")
+
+    return job_serializer.response(job_serializer.show_job(job))
+
+
+@router.post("/bulk-create", response_model=JobBulkCreateResult)
+async def bulk_create_jobs(
+    request: Request,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> JobBulkCreateResult:
+    async def insert_batch(jobs: List[JobCreate]) -> List[Union[int, str]]:
+        return await job_service.create_new_jobs_async(jobs, user.id, session)
+
+    try:
+        return await job_import_service.import_jobs(
+            job_import_service.iter_items(request.headers.get("content-type"), request.stream()),
+            insert_batch
+        )
+    except ImportBodyTooLargeError as error:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(error))
+    except InvalidImportBodyError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+
+
+@router.get("/get-job/{job_id}", response_model=ShowJob)
+async def get_job_by_id(
+    job_id: int,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> Response:
+    validator: Optional[JobValidator] = await job_service.retrieve_job_validator_async(job_id, session)
+
+    if validator is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+
+    if conditional_request_service.is_not_modified(validator, if_none_match, if_modified_since):
+        return conditional_request_service.not_modified_response(validator)
+
+    content: Optional[bytes] = await job_service.retrieve_job_json_async(job_id, validator, session)
+
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+
+    return job_serializer.response(content, headers=conditional_request_service.headers(validator))
+
+
+@router.get("/list-jobs", response_model=FacetedJobPage)
+async def list_jobs(
+    limit: int = Query(config_object.JOBS_PAGE_SIZE_DEFAULT, ge=1),
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_sparse_fields),
+    filters: JobFilters = Depends(get_job_filters),
+    facets: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> Response:
+    limit = min(limit, config_object.JOBS_PAGE_SIZE_MAX)
+    facets_limit: Optional[int] = config_object.JOB_FACETS_LIMIT if facets else None
+
+    try:
+        # with `facets=true` the facet counts come back from the same query as the page's ETag.
+        validator, facet_counts = await job_service.list_jobs_page_validator_async(session, limit, cursor, fields, filters, facets_limit)
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+    if validator is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jobs not found.")
+
+    if conditional_request_service.is_not_modified(validator, if_none_match):
+        return conditional_request_service.not_modified_response(validator)
+
+    content: Optional[bytes] = await job_service.list_jobs_page_json_async(session, limit, cursor, validator, fields, filters, facet_counts)
+
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jobs not found.")
+
+    return job_serializer.response(content, headers=conditional_request_service.headers(validator))
+
+
+@router.get("/export")
+async def export_jobs(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    gzip: bool = False,
+    is_active: Optional[bool] = None,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> StreamingResponse:
+    batches = job_service.stream_jobs_async(session, config_object.JOBS_EXPORT_BATCH_SIZE, is_active)
+
+    return StreamingResponse(
+        job_export_service.iter_export_async(batches, export_format, gzip),
+        media_type=job_export_service.media_type(export_format),
+        headers={"Content-Encoding": "gzip"} if gzip else None
+    )
+
+
+@router.get("/suggest", response_model=JobSuggestions)
+async def suggest_jobs(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(config_object.JOB_SUGGEST_LIMIT_DEFAULT, ge=1),
+    field: Optional[str] = Query(None, pattern="^(title|company|location)$"),
+    user: TokenPrincipal = Depends(get_current_principal_from_token)
+) -> Response:
+    """
+    Typeahead: job titles, companies and locations with a word starting with `prefix`, most jobs first.
+    Same as route_jobs.py, answered from memory.
+    """
+    return job_serializer.response(job_serializer.suggestions(job_service.suggest(prefix, limit, field)))
+
+
+@router.get("/stats", response_model=JobStats)
+async def get_job_stats(
+    limit: int = Query(config_object.JOB_STATS_LIMIT_DEFAULT, ge=1),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> Response:
+    """
+    Same as route_jobs.py, read from the job stats counters.
+    """
+    limit = min(limit, config_object.JOB_STATS_LIMIT_MAX)
+    return job_serializer.response(job_serializer.job_stats(await job_stats_service.job_stats_async(limit, session)))
+
+
+@router.get("/stream")
+async def stream_job_events(
+    last_event_id: Optional[str] = Header(None),
+    user: TokenPrincipal = Depends(get_current_principal_from_token)
+) -> StreamingResponse:
+    """
+    Same as route_jobs.py, Server-Sent Events of job changes.
+    """
+    try:
+        subscriber, backlog = job_event_service.subscribe(last_event_id)
+    except JobEventSubscribersExceededError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open job streams, please retry.",
+            headers={"Retry-After": "5"},
+        )
+
+    return StreamingResponse(
+        job_event_service.stream(subscriber, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/search", response_model=JobPage)
+async def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(config_object.JOBS_PAGE_SIZE_DEFAULT, ge=1),
+    cursor: Optional[str] = None,
+    is_active: Optional[bool] = True,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_sparse_fields),
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> Response:
+    limit = min(limit, config_object.JOBS_PAGE_SIZE_MAX)
+
+    try:
+        jobs, next_cursor = await job_service.search_jobs_page_async(session, q, limit, cursor, is_active, date_from, date_to, fields)
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+    return job_serializer.response(job_serializer.job_page(jobs, next_cursor, fields))
+
+
+@router.put("/update-job/{job_id}", response_model=ShowJob)
+async def update_job_by_id(
+    job_id: int,
+    update_job: UpdateJob,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+) -> Response:
+    mutation_status, updated_job = await job_service.update_job_by_id_async(job_id, update_job, user, session)
+
+    if mutation_status == JobMutationStatus.NOT_FOUND:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+
+    if mutation_status == JobMutationStatus.FORBIDDEN:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is not owner of job.")
+
+    return job_serializer.response(job_serializer.show_job(updated_job))
+
+
+@router.delete("/delete-job/{job_id}")
+async def delete_job_by_id(
+    job_id: int,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: AsyncSession = Depends(get_async_database)
+):
+    mutation_status: JobMutationStatus = await job_service.delete_job_by_id_async(job_id, user, session)
+
+    if mutation_status == JobMutationStatus.NOT_FOUND:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+
+    if mutation_status == JobMutationStatus.FORBIDDEN:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is not owner of job.")
+
+    return f"Success, job {job_id} has been deleted."
@@ -3,13 +3,17 @@ from typing import Optional
 
 from fastapi import Depends, APIRouter, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from api_models.token import Token, TokenData
+from api_models.token import Token, TokenPrincipal
 from config import config_object
 from database.orm_models.user import User
+from database.replicas import identify_read_your_writes
 from database.session import get_database
+from services.hash_service import HashServiceSaturatedError
+from services.token_cache_service import token_cache_service
 from services.token_service import token_service
 from services.user_service import user_service
 
@@ -26,6 +30,13 @@ credentials_exception: HTTPException = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
+# Returned when the bcrypt worker pool is full. Clients should back off and retry.
+auth_saturated_exception: HTTPException = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Authentication service is busy, please retry.",
+    headers={"Retry-After": "1"},
+)
+
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(response: Response, form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_database)):
@@ -35,7 +46,9 @@ async def login_for_access_token(response: Response, form_data: OAuth2PasswordRe
     Sets a httponly cookie with "Authorization" as the key and Bear "token123" as the value. ex. "Authorization | Bearer token123"
     """
 
-    user: User = user_service.get_user_by_email_or_username(form_data.username, session)
+    # The lookup is blocking IO on a sync session (pool checkout + query), it runs on the threadpool, not the event loop.
+    # Only the awaited bcrypt step below happens on the loop.
+    user: User = await run_in_threadpool(user_service.get_user_by_email_or_username, form_data.username, session)
 
     if not user:
         raise HTTPException(
@@ -44,9 +57,11 @@ async def login_for_access_token(response: Response, form_data: OAuth2PasswordRe
             headers={"WWW-Authenticate": "Bearer"},  # Not added by me. Copy and pasted from FastAPI docs.
         )
 
-    parsed_bcrypt_password: str = user.hashed_password.split("}")[1]
-
-    is_valid: bool = user_service.authenticate_user(form_data.password, parsed_bcrypt_password)
+    # bcrypt runs on the auth worker pool, the event loop keeps serving other requests meanwhile.
+    try:
+        is_valid: bool = await user_service.authenticate_user_async(form_data.password, user.hashed_password)
+    except HashServiceSaturatedError:
+        raise auth_saturated_exception
 
     if not is_valid:
         raise HTTPException(
@@ -57,10 +72,8 @@ async def login_for_access_token(response: Response, form_data: OAuth2PasswordRe
 
     access_token_expires: timedelta = timedelta(minutes=int(config_object.JWT_ACCESS_TOKEN_EXPIRE_MINUTES))
 
-    access_token: str = token_service.create_access_token(
-        data={"sub": user.email},
-        expires_delta=access_token_expires
-    )
+    # the token carries the user id, is_active, is_superuser and token version | see TokenService
+    access_token: str = token_service.create_access_token_for_user(user, expires_delta=access_token_expires)
 
     # setting the bearer token -- learned this for the Front End if needed.
     response.set_cookie("Authorization", f"Bearer {access_token}", httponly=True)
@@ -68,33 +81,69 @@ async def login_for_access_token(response: Response, form_data: OAuth2PasswordRe
     return Token(access_token=access_token, token_type="bearer")
 
 
-async def get_current_user_from_token(token: str = Depends(oauth2_scheme), session: Session = Depends(get_database)) -> User:
+@router.get("/token-cache-stats")
+def get_token_cache_stats() -> dict:
     """
-    This is a dependency function, to be used like: "user: User = Depends(get_current_user_from_token)"
-    The "token" is the "param" variable separated from the incoming string "Bearer ey123123".
+    Hit / miss / eviction counters of the in-process token cache, for monitoring. Counts only, no token data.
+    """
+    return token_cache_service.stats()
 
-    We do NOT pass anything to this method.
 
-    :param token: an OAuth2PasswordBearer instance, also a callable (a method that returns something)
-    :param session: a session object for persistence
+async def get_current_principal_from_token(token: str = Depends(oauth2_scheme)) -> TokenPrincipal:
     """
-    try:
-        payload: dict = jwt.decode(token, config_object.JWT_SECRET_KEY, algorithms=[config_object.JWT_ALGORITHM])
+    Stateless fast path, to be used like: "user: TokenPrincipal = Depends(get_current_principal_from_token)"
 
-        # 'sub' is subject, 'username' is the email.
-        username: Optional[str] = payload.get("sub")
+    Only verifies the JWT (signature + expiry) and reads the claims, there is NO database query.
+    Verified tokens are kept in `token_cache_service`, repeated requests with the same token skip the decode too.
+    Good for routes that only need the user id / is_superuser. The claims are a snapshot from login time, so a token
+    of a user deactivated / with a new password since is refused through the revocation record (revoke_user()).
 
-        if username is None:
+    :param token: an OAuth2PasswordBearer instance, also a callable (a method that returns something)
+    """
+    # Same token as the last request? Skip jwt.decode, the cache entry never outlives the token's `exp`.
+    principal: Optional[TokenPrincipal] = token_cache_service.get_principal(token)
+
+    if principal is not None:
+        if token_cache_service.is_revoked(principal):
             raise credentials_exception
 
-        token_data: TokenData = TokenData(username=username)
+        identify_read_your_writes(principal.id)
+        return principal
 
+    try:
+        payload: dict = token_service.decode_access_token(token)
     except JWTError:
         raise credentials_exception
 
-    user: User = user_service.get_user_by_email_or_username(token_data.username, session)
+    principal = token_service.principal_from_payload(payload)
+
+    if principal is None or not principal.is_active or token_cache_service.is_revoked(principal):
+        raise credentials_exception
+
+    token_cache_service.put_principal(token, principal, expires_at=payload.get("exp"))
+
+    # bearer clients send no read-your-writes cookie, their window is kept by user id (see database/replicas.py).
+    identify_read_your_writes(principal.id)
+    return principal
+
+
+async def get_current_user_from_token(
+    principal: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> User:
+    """
+    This is a dependency function, to be used like: "user: User = Depends(get_current_user_from_token)"
+    Opt-in for routes that need the full `User` row. Loads the user by id (primary key) and makes sure the token
+    has not been revoked, ie. the user is still active and the token's version matches `User.token_version`.
+
+    We do NOT pass anything to this method.
+
+    :param principal: the verified claims of the bearer token
+    :param session: a session object for persistence
+    """
+    user: User = user_service.get_user_by_id(principal.id, session)
 
-    if user is None:
+    if user is None or not user.is_active or (user.token_version or 0) != principal.token_version:
         raise credentials_exception
 
     return user
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from database.session import get_database
+from services.health_service import health_service
+
+router: APIRouter = APIRouter()
+
+"""
+Probes for the orchestrator / load balancer, see services/health_service.py. No auth, no user data.
+"""
+
+
+@router.get("/healthz")
+def get_liveness() -> dict:
+    """
+    200 as long as the process answers.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def get_readiness(session: Session = Depends(get_database)):
+    """
+    200 once startup is done and the database answers, 503 otherwise.
+    """
+    if not health_service.started:
+        return JSONResponse({"status": "starting"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    if not health_service.database_is_reachable(session):
+        return JSONResponse({"status": "database unavailable"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    return {"status": "ready"}
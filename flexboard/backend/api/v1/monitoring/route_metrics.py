@@ -0,0 +1,52 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from database.pool import pool_metrics_registry
+from services.job_cache_service import job_cache_service
+from services.metrics_service import CONTENT_TYPE, metric_lines, metrics_registry
+from services.token_cache_service import token_cache_service
+
+router: APIRouter = APIRouter()
+
+"""
+GET /metrics, everything in Prometheus' text format. Request metrics come from middleware/metrics_middleware.py,
+the collectors below add the numbers other parts of the app already keep (read at scrape time).
+"""
+
+
+def collect_pool_metrics() -> List[str]:
+    snapshot: dict = pool_metrics_registry.snapshot()
+    lines: List[str] = list()
+
+    for key, name, documentation, metric_type in (
+        ("checkouts", "db_pool_checkouts_total", "Connections borrowed from the pool.", "counter"),
+        ("checkout_timeouts", "db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection.", "counter"),
+        ("checkout_wait_seconds_total", "db_pool_checkout_wait_seconds_total", "Time spent waiting for a connection.", "counter"),
+        ("in_use", "db_pool_connections_in_use", "Connections lent out right now.", "gauge"),
+        ("idle", "db_pool_connections_idle", "Open connections waiting in the pool.", "gauge"),
+    ):
+        samples = [({"pool": pool}, values[key]) for pool, values in snapshot.items() if key in values]
+        lines.extend(metric_lines(name, documentation, samples, metric_type))
+
+    return lines
+
+
+def collect_cache_metrics() -> List[str]:
+    token_cache: dict = token_cache_service.stats()
+    job_cache: dict = job_cache_service.stats()
+
+    return [
+        *metric_lines("cache_hits_total", "Cache hits.", [({"cache": "token"}, token_cache["hits"]), ({"cache": "job"}, job_cache["hits"])], "counter"),
+        *metric_lines("cache_misses_total", "Cache misses.", [({"cache": "token"}, token_cache["misses"]), ({"cache": "job"}, job_cache["misses"])], "counter"),
+    ]
+
+
+metrics_registry.register_collector(collect_pool_metrics)
+metrics_registry.register_collector(collect_cache_metrics)
+
+
+@router.get("/metrics")
+def get_metrics() -> Response:
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,64 @@
+from fastapi import APIRouter
+
+from database.pool import pool_metrics_registry
+from services.job_cache_service import job_cache_service
+from services.job_event_service import job_event_service
+from services.job_stats_service import job_stats_service
+from services.job_suggest_service import job_suggest_service
+from services.saved_search_service import saved_search_service
+
+router: APIRouter = APIRouter()
+
+"""
+Read-only numbers for dashboards / alerting. Counters only, no user data.
+"""
+
+
+@router.get("/db-pool")
+def get_database_pool_metrics() -> dict:
+    """
+    Per engine: checkout count, checkout wait time (total / avg / max seconds), checkout timeouts,
+    and the live pool size, in-use, idle and overflow connection counts.
+    """
+    return pool_metrics_registry.snapshot()
+
+
+@router.get("/job-cache")
+def get_job_cache_metrics() -> dict:
+    """
+    get-job / list-jobs response cache: enabled, hits and misses since start. No invalidations, keys carry the ETag.
+    """
+    return job_cache_service.stats()
+
+
+@router.get("/job-suggest")
+def get_job_suggest_metrics() -> dict:
+    """
+    /jobs/suggest index of this worker: whether it was built, indexed jobs and distinct values.
+    """
+    return job_suggest_service.stats()
+
+
+@router.get("/saved-searches")
+def get_saved_search_metrics() -> dict:
+    """
+    Saved search matching of this worker: saved searches indexed, distinct anchor terms, last synced id, new jobs waiting
+    for the matcher and the ones it dropped.
+    """
+    return saved_search_service.stats()
+
+
+@router.get("/job-events")
+def get_job_event_metrics() -> dict:
+    """
+    /jobs/stream of this worker: open streams, buffered events, events published, slow subscribers dropped.
+    """
+    return job_event_service.stats()
+
+
+@router.get("/job-stats")
+def get_job_stats_metrics() -> dict:
+    """
+    /jobs/stats counters: reconciliations run by this worker, how many counters the last one (and all of them) fixed.
+    """
+    return job_stats_service.stats()
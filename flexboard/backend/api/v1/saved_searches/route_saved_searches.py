@@ -0,0 +1,79 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from api.v1.login.route_login import get_current_principal_from_token
+from api_models.saved_search import SavedSearchCreate, SavedSearchMatchPage, ShowSavedSearch, ShowSavedSearchMatch
+from api_models.token import TokenPrincipal
+from config import config_object
+from database.orm_models.saved_search import SavedSearch
+from database.session import get_database
+from services.cursor_service import InvalidCursorError
+from services.saved_search_service import SavedSearchLimitError, saved_search_service
+
+router: APIRouter = APIRouter()
+
+"""
+Saved searches and the jobs that matched them (see services/saved_search_service.py).
+Only sync routes, in async mode too, like /users: the async part is matching new jobs, done by JobService.
+"""
+
+
+@router.post("/create-saved-search", response_model=ShowSavedSearch)
+def create_saved_search(
+    saved_search: SavedSearchCreate,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> ShowSavedSearch:
+    """
+    Jobs created from now on that match it show up in /saved-searches/list-matches.
+    Every keyword must be in the job (title, company, location or description), location / company words in those fields.
+    """
+    try:
+        created: SavedSearch = saved_search_service.create_saved_search(saved_search, user.id, session)
+    except SavedSearchLimitError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+
+    return ShowSavedSearch.model_validate(created)
+
+
+@router.get("/list-saved-searches", response_model=List[ShowSavedSearch])
+def list_saved_searches(
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> List[ShowSavedSearch]:
+    return [ShowSavedSearch.model_validate(saved_search) for saved_search in saved_search_service.list_saved_searches(user.id, session)]
+
+
+@router.delete("/delete-saved-search/{saved_search_id}")
+def delete_saved_search(
+    saved_search_id: int,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+):
+    # Only the owner's saved searches are deleted, someone else's is "not found" too.
+    if not saved_search_service.delete_saved_search(saved_search_id, user.id, session):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved search not found.")
+
+    return f"Success, saved search {saved_search_id} has been deleted."
+
+
+@router.get("/list-matches", response_model=SavedSearchMatchPage)
+def list_matches(
+    limit: int = Query(config_object.SAVED_SEARCH_MATCHES_PAGE_SIZE_DEFAULT, ge=1),
+    cursor: Optional[str] = None,
+    user: TokenPrincipal = Depends(get_current_principal_from_token),
+    session: Session = Depends(get_database)
+) -> SavedSearchMatchPage:
+    """
+    Jobs that matched one of the user's saved searches, newest first. `limit` is capped at SAVED_SEARCH_MATCHES_PAGE_SIZE_MAX.
+    """
+    limit = min(limit, config_object.SAVED_SEARCH_MATCHES_PAGE_SIZE_MAX)
+
+    try:
+        matches, next_cursor = saved_search_service.list_matches_page(user.id, session, limit, cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+    return SavedSearchMatchPage(items=[ShowSavedSearchMatch.model_validate(match) for match in matches], next_cursor=next_cursor)
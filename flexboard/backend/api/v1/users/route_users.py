@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends  # APIRouter - for routes / Depends - for Dependency Injection
+from fastapi import APIRouter, Depends, HTTPException, status  # APIRouter - for routes / Depends - for Dependency Injection
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session  # Session is used for typing
 
 from api_models.user import ShowUser, UserCreate
 from database.orm_models.user import User
 from database.session import get_database
+from services.hash_service import HashServiceSaturatedError
 from services.user_service import user_service
 
 # Creating a router instance to signify that this file will be used as an API file | To be used in api/base.
@@ -24,7 +26,18 @@ For response models:
 
 @router.post("/create-user", response_model=ShowUser)
 def create_user(user: UserCreate, db_session: Session = Depends(get_database)) -> ShowUser:
-    new_user: User = user_service.create_new_user(user, db_session)
+    try:
+        new_user: User = user_service.create_new_user(user, db_session)
+    except HashServiceSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is busy, please retry.",
+            headers={"Retry-After": "1"},
+        )
+    except IntegrityError:
+        # the unique indexes are case-insensitive, "Bob" is taken once "bob" is.
+        db_session.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username or email already registered.")
 
     show_user: ShowUser = ShowUser(
         username=new_user.username,
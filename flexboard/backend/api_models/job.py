@@ -1,7 +1,7 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 
 
 # Inheritance: Base Pydantic Class for other Pydantic Classes
@@ -23,7 +23,13 @@ class JobCreate(BaseModel):
     company_url: str
     description: str
     location: Optional[str] = "Remote"
-    date_posted: Optional[datetime] = datetime.now().date()
+    date_posted: Optional[date] = Field(default_factory=date.today)
+
+    # Job.date_posted is NOT NULL (list-jobs pages by it), an explicit null means "posted today", like leaving it out.
+    @field_validator('date_posted')
+    @classmethod
+    def posted_today_if_null(cls, value: Optional[date]):
+        return value if value is not None else date.today()
 
 
 class UpdateJob(BaseModel):
@@ -53,3 +59,62 @@ class ShowJob(BaseModel):
     # It's only when we try to parse the SQLAlchemy ORM object INTO a Pydantic Model
     class Config:
         from_attributes = True
+
+
+# Filters of list-jobs, all of them optional and AND-ed. Equality on company / location / owner_id, an inclusive
+# date_posted range, and active jobs unless `is_active=false` (None, from code only: both).
+class JobFilters(BaseModel):
+    company: Optional[str] = None
+    location: Optional[str] = None
+    owner_id: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    is_active: Optional[bool] = True
+
+
+# Response Body for /jobs/stats, active jobs per value of each facet, the values with the most jobs first.
+class JobStatBucket(BaseModel):
+    value: str
+    count: int
+
+
+class JobStats(BaseModel):
+    company: List[JobStatBucket]
+    location: List[JobStatBucket]
+    date_posted: List[JobStatBucket]
+
+
+# Response Body for paginated lists. Send `next_cursor` back as `?cursor=` to get the next page, None means no more pages.
+class JobPage(BaseModel):
+    items: List[ShowJob]
+    next_cursor: Optional[str] = None
+
+
+# Response Body for list-jobs. `facets` only with `facets=true`: the same buckets as /jobs/stats, counted over every
+# job matching the filters.
+class FacetedJobPage(JobPage):
+    facets: Optional[JobStats] = None
+
+
+# Response Body for /jobs/suggest, the values with the most active jobs first.
+class JobSuggestion(BaseModel):
+    field: str
+    value: str
+    count: int
+
+
+class JobSuggestions(BaseModel):
+    suggestions: List[JobSuggestion]
+
+
+# Response Body for /jobs/bulk-create. `index` is the position of the item in the request (0 based).
+class JobBulkCreateError(BaseModel):
+    index: int
+    detail: str
+
+
+class JobBulkCreateResult(BaseModel):
+    created: int
+    ids: List[int]
+    errors: List[JobBulkCreateError]
+    truncated: bool = False
@@ -0,0 +1,139 @@
+"""
+Fast path from database rows to JSON bytes for job responses.
+
+The slow way (what the routes used to do):
+    ORM object -> ShowJob(...) (validation #1) -> FastAPI checks it against response_model (validation #2) -> JSON
+The fast way (this file):
+    ORM object / Row -> plain dict with the ShowJob fields -> orjson -> bytes, returned as a Response.
+
+FastAPI does not touch a `Response` we return, so nothing is validated twice. The data came out of our own
+database through our own columns, validating it again on the way out buys nothing.
+`response_model=` stays on the routes, so the OpenAPI docs still show ShowJob / JobPage.
+
+orjson is optional, without it we fall back to the standard json module (slower, same output).
+
+Sparse fieldsets (list-jobs / search `?fields=title,company`):
+- only LIST_JOB_FIELDS can be asked for, always written in that order, so `title,company` and `company,title`
+  are the same response (and share one ETag / cache entry).
+- no `description` in lists, `description_snippet` instead: the first JOB_DESCRIPTION_SNIPPET_LENGTH characters,
+  cut by the database, ended on a word boundary here. The full text is only served by get-job.
+"""
+
+import json
+from datetime import date
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi.responses import Response
+
+from api_models.job import ShowJob
+from config import config_object
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Same fields, same order as the ShowJob response model.
+SHOW_JOB_FIELDS: tuple = tuple(ShowJob.model_fields)
+
+# What `fields=` of a list endpoint can pick from, in response order.
+LIST_JOB_FIELDS: tuple = ("id", "title", "company", "company_url", "location", "date_posted", "is_active", "description_snippet")
+
+
+class InvalidFieldsError(ValueError):
+    """
+    Raised when `fields=` is empty or names a field that is not in LIST_JOB_FIELDS. Routes turn this into a 400.
+    """
+
+
+def _json_default(value: Any):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+class JobSerializer:
+    def __init__(self, snippet_length: int):
+        self.snippet_length = snippet_length
+
+    def parse_fields(self, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        :param fields: the `fields=` query parameter, comma separated. None means every ShowJob field.
+        :return: the fields in LIST_JOB_FIELDS order, or None.
+        """
+        if fields is None:
+            return None
+
+        requested: set = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown: set = requested.difference(LIST_JOB_FIELDS)
+
+        if not requested or unknown:
+            raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}. Pick from: {', '.join(LIST_JOB_FIELDS)}.")
+
+        return tuple(field for field in LIST_JOB_FIELDS if field in requested)
+
+    def to_dict(self, job: Any, fields: Optional[Tuple[str, ...]] = None) -> dict:
+        """
+        :param job: a Job ORM object, or a Row selected with (at least) the ShowJob columns.
+        :param fields: from parse_fields(), the job must have been loaded with them (see JobDao._with_fields).
+        """
+        if fields is None:
+            return {field: getattr(job, field) for field in SHOW_JOB_FIELDS}
+
+        return {
+            field: self.snippet(job.description_snippet) if field == "description_snippet" else getattr(job, field)
+            for field in fields
+        }
+
+    def snippet(self, text: Optional[str]) -> Optional[str]:
+        """
+        :param text: the start of the description, the database sends `snippet_length + 1` characters at most,
+                     one more than we show so we can tell it was cut.
+        """
+        if text is None or len(text) <= self.snippet_length:
+            return text
+
+        cut: str = text[:self.snippet_length]
+        last_space: int = cut.rfind(" ")
+
+        # end on a word boundary, unless that throws away more than half of it (ex. one very long word / URL).
+        if last_space > self.snippet_length // 2:
+            cut = cut[:last_space]
+
+        return cut.rstrip() + "…"
+
+    def show_job(self, job: Any) -> bytes:
+        return dumps(self.to_dict(job))
+
+    def job_page(
+        self,
+        jobs: Iterable[Any],
+        next_cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        facets: Optional[dict] = None
+    ) -> bytes:
+        page: dict = {"items": [self.to_dict(job, fields) for job in jobs], "next_cursor": next_cursor}
+
+        # only when asked for (list-jobs `facets=true`), pages without them stay as they were.
+        if facets is not None:
+            page["facets"] = facets
+
+        return dumps(page)
+
+    def suggestions(self, suggestions: Iterable[dict]) -> bytes:
+        return dumps({"suggestions": list(suggestions)})
+
+    def job_stats(self, job_stats: dict) -> bytes:
+        return dumps(job_stats)
+
+    def response(self, content: bytes, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+        return Response(content=content, status_code=status_code, media_type="application/json", headers=headers)
+
+
+job_serializer: JobSerializer = JobSerializer(snippet_length=config_object.JOB_DESCRIPTION_SNIPPET_LENGTH)
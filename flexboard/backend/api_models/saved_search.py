@@ -0,0 +1,50 @@
+import re
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+# Request Body. Every given field narrows the search, at least one of them must have a word in it.
+class SavedSearchCreate(BaseModel):
+    keywords: Optional[str] = Field(None, max_length=200, description='words that must all be in the job')
+    location: Optional[str] = Field(None, max_length=100)
+    company: Optional[str] = Field(None, max_length=100)
+
+    @model_validator(mode='after')
+    def has_a_word(self) -> 'SavedSearchCreate':
+        if not any(value and re.search(r"\w", value) for value in (self.keywords, self.location, self.company)):
+            raise ValueError('A saved search needs keywords, a location or a company.')
+        return self
+
+
+# Response Body
+class ShowSavedSearch(BaseModel):
+    id: int
+    keywords: Optional[str] = None
+    location: Optional[str] = None
+    company: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Response Body for /saved-searches/list-matches, newest first. `next_cursor` works like the one of JobPage.
+class ShowSavedSearchMatch(BaseModel):
+    id: int
+    saved_search_id: int
+    matched_at: datetime
+    job_id: int
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    date_posted: Optional[date] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SavedSearchMatchPage(BaseModel):
+    items: List[ShowSavedSearchMatch]
+    next_cursor: Optional[str] = None
@@ -10,3 +10,13 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str
+
+
+# The verified claims of an access token. Routes can use this instead of a `User` row, no database query needed.
+# Claims are a snapshot from login time, use `get_current_user_from_token` when you need the live `User` row.
+class TokenPrincipal(BaseModel):
+    id: int
+    username: str  # 'sub' claim, the email
+    is_active: bool
+    is_superuser: bool
+    token_version: int
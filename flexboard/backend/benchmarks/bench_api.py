@@ -0,0 +1,428 @@
+"""
+Benchmark / load test: the real `app` from main.py, end to end (routing, auth, database, serialization).
+
+Run from flexboard/backend:
+    python -m benchmarks.bench_api                                  # SQLite, in-process ASGI + uvicorn
+    python -m benchmarks.bench_api --users 100 --jobs 100000 --concurrency 32
+    python -m benchmarks.bench_api --postgres-url postgresql://u:p@localhost:5432/flexboard_bench
+    python -m benchmarks.bench_api --compare benchmarks/results/bench_api-<old commit>.json
+
+For every database (SQLite always, Postgres when --postgres-url / BENCH_POSTGRES_URL answers) a worker process:
+1. points the app at that database (DATABASE_URL), drops + creates the tables and seeds `--users` users and `--jobs` jobs,
+2. drives the app in-process through httpx.ASGITransport (no network: the app's own cost),
+3. starts `uvicorn main:app` and drives it over HTTP (what a client sees: + HTTP parsing, sockets, server).
+
+Scenarios: login, get-job, list-jobs, create-job, update-job. Each reports p50 / p95 / p99 latency (ms) and requests/sec.
+
+Results go to benchmarks/results/bench_api-<git commit>.json, keys sorted, so two runs diff cleanly across commits.
+The Postgres database is dropped and re-seeded, never point it at one you care about.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIRECTORY: Path = Path(__file__).resolve().parent.parent
+RESULTS_DIRECTORY: Path = BACKEND_DIRECTORY / "benchmarks" / "results"
+
+PASSWORD: str = "bench-password"
+SCENARIOS: tuple = ("login", "get-job", "list-jobs", "create-job", "update-job")
+
+# Only used when not set already, so the app's config can be imported without a .env file.
+DEFAULT_ENVIRONMENT: Dict[str, str] = {
+    "JWT_SECRET_KEY": "bench-secret-bench-secret-bench-secret-bench",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+}
+
+
+# ------- Orchestrator ------- #
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the API end to end.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=40, help="login runs bcrypt, it gets its own, smaller count")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--modes", default="asgi,uvicorn", help="comma separated: asgi, uvicorn")
+    parser.add_argument("--uvicorn-workers", type=int, default=1)
+    parser.add_argument("--async-mode", action="store_true", help="serve /jobs with the async routes (DATABASE_ASYNC_MODE)")
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="an older result file to compare against")
+    parser.add_argument("--seed", type=int, default=42)
+
+    # internal: one database, run by a worker process.
+    parser.add_argument("--worker-database-url", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", type=Path, default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(arguments)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIRECTORY, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def postgres_is_available(url: str) -> bool:
+    from sqlalchemy import create_engine, text
+
+    try:
+        engine = create_engine(url, pool_pre_ping=True)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        engine.dispose()
+        return True
+    except Exception as error:  # noqa: BLE001 | any driver / network error means "not available"
+        print(f"Postgres at {url} is not available, skipping it: {error.__class__.__name__}")
+        return False
+
+
+def run_orchestrator(arguments: argparse.Namespace):
+    databases: Dict[str, str] = dict()
+
+    with tempfile.TemporaryDirectory() as directory:
+        databases["sqlite"] = f"sqlite:///{Path(directory) / 'bench_api.db'}"
+
+        if arguments.postgres_url and postgres_is_available(arguments.postgres_url):
+            databases["postgres"] = arguments.postgres_url
+
+        results: dict = dict()
+
+        for name, url in databases.items():
+            print(f"--- {name} ---")
+            worker_output: Path = Path(directory) / f"{name}.json"
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_api", *sys.argv[1:],
+                 "--worker-database-url", url, "--worker-output", str(worker_output)],
+                cwd=BACKEND_DIRECTORY,
+                check=True
+            )
+            results[name] = json.loads(worker_output.read_text())
+
+    report: dict = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "users": arguments.users,
+            "jobs": arguments.jobs,
+            "requests": arguments.requests,
+            "login_requests": arguments.login_requests,
+            "concurrency": arguments.concurrency,
+            "async_mode": arguments.async_mode,
+        },
+        "results": results,
+    }
+
+    output: Path = arguments.output or RESULTS_DIRECTORY / f"bench_api-{report['meta']['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+    print_report(results)
+    print(f"\nSaved to {output}")
+
+    if arguments.compare:
+        print_comparison(json.loads(arguments.compare.read_text())["results"], results)
+
+
+def print_report(results: dict):
+    print(f"\n{'database':<10} {'mode':<8} {'scenario':<11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+
+    for database, modes in results.items():
+        for mode, scenarios in modes.items():
+            for scenario, numbers in scenarios.items():
+                print(
+                    f"{database:<10} {mode:<8} {scenario:<11} {numbers['p50_ms']:>9.2f} {numbers['p95_ms']:>9.2f} "
+                    f"{numbers['p99_ms']:>9.2f} {numbers['requests_per_second']:>9.1f} {numbers['errors']:>7}"
+                )
+
+
+def print_comparison(old_results: dict, new_results: dict):
+    print(f"\n{'database':<10} {'mode':<8} {'scenario':<11} {'p50 change':>11} {'p99 change':>11} {'req/s change':>13}")
+
+    for database, modes in new_results.items():
+        for mode, scenarios in modes.items():
+            for scenario, new in scenarios.items():
+                old: Optional[dict] = old_results.get(database, {}).get(mode, {}).get(scenario)
+
+                if old is None:
+                    continue
+
+                print(
+                    f"{database:<10} {mode:<8} {scenario:<11} {percent_change(old['p50_ms'], new['p50_ms']):>11} "
+                    f"{percent_change(old['p99_ms'], new['p99_ms']):>11} "
+                    f"{percent_change(old['requests_per_second'], new['requests_per_second']):>13}"
+                )
+
+
+def percent_change(old: float, new: float) -> str:
+    return f"{(new / old - 1) * 100:+.1f}%" if old else "n/a"
+
+
+# ------- Worker (one database) ------- #
+
+def configure_environment(arguments: argparse.Namespace):
+    """
+    Must run before anything imports config.py, it reads the environment once at import time.
+    """
+    for key, value in DEFAULT_ENVIRONMENT.items():
+        os.environ.setdefault(key, value)
+
+    url: str = arguments.worker_database_url
+    os.environ["DATABASE_URL"] = url
+    os.environ["DATABASE_ASYNC_MODE"] = "true" if arguments.async_mode else "false"
+    os.environ["POSTGRES_ASYNC_DATABASE_URL"] = (
+        url.replace("sqlite://", "sqlite+aiosqlite://", 1) if url.startswith("sqlite")
+        else url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    )
+
+
+def seed_database(arguments: argparse.Namespace) -> List[dict]:
+    """
+    Fresh tables + `users` users (one bcrypt hash shared by all) + `jobs` jobs owned round robin.
+    Returns, per user, its id, username and a bearer token header.
+    """
+    from sqlalchemy import insert
+    from sqlalchemy.orm import Session
+
+    from database.orm_models.job import Job
+    from database.orm_models.user import User
+    from database.session import get_engine
+    from database.tables import Base
+    from services.hash_service import hash_service
+    from services.token_service import token_service
+
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    hashed_password: str = hash_service.hash(PASSWORD)
+    started: float = time.perf_counter()
+
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {"username": f"bench_user_{index}", "email": f"bench_user_{index}@bench.com", "hashed_password": hashed_password}
+            for index in range(arguments.users)
+        ])
+        users: List[User] = list(session.query(User).order_by(User.id))
+
+        for start in range(0, arguments.jobs, 1_000):
+            session.execute(insert(Job), [
+                {
+                    "title": f"Python Developer {index}",
+                    "company": f"Company {index % 500}",
+                    "company_url": f"https://company-{index % 500}.example.com",
+                    "location": random.choice(("Remote", "Berlin", "Toronto", "Manila", "New York")),
+                    "description": "Build and run FastAPI services. " * 10,
+                    "owner_id": users[index % len(users)].id,
+                }
+                for index in range(start, min(start + 1_000, arguments.jobs))
+            ])
+        session.commit()
+
+        seeded: List[dict] = [
+            {
+                "id": user.id,
+                "username": user.username,
+                "headers": {"Authorization": f"Bearer {token_service.create_access_token_for_user(user)}"},
+            }
+            for user in users
+        ]
+
+    print(f"seeded {arguments.users} users / {arguments.jobs} jobs in {time.perf_counter() - started:.1f}s")
+    return seeded
+
+
+def make_scenarios(arguments: argparse.Namespace, users: List[dict]) -> Dict[str, Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]]:
+    job_count: int = arguments.jobs
+
+    def owner_of(job_id: int) -> dict:
+        # jobs were inserted in order, owned round robin.
+        return users[(job_id - 1) % len(users)]
+
+    async def login(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        user: dict = users[index % len(users)]
+        return await client.post("/login/token", data={"username": user["username"], "password": PASSWORD})
+
+    async def get_job(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.get(f"/jobs/get-job/{random.randint(1, job_count)}", headers=users[index % len(users)]["headers"])
+
+    async def list_jobs(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.get("/jobs/list-jobs?limit=50", headers=users[index % len(users)]["headers"])
+
+    async def create_job(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        body: dict = {"title": f"Bench job {index}", "company": "Bench Corp", "company_url": "bench.example.com", "description": "load test"}
+        return await client.post("/jobs/create-job", json=body, headers=users[index % len(users)]["headers"])
+
+    async def update_job(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        job_id: int = random.randint(1, job_count)
+        return await client.put(f"/jobs/update-job/{job_id}", json={"title": f"Updated {index}"}, headers=owner_of(job_id)["headers"])
+
+    return {"login": login, "get-job": get_job, "list-jobs": list_jobs, "create-job": create_job, "update-job": update_job}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    request: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int
+) -> dict:
+    latencies: List[float] = list()
+    errors: int = 0
+    next_index: int = 0
+
+    async def worker():
+        nonlocal errors, next_index
+
+        while next_index < total:
+            index: int = next_index
+            next_index += 1
+
+            start: float = time.perf_counter()
+            try:
+                response: httpx.Response = await request(client, index)
+                failed: bool = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(min(concurrency, total))])
+    elapsed: float = time.perf_counter() - started
+
+    return summarize(latencies, errors, elapsed)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    ordered: List[float] = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        # nearest rank
+        return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))] * 1000
+
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(0.50), 3),
+        "p95_ms": round(percentile(0.95), 3),
+        "p99_ms": round(percentile(0.99), 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "requests_per_second": round(len(ordered) / elapsed, 1),
+    }
+
+
+async def run_scenarios(client: httpx.AsyncClient, arguments: argparse.Namespace, users: List[dict]) -> dict:
+    scenarios = make_scenarios(arguments, users)
+    results: dict = dict()
+
+    # warm up: pool, caches, code paths.
+    for name in SCENARIOS:
+        await run_scenario(client, scenarios[name], min(20, arguments.requests), arguments.concurrency)
+
+    for name in SCENARIOS:
+        total: int = arguments.login_requests if name == "login" else arguments.requests
+        results[name] = await run_scenario(client, scenarios[name], total, arguments.concurrency)
+        print(f"  {name:<11} p50 {results[name]['p50_ms']:>8.2f} ms   {results[name]['requests_per_second']:>8.1f} req/s")
+
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        return listener.getsockname()[1]
+
+
+async def run_against_uvicorn(arguments: argparse.Namespace, users: List[dict]) -> Optional[dict]:
+    port: int = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log", "--workers", str(arguments.uvicorn_workers)],
+        cwd=BACKEND_DIRECTORY,
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL
+    )
+
+    try:
+        limits = httpx.Limits(max_connections=arguments.concurrency, max_keepalive_connections=arguments.concurrency)
+
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            deadline: float = time.monotonic() + 30
+
+            while True:
+                try:
+                    await client.get("/")
+                    break
+                except httpx.TransportError:
+                    if server.poll() is not None or time.monotonic() > deadline:
+                        print("uvicorn did not start, skipping it.")
+                        return None
+                    await asyncio.sleep(0.2)
+
+            return await run_scenarios(client, arguments, users)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def run_worker_async(arguments: argparse.Namespace) -> dict:
+    random.seed(arguments.seed)
+    users: List[dict] = seed_database(arguments)
+    modes: List[str] = [mode.strip() for mode in arguments.modes.split(",") if mode.strip()]
+    results: dict = dict()
+
+    if "asgi" in modes:
+        from main import app
+
+        print("asgi (in-process):")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+            results["asgi"] = await run_scenarios(client, arguments, users)
+
+    if "uvicorn" in modes:
+        print("uvicorn (HTTP):")
+        uvicorn_results: Optional[dict] = await run_against_uvicorn(arguments, users)
+
+        if uvicorn_results is not None:
+            results["uvicorn"] = uvicorn_results
+
+    return results
+
+
+def run_worker(arguments: argparse.Namespace):
+    configure_environment(arguments)
+    results: dict = asyncio.run(run_worker_async(arguments))
+    arguments.worker_output.write_text(json.dumps(results))
+
+
+def main():
+    arguments: argparse.Namespace = parse_arguments()
+
+    if arguments.worker_database_url:
+        run_worker(arguments)
+    else:
+        run_orchestrator(arguments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: job responses, the old ShowJob + response_model path vs api_models/job_serializer.py.
+
+Run from flexboard/backend:
+    python -m benchmarks.bench_job_serialization
+
+No database needed, the jobs are transient ORM objects.
+"""
+
+import json
+import timeit
+from datetime import date
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+import database.tables  # noqa: F401 | registers User + Job so the mappers can be configured
+from api_models.job import JobPage, ShowJob
+from api_models.job_serializer import job_serializer
+from database.orm_models.job import Job
+
+SIZES: List[int] = [1, 100, 10_000]
+JOB_PAGE_ADAPTER: TypeAdapter = TypeAdapter(JobPage)
+
+
+def make_jobs(count: int) -> List[Job]:
+    return [
+        Job(
+            id=index,
+            title=f"Python Developer {index}",
+            company="Snake Corp",
+            company_url="https://snake.example.com",
+            location="Remote",
+            description="Write FastAPI services. " * 20,
+            date_posted=date(2024, 1, 1),
+            is_active=True,
+            owner_id=1,
+        )
+        for index in range(count)
+    ]
+
+
+def old_path(jobs: List[Job]) -> bytes:
+    """
+    What list-jobs did before: build ShowJob objects by hand, then FastAPI validates the result against
+    response_model again, dumps it to JSON-able python and json.dumps it (JSONResponse).
+    """
+    page: JobPage = JobPage(
+        items=[
+            ShowJob(
+                title=job.title,
+                company=job.company,
+                company_url=job.company_url,
+                description=job.description,
+                location=job.location,
+                date_posted=job.date_posted,
+                is_active=job.is_active,
+            )
+            for job in jobs
+        ],
+        next_cursor=None,
+    )
+    validated: JobPage = JOB_PAGE_ADAPTER.validate_python(page, from_attributes=True)
+    content = JOB_PAGE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast_path(jobs: List[Job]) -> bytes:
+    return job_serializer.job_page(jobs, None)
+
+
+def time_per_call(function: Callable, jobs: List[Job]) -> float:
+    number: int = max(1, 20_000 // len(jobs))
+    return min(timeit.repeat(lambda: function(jobs), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'jobs':>8} {'old (ms)':>12} {'fast (ms)':>12} {'speedup':>9}")
+
+    for size in SIZES:
+        jobs: List[Job] = make_jobs(size)
+        assert json.loads(old_path(jobs)) == json.loads(fast_path(jobs))
+
+        old_seconds: float = time_per_call(old_path, jobs)
+        fast_seconds: float = time_per_call(fast_path, jobs)
+        print(f"{size:>8} {old_seconds * 1000:>12.4f} {fast_seconds * 1000:>12.4f} {old_seconds / fast_seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: /jobs/stats read from the `jobstat` counters vs GROUP BY over the jobs, and what the counters add to a write.
+
+Run from flexboard/backend:
+    python -m benchmarks.bench_job_stats
+
+In-memory SQLite, the same statements JobStatDao runs.
+"""
+
+import random
+import time
+import timeit
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from api_models.job import JobCreate
+from database.daos.job_dao import job_dao
+from database.daos.job_stat_dao import facet_counts_statement, job_stat_dao
+from database.orm_models.job import Job
+from database.tables import Base
+
+JOBS: int = 100_000
+BATCH_SIZE: int = 5_000
+LIMIT: int = 100
+
+LOCATIONS: List[str] = ["Remote", "London", "Paris", "Berlin", "New York", "Lisbon", "Porto", "Lyon", "Los Angeles"]
+
+
+def make_jobs(count: int) -> List[JobCreate]:
+    randomizer: random.Random = random.Random(42)
+    return [
+        JobCreate(
+            title="Python Developer",
+            company=f"Acme {randomizer.randrange(5_000)}",
+            company_url="acme.example",
+            description="d",
+            location=randomizer.choice(LOCATIONS),
+            date_posted=date(2024, 1, 1) + timedelta(days=randomizer.randrange(365)),
+        )
+        for _ in range(count)
+    ]
+
+
+def main():
+    engine: Engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        jobs: List[JobCreate] = make_jobs(JOBS)
+
+        started: float = time.perf_counter()
+        for start in range(0, JOBS, BATCH_SIZE):
+            job_dao.create_new_jobs(jobs[start:start + BATCH_SIZE], owner_id=1, session=session)
+        print(f"insert: {JOBS} jobs (counters included) in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        number: int = 20
+        counters: float = min(timeit.repeat(lambda: job_stat_dao.list_job_stats(LIMIT, session), number=number, repeat=3)) / number
+        group_by: float = min(timeit.repeat(lambda: session.execute(facet_counts_statement("sqlite", Job.is_active == True)).all(), number=number, repeat=3)) / number
+        print(f"stats from counters: {counters * 1000:.2f} ms | GROUP BY over the jobs: {group_by * 1000:.2f} ms")
+
+        started = time.perf_counter()
+        drifted: int = job_stat_dao.reconcile(session)
+        print(f"reconcile: {(time.perf_counter() - started) * 1000:.0f} ms, {drifted} counters drifted")
+
+        job: JobCreate = jobs[0]
+        number = 500
+        create: float = min(timeit.repeat(lambda: job_dao.create_new_job(job, 1, session), number=number, repeat=3)) / number
+        print(f"create-job with counters: {create * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
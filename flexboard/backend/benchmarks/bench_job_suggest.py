@@ -0,0 +1,68 @@
+"""
+Benchmark: /jobs/suggest lookups against services/job_suggest_service.py, and the startup build.
+
+Run from flexboard/backend:
+    python -m benchmarks.bench_job_suggest
+
+No database needed, the rows look like the ones JobDao.stream_suggest_terms yields.
+"""
+
+import random
+import time
+import timeit
+from types import SimpleNamespace
+from typing import List
+
+from services.job_suggest_service import JobSuggestService
+
+JOBS: int = 100_000
+BATCH_SIZE: int = 5_000
+PREFIXES: List[str] = ["p", "py", "pyt", "python d", "sen", "rem", "lon", "acme 4", "zzz"]
+
+SENIORITY: List[str] = ["", "Junior ", "Senior ", "Staff ", "Lead "]
+ROLES: List[str] = ["Python Developer", "Backend Engineer", "Data Scientist", "Product Manager", "DevOps Engineer",
+                    "Frontend Developer", "QA Engineer", "Site Reliability Engineer", "Data Engineer", "Designer"]
+LOCATIONS: List[str] = ["Remote", "London", "Paris", "Berlin", "New York", "Lisbon", "Porto", "Lyon", "Los Angeles"]
+
+
+def make_batches(count: int) -> List[List[SimpleNamespace]]:
+    randomizer: random.Random = random.Random(42)
+    rows: List[SimpleNamespace] = [
+        SimpleNamespace(
+            id=index,
+            title=f"{randomizer.choice(SENIORITY)}{randomizer.choice(ROLES)}",
+            company=f"Acme {randomizer.randrange(5_000)}",
+            location=randomizer.choice(LOCATIONS),
+        )
+        for index in range(count)
+    ]
+    return [rows[start:start + BATCH_SIZE] for start in range(0, count, BATCH_SIZE)]
+
+
+def main():
+    service: JobSuggestService = JobSuggestService(max_limit=50)
+    batches: List[List[SimpleNamespace]] = make_batches(JOBS)
+
+    started: float = time.perf_counter()
+    service.rebuild(batches)
+    print(f"build: {JOBS} jobs in {(time.perf_counter() - started) * 1000:.0f} ms, {service.stats()}")
+
+    print(f"{'prefix':>10} {'first (us)':>12} {'repeat (us)':>12} {'results':>8}")
+    for prefix in PREFIXES:
+        service.index_job(JOBS, "Python Developer", "Acme 1", "Remote")  # a write, drops the cached short prefixes
+
+        started = time.perf_counter()
+        results: list = service.suggest(prefix, 10)
+        first: float = time.perf_counter() - started
+
+        number: int = 1_000
+        repeat: float = min(timeit.repeat(lambda: service.suggest(prefix, 10), number=number, repeat=5)) / number
+        print(f"{prefix:>10} {first * 1e6:>12.1f} {repeat * 1e6:>12.1f} {len(results):>8}")
+
+    number = 2_000
+    update: float = min(timeit.repeat(lambda: service.index_job(1, "Senior Python Developer", "Acme 7", "Paris"), number=number, repeat=5)) / number
+    print(f"index_job (update): {update * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
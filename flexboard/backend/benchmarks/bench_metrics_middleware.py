@@ -0,0 +1,109 @@
+"""
+Benchmark: what MetricsMiddleware adds to a request.
+
+Run from flexboard/backend:
+    python -m benchmarks.bench_metrics_middleware
+
+Calls a tiny FastAPI app straight through ASGI (no server, no sockets, no database), with and without the middleware,
+so the difference is the middleware itself: route lookup, clock reads, counter + histogram updates.
+The route is `async def`, a threadpool hop would add more noise than the middleware costs.
+Also times the middleware's bookkeeping alone, without any app around it.
+"""
+
+import asyncio
+import time
+import timeit
+
+from fastapi import FastAPI
+
+from database.query_stats import start_query_stats, stop_query_stats
+from middleware.metrics_middleware import MetricsMiddleware
+from services.metrics_service import MetricsRegistry
+
+REQUESTS: int = 5_000
+REPEAT: int = 7
+
+
+def make_app(with_metrics: bool) -> FastAPI:
+    app: FastAPI = FastAPI()
+
+    @app.get("/jobs/get-job/{job_id}")
+    async def get_job(job_id: int) -> dict:
+        return {"id": job_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware, registry=MetricsRegistry())
+
+    return app
+
+
+async def call(app: FastAPI, job_id: int):
+    scope: dict = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"/jobs/get-job/{job_id}",
+        "raw_path": f"/jobs/get-job/{job_id}".encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def seconds_per_request(app: FastAPI) -> float:
+    start: float = time.perf_counter()
+
+    for job_id in range(REQUESTS):
+        await call(app, job_id)
+
+    return (time.perf_counter() - start) / REQUESTS
+
+
+def bookkeeping_seconds() -> float:
+    middleware: MetricsMiddleware = MetricsMiddleware(None, registry=MetricsRegistry())
+
+    def one_request():
+        query_stats, token = start_query_stats()
+        middleware.requests_in_flight.inc("GET")
+        stop_query_stats(token)
+        middleware.requests_in_flight.dec("GET")
+        middleware._record("GET", "/jobs/get-job/{job_id}", 200, 0.01, query_stats)
+
+    return min(timeit.repeat(one_request, number=100_000, repeat=REPEAT)) / 100_000
+
+
+async def main():
+    apps: dict = {with_metrics: make_app(with_metrics) for with_metrics in (False, True)}
+    best: dict = {False: float("inf"), True: float("inf")}
+
+    for app in apps.values():  # warm up
+        await seconds_per_request(app)
+
+    # Take turns, so both see the same machine noise. Best run of each.
+    for _ in range(REPEAT):
+        for with_metrics, app in apps.items():
+            best[with_metrics] = min(best[with_metrics], await seconds_per_request(app))
+
+    without_metrics, with_metrics = best[False], best[True]
+
+    print(f"{'':>16} {'us / request':>14}")
+    print(f"{'without metrics':>16} {without_metrics * 1e6:>14.1f}")
+    print(f"{'with metrics':>16} {with_metrics * 1e6:>14.1f}")
+    print(f"{'overhead':>16} {(with_metrics - without_metrics) * 1e6:>14.1f} ({(with_metrics / without_metrics - 1) * 100:.1f}%)")
+    print(f"{'bookkeeping':>16} {bookkeeping_seconds() * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
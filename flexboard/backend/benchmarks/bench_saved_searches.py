@@ -0,0 +1,97 @@
+"""
+Benchmark: matching new jobs against 100k saved searches, services/percolator_service.py vs checking every saved search.
+
+Run from flexboard/backend:
+    python -m benchmarks.bench_saved_searches [--saved-searches 100000] [--jobs 2000]
+
+No database needed, this is the in-memory part of JobService.create_new_job(s). The results of both are compared.
+"""
+
+import argparse
+import random
+import time
+from typing import FrozenSet, List, Set, Tuple
+
+from services.percolator_service import PercolatorService, job_terms, saved_search_terms
+
+# A vocabulary of skills: a few common ones and a long tail, like real job posts.
+KEYWORDS: List[str] = ["python", "java", "golang", "rust", "react", "django", "fastapi", "kubernetes", "aws", "sql",
+                       "senior", "junior", "lead", "backend", "frontend", "data", "ml", "devops", "security", "mobile"] + [
+                       f"skill{index}" for index in range(2_000)]
+ROLES: List[str] = ["Developer", "Engineer", "Scientist", "Manager", "Designer", "Architect", "Analyst"]
+LOCATIONS: List[str] = ["Remote", "London", "Paris", "Berlin", "New York", "Lisbon", "Porto", "Lyon", "Los Angeles", "Tokyo"]
+COMPANIES: int = 2_000
+
+
+def pick_keywords(randomizer: random.Random, count: int) -> List[str]:
+    # 30% of the words are one of the 20 common ones, the rest comes from the long tail.
+    return [randomizer.choice(KEYWORDS[:20]) if randomizer.random() < 0.3 else randomizer.choice(KEYWORDS[20:]) for _ in range(count)]
+
+
+def make_saved_searches(randomizer: random.Random, count: int) -> List[Tuple[int, str, str, str]]:
+    saved_searches: List[Tuple[int, str, str, str]] = list()
+
+    for saved_search_id in range(1, count + 1):
+        keywords: str = " ".join(pick_keywords(randomizer, randomizer.randint(1, 3)))
+        location: str = randomizer.choice(LOCATIONS) if randomizer.random() < 0.7 else None
+        company: str = f"Company{randomizer.randrange(COMPANIES)}" if randomizer.random() < 0.2 else None
+        saved_searches.append((saved_search_id, keywords, location, company))
+
+    return saved_searches
+
+
+def make_jobs(randomizer: random.Random, count: int) -> List[Tuple[str, str, str, str]]:
+    return [
+        (
+            f"{' '.join(pick_keywords(randomizer, 2)).title()} {randomizer.choice(ROLES)}",
+            f"Company{randomizer.randrange(COMPANIES)}",
+            randomizer.choice(LOCATIONS),
+            " ".join(pick_keywords(randomizer, 20)) + " and a few more words about the job, the team and the offer.",
+        )
+        for _ in range(count)
+    ]
+
+
+def scan_every_saved_search(saved_searches: List[Tuple[int, FrozenSet]], job: Tuple[str, str, str, str]) -> List[int]:
+    terms: Set = job_terms(*job)
+    return [saved_search_id for saved_search_id, wanted in saved_searches if wanted <= terms]
+
+
+def main():
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--saved-searches", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=2_000)
+    arguments = parser.parse_args()
+
+    randomizer: random.Random = random.Random(42)
+    saved_searches: List[Tuple[int, str, str, str]] = make_saved_searches(randomizer, arguments.saved_searches)
+    jobs: List[Tuple[str, str, str, str]] = make_jobs(randomizer, arguments.jobs)
+
+    percolator: PercolatorService = PercolatorService()
+    started: float = time.perf_counter()
+    for saved_search in saved_searches:
+        percolator.add(*saved_search)
+    print(f"index: {len(saved_searches)} saved searches in {(time.perf_counter() - started) * 1000:.0f} ms, {percolator.stats()}")
+
+    started = time.perf_counter()
+    matches: List[List[int]] = [percolator.percolate(*job) for job in jobs]
+    percolator_seconds: float = time.perf_counter() - started
+
+    # The scan is slow, time it on a sample.
+    scanned: List[Tuple[int, FrozenSet]] = [(saved_search_id, saved_search_terms(*rest)) for saved_search_id, *rest in saved_searches]
+    sample: int = min(len(jobs), 100)
+    started = time.perf_counter()
+    scan_matches: List[List[int]] = [scan_every_saved_search(scanned, job) for job in jobs[:sample]]
+    scan_seconds: float = (time.perf_counter() - started) / sample * len(jobs)
+
+    assert [sorted(found) for found in matches[:sample]] == [sorted(found) for found in scan_matches]
+
+    total: int = sum(len(found) for found in matches)
+    print(f"{'':>12} {'us / job':>10} {'jobs / s':>10}")
+    print(f"{'percolator':>12} {percolator_seconds / len(jobs) * 1e6:>10.1f} {len(jobs) / percolator_seconds:>10.0f}")
+    print(f"{'scan':>12} {scan_seconds / len(jobs) * 1e6:>10.1f} {len(jobs) / scan_seconds:>10.0f}")
+    print(f"{total / len(jobs):.1f} matches per job, percolator {scan_seconds / percolator_seconds:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,9 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 PATH_TO_ENV_FILE: str = '.env'
-FULL_ENV_PATH = Path('/Users/flexerfadrigalan/Documents/Code/Python/FastAPI/Udemy Course - FastAPI - Flex - MyProject/flexboard/backend') / PATH_TO_ENV_FILE
+
+# The `.env` next to this file, wherever the project is checked out. ENV_FILE points somewhere else (ex. per environment).
+FULL_ENV_PATH = Path(os.getenv('ENV_FILE', Path(__file__).resolve().parent / PATH_TO_ENV_FILE))
 
 # Loads the variables off the `.env` file
 load_dotenv(dotenv_path=FULL_ENV_PATH)
@@ -22,7 +24,47 @@ class Config:
     POSTGRES_SERVER: str = os.getenv('POSTGRES_SERVER')
     POSTGRES_PORT: str = os.getenv('POSTGRES_PORT')
     POSTGRES_DATABASE: str = os.getenv('POSTGRES_DATABASE')
-    POSTGRES_DATABASE_URL: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DATABASE}"
+    # DATABASE_URL replaces the URL built from the POSTGRES_* values, ex. "sqlite:///./bench.db" for benchmarks.
+    POSTGRES_DATABASE_URL: str = os.getenv(
+        'DATABASE_URL',
+        f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DATABASE}"
+    )
+
+    # Connection pool | size it against the number of workers: workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) <= max_connections.
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+    # Opened when the app starts, so the first requests after a deploy don't wait for new connections. 0 turns it off.
+    DB_POOL_WARM_UP_CONNECTIONS: int = int(os.getenv('DB_POOL_WARM_UP_CONNECTIONS', DB_POOL_SIZE))
+
+    # create_all() on startup, handy locally and in tests. Turn it off where migrations own the schema (production).
+    DATABASE_CREATE_TABLES: bool = os.getenv('DATABASE_CREATE_TABLES', 'true').lower() in ('1', 'true', 'yes')
+
+    # Read replicas | comma separated URLs. Read-only DAO methods (see database/replicas.py) are spread over them,
+    # writes always go to the primary. Empty = everything on the primary.
+    DATABASE_REPLICA_URLS: list = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    DATABASE_ASYNC_REPLICA_URLS: list = [url.strip() for url in os.getenv('DATABASE_ASYNC_REPLICA_URLS', '').split(',') if url.strip()]
+
+    # "round_robin" or "least_connections" (fewest connections checked out from the replica's pool).
+    DATABASE_REPLICA_BALANCING: str = os.getenv('DATABASE_REPLICA_BALANCING', 'round_robin')
+
+    # After a client writes, its reads go to the primary for this long, so it sees its own write despite replica lag.
+    # Remembered by a cookie (browsers), and by user id in each worker for bearer-token clients, which send no cookies.
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv('READ_YOUR_WRITES_SECONDS', 5))
+
+    # Users whose window is kept in process at once, the least recently written ones give way past this.
+    READ_YOUR_WRITES_MAX_USERS: int = int(os.getenv('READ_YOUR_WRITES_MAX_USERS', 100000))
+
+    # Async mode | routes use an AsyncEngine / AsyncSession instead of the sync engine + Starlette's threadpool.
+    # Flip it to benchmark both paths side by side. The async URL needs `asyncpg` (Postgres) or `aiosqlite` (sqlite+aiosqlite://).
+    DATABASE_ASYNC_MODE: bool = os.getenv('DATABASE_ASYNC_MODE', 'false').lower() in ('1', 'true', 'yes')
+    POSTGRES_ASYNC_DATABASE_URL: str = os.getenv(
+        'POSTGRES_ASYNC_DATABASE_URL',
+        f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DATABASE}"
+    )
 
     # ------------ JWT (JSON Web Token) Metadata ------------ #
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = os.getenv('JWT_ACCESS_TOKEN_EXPIRE_MINUTES')
@@ -34,5 +76,129 @@ class Config:
     # the value 'HS256' came from FastAPI docs, it is a hashing algorithm.
     JWT_ALGORITHM: str = os.getenv('JWT_ALGORITHM')
 
+    # Verified tokens are cached in memory so we don't decode the same JWT on every request.
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv('TOKEN_CACHE_MAX_SIZE', 10000))
+
+    # Upper bound on how long a cached token lives, entries also never outlive the token's own `exp`.
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv('TOKEN_CACHE_TTL_SECONDS', 300))
+
+    # ------- Job Response Cache (get-job / list-jobs) ------- #
+    # Serialized get-job / list-jobs responses are cached, keyed by their ETag so a write never leaves a stale entry behind.
+    JOB_CACHE_ENABLED: bool = os.getenv('JOB_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    JOB_CACHE_MAX_SIZE: int = int(os.getenv('JOB_CACHE_MAX_SIZE', 10000))
+
+    # Entries of an old ETag are unreachable after a write, the TTL only decides how soon they free their memory.
+    JOB_CACHE_TTL_SECONDS: int = int(os.getenv('JOB_CACHE_TTL_SECONDS', 60))
+
+    JOB_LIST_CACHE_TTL_SECONDS: int = int(os.getenv('JOB_LIST_CACHE_TTL_SECONDS', 10))
+
+    # ------- Password Hashing (bcrypt worker pool) ------- #
+    # How many bcrypt hashes/verifies can run at the same time. bcrypt releases the GIL, so threads are enough.
+    HASH_WORKER_POOL_SIZE: int = int(os.getenv('HASH_WORKER_POOL_SIZE', 4))
+
+    # How many hashes can be running + waiting before we reply 503 instead of queueing more.
+    HASH_MAX_PENDING: int = int(os.getenv('HASH_MAX_PENDING', 64))
+
+    # ------- Startup ------- #
+    # Warm the DB pool (DB_POOL_WARM_UP_CONNECTIONS) and bcrypt before /readyz says ready.
+    WARM_UP_ON_STARTUP: bool = os.getenv('WARM_UP_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+
+    # ------- Pagination ------- #
+    # Page size used by list endpoints when the client does not send `limit`.
+    JOBS_PAGE_SIZE_DEFAULT: int = int(os.getenv('JOBS_PAGE_SIZE_DEFAULT', 50))
+
+    # Hard cap, a bigger `limit` is silently lowered to this.
+    JOBS_PAGE_SIZE_MAX: int = int(os.getenv('JOBS_PAGE_SIZE_MAX', 200))
+
+    # `description_snippet` of list responses (`fields=`), in characters. The full description is only sent by get-job.
+    JOB_DESCRIPTION_SNIPPET_LENGTH: int = int(os.getenv('JOB_DESCRIPTION_SNIPPET_LENGTH', 200))
+
+    # ------- Typeahead (/jobs/suggest) ------- #
+    # In-memory prefix index over job titles, companies and locations, see services/job_suggest_service.py.
+    JOB_SUGGEST_ENABLED: bool = os.getenv('JOB_SUGGEST_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    JOB_SUGGEST_LIMIT_DEFAULT: int = int(os.getenv('JOB_SUGGEST_LIMIT_DEFAULT', 10))
+    JOB_SUGGEST_LIMIT_MAX: int = int(os.getenv('JOB_SUGGEST_LIMIT_MAX', 50))
+
+    # Rows per batch of the startup scan that builds the index.
+    JOB_SUGGEST_BUILD_BATCH_SIZE: int = int(os.getenv('JOB_SUGGEST_BUILD_BATCH_SIZE', 5000))
+
+    # ------- Saved searches (/saved-searches) ------- #
+    # New jobs are matched against every saved search right after they are created, see services/saved_search_service.py.
+    SAVED_SEARCHES_ENABLED: bool = os.getenv('SAVED_SEARCHES_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SAVED_SEARCHES_MAX_PER_USER: int = int(os.getenv('SAVED_SEARCHES_MAX_PER_USER', 100))
+
+    # How often a worker looks for saved searches created by the other workers, in seconds.
+    SAVED_SEARCHES_SYNC_SECONDS: float = float(os.getenv('SAVED_SEARCHES_SYNC_SECONDS', 1))
+
+    # Saved searches created this recently are read again on every sync, one that committed after a higher id
+    # was already read is still picked up. Longer than any saved search create transaction, in seconds.
+    SAVED_SEARCHES_SYNC_WINDOW_SECONDS: float = float(os.getenv('SAVED_SEARCHES_SYNC_WINDOW_SECONDS', 60))
+
+    # New jobs waiting for the matcher thread, past this the oldest ones are not matched (the database is likely down).
+    SAVED_SEARCHES_PENDING_MAX: int = int(os.getenv('SAVED_SEARCHES_PENDING_MAX', 10000))
+
+    # Saved searches read per query, at startup and when syncing.
+    SAVED_SEARCHES_SYNC_BATCH_SIZE: int = int(os.getenv('SAVED_SEARCHES_SYNC_BATCH_SIZE', 5000))
+
+    SAVED_SEARCH_MATCHES_PAGE_SIZE_DEFAULT: int = int(os.getenv('SAVED_SEARCH_MATCHES_PAGE_SIZE_DEFAULT', 50))
+    SAVED_SEARCH_MATCHES_PAGE_SIZE_MAX: int = int(os.getenv('SAVED_SEARCH_MATCHES_PAGE_SIZE_MAX', 200))
+
+    # ------- Change feed (/jobs/stream, Server-Sent Events) ------- #
+    # "local" (this worker only) or "postgres" (LISTEN / NOTIFY, every worker sees every event).
+    JOB_EVENTS_BACKEND: str = os.getenv('JOB_EVENTS_BACKEND', 'local')
+    JOB_EVENTS_CHANNEL: str = os.getenv('JOB_EVENTS_CHANNEL', 'job_events')
+
+    # The last N events, clients resume from there with Last-Event-ID.
+    JOB_EVENTS_BUFFER_SIZE: int = int(os.getenv('JOB_EVENTS_BUFFER_SIZE', 1000))
+
+    # Events waiting per open stream, a client that falls further behind is disconnected (it resumes on reconnect).
+    JOB_EVENTS_QUEUE_SIZE: int = int(os.getenv('JOB_EVENTS_QUEUE_SIZE', 100))
+    JOB_EVENTS_MAX_SUBSCRIBERS: int = int(os.getenv('JOB_EVENTS_MAX_SUBSCRIBERS', 1000))
+    JOB_EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv('JOB_EVENTS_HEARTBEAT_SECONDS', 15))
+
+    # ------- Job stats (/jobs/stats) ------- #
+    # Counters of active jobs per company / location / posting date, see database/daos/job_stat_dao.py.
+    JOB_STATS_LIMIT_DEFAULT: int = int(os.getenv('JOB_STATS_LIMIT_DEFAULT', 100))
+    JOB_STATS_LIMIT_MAX: int = int(os.getenv('JOB_STATS_LIMIT_MAX', 1000))
+
+    # Values per facet of list-jobs `facets=true`, counted live over the filtered jobs (not from the counters).
+    JOB_FACETS_LIMIT: int = int(os.getenv('JOB_FACETS_LIMIT', 20))
+
+    # How often the counters are recounted from the jobs to fix any drift, in seconds (also once at startup). 0 turns it off.
+    JOB_STATS_RECONCILE_SECONDS: float = float(os.getenv('JOB_STATS_RECONCILE_SECONDS', 3600))
+
+    # ------- Bulk import (/jobs/bulk-create) ------- #
+    # Jobs validated + inserted per multi-row INSERT / transaction.
+    JOBS_BULK_BATCH_SIZE: int = int(os.getenv('JOBS_BULK_BATCH_SIZE', 500))
+
+    # Items read per request, the rest is ignored and the response says `truncated`.
+    JOBS_BULK_MAX_ITEMS: int = int(os.getenv('JOBS_BULK_MAX_ITEMS', 50000))
+
+    # A JSON array body is parsed whole, bigger ones get 413 (NDJSON is streamed and has no such limit).
+    JOBS_BULK_MAX_BODY_BYTES: int = int(os.getenv('JOBS_BULK_MAX_BODY_BYTES', 10 * 1024 * 1024))
+
+    # One NDJSON line (one job), a longer one is reported as a bad item and skipped.
+    JOBS_BULK_MAX_LINE_BYTES: int = int(os.getenv('JOBS_BULK_MAX_LINE_BYTES', 256 * 1024))
+
+    # ------- Export (/jobs/export) ------- #
+    # Rows fetched from the server-side cursor and written to the response at a time.
+    JOBS_EXPORT_BATCH_SIZE: int = int(os.getenv('JOBS_EXPORT_BATCH_SIZE', 1000))
+
+    # ------- Metrics (/metrics, Prometheus text format) ------- #
+    # Per-route latency / status / DB time, recorded by middleware/metrics_middleware.py.
+    METRICS_ENABLED: bool = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # ------- SQL Profiler (debug) ------- #
+    # Statement count, DB time and slowest statements per request, as a Server-Timing header + logs.
+    SQL_PROFILER_ENABLED: bool = os.getenv('SQL_PROFILER_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    SQL_PROFILER_SLOWEST: int = int(os.getenv('SQL_PROFILER_SLOWEST', 5))
+
+    # The same statement this many times in one request is logged as a likely N+1.
+    SQL_PROFILER_N_PLUS_ONE_THRESHOLD: int = int(os.getenv('SQL_PROFILER_N_PLUS_ONE_THRESHOLD', 5))
+
+    # Raise instead of logging a warning when a route runs more statements than its budget (tests turn it on).
+    SQL_QUERY_BUDGET_STRICT: bool = os.getenv('SQL_QUERY_BUDGET_STRICT', 'false').lower() in ('1', 'true', 'yes')
+
 
 config_object: Config = Config()
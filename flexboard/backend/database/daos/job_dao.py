@@ -1,12 +1,21 @@
-from typing import Optional
+import re
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator, Iterator, Optional, Tuple
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import update, Update, delete, Delete
+from sqlalchemy import Row, String, and_, cast, column, false, func, literal, literal_column, null, table, true, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, with_expression
+from sqlalchemy.sql import update, Update, delete, Delete, insert, Insert, select, Select, CompoundSelect, FromClause
 
-from api_models.job import JobCreate, UpdateJob
+from api_models.job import JobCreate, JobFilters, UpdateJob
+from api_models.token import TokenPrincipal
+from config import config_object
+from database.daos.job_stat_dao import (
+    JOB_STAT_FACETS, JobStatDao, facet_counts_statement, job_stat_dao, job_stat_deltas, top_per_facet_statement
+)
 from database.orm_models.job import Job
-from database.orm_models.user import User
+from database.replicas import read_only
 
 
 # FLUSH vs COMMIT
@@ -34,8 +43,50 @@ from database.orm_models.user import User
 #
 #    - We will be leaking ORM models which is NOT good since they are powerful objects that can run persistence operations.
 
+# Sync vs Async
+# - Every method has an `_async` twin that takes an AsyncSession and must be awaited (config: DATABASE_ASYNC_MODE).
+# - Both build their SQL with the same `_..._statement()` helpers, so the two paths always run the same queries.
+
+# Job stats
+# - create / update / delete also move the /jobs/stats counters (database/daos/job_stat_dao.py), in the same transaction.
+
+
+# Columns written by /jobs/export, in this order.
+EXPORT_JOB_COLUMNS: tuple = (
+    Job.id,
+    Job.title,
+    Job.company,
+    Job.company_url,
+    Job.location,
+    Job.description,
+    Job.date_posted,
+    Job.is_active,
+    Job.owner_id,
+)
+
+
+# Columns the ETag / Last-Modified of a job is built from. All of them are in ix_job_id_version and
+# ix_job_active_date_posted_id, so selecting only these is an index-only read.
+JOB_VALIDATOR_COLUMNS: tuple = (
+    Job.id,
+    Job.version,
+    Job.updated_at,
+)
+
+
+class JobMutationStatus(str, Enum):
+    """
+    Outcome of a conditional update / delete. Tells the route which HTTP status to answer with.
+    """
+    DONE = "done"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+
 
 class JobDao:
+    def __init__(self, job_stat_dao_param: JobStatDao):
+        self.job_stat_dao = job_stat_dao_param
+
     def create_new_job(self, job: JobCreate, owner_id: int, session: Session) -> Job:
         # We create Job object because this is a SQLAlchemy object, it can interact with the database for us.
         # I personally do not like doing it this way.
@@ -49,59 +100,585 @@ class JobDao:
         #     owner_id=owner_id
         # )
 
-        # These yellows are incorrectly here, PyCharm is thinking that there is no __init__ method for Job class!
-        #  the base class IS annotated with as_declarative() which in turns makes possible.
-        db_job: Job = Job(**job.model_dump(), owner_id=owner_id)
+        # One round trip: INSERT ... RETURNING the whole row (id, defaults) as a Job, instead of add / commit / refresh,
+        # the refresh was a second query only to read back what we just wrote.
+        db_job: Job = session.scalar(self._insert_job_statement(job, owner_id))
+        self.job_stat_dao.apply_deltas(job_stat_deltas(new=[job]), session)
 
-        # This new Base class object (an ORM object) can now be interpreted by the db_session.
-        # add, commit, refresh, return | go to repository/users.py to see what these are!
-        session.add(db_job)
+        # commit() would expire the RETURNING values and reading them again (ex. to serialize) would cost a SELECT.
+        session.expunge(db_job)
         session.commit()
-        session.refresh(db_job)  # refresh the row of data ... we do this to get the id. Not needed.
 
         return db_job
 
+    def _insert_job_statement(self, job: JobCreate, owner_id: int) -> Insert:
+        return insert(Job).values(**job.model_dump(), owner_id=owner_id).returning(Job)
+
+    def create_new_jobs(self, jobs: list[JobCreate], owner_id: int, session: Session) -> list[int]:
+        """
+        Inserts a whole batch in one transaction with multi-row INSERT ... VALUES (...), (...) RETURNING id,
+        instead of add / commit / refresh per job. Returns the new ids in the same order as `jobs`.
+        If any row fails, nothing from this batch is kept (the caller decides what to do).
+        """
+        if not jobs:
+            return list()
+
+        job_ids: list[int] = list(session.scalars(self._insert_jobs_statement(), self._insert_jobs_rows(jobs, owner_id)).all())
+        self.job_stat_dao.apply_deltas(job_stat_deltas(new=jobs), session)
+        session.commit()
+
+        return job_ids
+
+    def _insert_jobs_statement(self) -> Insert:
+        # sort_by_parameter_order | the ids come back in the same order as the rows we sent.
+        return insert(Job).returning(Job.id, sort_by_parameter_order=True)
+
+    def _insert_jobs_rows(self, jobs: list[JobCreate], owner_id: int) -> list[dict]:
+        return [{**job.model_dump(), "owner_id": owner_id} for job in jobs]
+
+    @read_only
     def retrieve_job(self, job_id: int, session: Session) -> Optional[Job]:
         return session.get(Job, job_id)
 
-    def list_jobs(self, session: Session) -> list[Job]:
+    @read_only
+    def retrieve_job_validator(self, job_id: int, session: Session) -> Optional[Row]:
+        """
+        (id, version, updated_at) of one job, without loading the row. None if there is no such job.
+        """
+        return session.execute(self._job_validator_statement(job_id)).first()
+
+    def _job_validator_statement(self, job_id: int) -> Select:
+        return select(*JOB_VALIDATOR_COLUMNS).where(Job.id == job_id)
+
+    @read_only
+    def list_jobs(
+        self,
+        session: Session,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, int]] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> list[Job]:
+        """
+        :param fields: load only these (see _with_fields), None loads whole jobs.
+        :param filters: see _job_filter_clauses, None lists the active jobs.
+        """
+        statement: Select = self._with_fields(self._list_jobs_statement(limit, after, filters=filters), fields)
+        jobs: list[Job] = list(session.scalars(statement).all())
+        return jobs
+
+    @read_only
+    def list_jobs_validators(
+        self,
+        session: Session,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, int]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> list[Row]:
+        """
+        Same rows as list_jobs(), but only (id, version, updated_at), read from the index.
+        """
+        return list(session.execute(self._list_jobs_statement(limit, after, JOB_VALIDATOR_COLUMNS, filters)).all())
+
+    @read_only
+    def list_jobs_validators_and_facets(
+        self,
+        session: Session,
+        limit: int,
+        facets_limit: int,
+        after: Optional[Tuple[date, int]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> Tuple[list[Row], list[Row]]:
+        """
+        list_jobs_validators() and the `facets=` of list-jobs, in one round trip (see _list_jobs_validators_and_facets_statement).
+        :return: the page's (id, version, updated_at) rows, and (facet, value, count) over every job matching `filters`:
+                 at most `facets_limit` values per facet, most jobs first.
+        """
+        rows: list[Row] = list(session.execute(
+            self._list_jobs_validators_and_facets_statement(session.bind.dialect.name, limit, facets_limit, after, filters)
+        ).all())
+
+        return self._split_validators_and_facets(rows)
+
+    def _list_jobs_validators_and_facets_statement(
+        self,
+        dialect_name: str,
+        limit: int,
+        facets_limit: int,
+        after: Optional[Tuple[date, int]],
+        filters: Optional[JobFilters]
+    ) -> CompoundSelect:
+        """
+        The facet rows UNION ALL the page rows, each side NULL in the other's columns, `part` tells them apart.
+        Facets first, in the order of top_per_facet_statement, then the page in keyset order.
+        The NULLs are typed, the first SELECT gives the result its column types (ex. updated_at stays a datetime on SQLite).
+        """
+        facet_rows: FromClause = self._job_facets_statement(dialect_name, facets_limit, filters).subquery()
+        page_rows: FromClause = self._list_jobs_statement(limit, after, (*JOB_VALIDATOR_COLUMNS, Job.date_posted), filters).subquery()
+        page_columns: tuple = ("id", "version", "updated_at", "date_posted")
+
+        union: CompoundSelect = union_all(
+            select(
+                literal("facet", String).label("part"),
+                facet_rows.c.facet,
+                facet_rows.c.value,
+                facet_rows.c["count"],
+                *[cast(null(), page_rows.c[name].type).label(name) for name in page_columns]
+            ),
+            select(
+                literal("page", String).label("part"),
+                *[cast(null(), facet_rows.c[name].type).label(name) for name in ("facet", "value", "count")],
+                *[page_rows.c[name] for name in page_columns]
+            )
+        )
+        columns = union.selected_columns
+
+        return union.order_by(
+            columns.part, columns.facet, columns["count"].desc(), columns.value, columns.date_posted.desc(), columns.id.desc()
+        )
+
+    def _split_validators_and_facets(self, rows: list[Row]) -> Tuple[list[Row], list[Row]]:
+        return [row for row in rows if row.part == "page"], [row for row in rows if row.part == "facet"]
+
+    def _list_jobs_statement(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, int]] = None,
+        columns: Optional[tuple] = None,
+        filters: Optional[JobFilters] = None
+    ) -> Select:
+        """
+        Newest jobs first, ordered by (date_posted, id).
+
+        :param limit: max number of rows, None returns every matching job.
+        :param after: the (date_posted, id) of the last row of the previous page. Keyset / seek pagination,
+                      the WHERE clause below lets the database jump to the right spot instead of using OFFSET.
+        :param columns: select only these columns instead of whole Job objects.
+        :param filters: all in this one WHERE clause, see _job_filter_clauses. None lists the active jobs.
+        """
+        statement: Select = select(*columns) if columns else select(Job)
+        statement = statement.where(*self._job_filter_clauses(filters))
+
+        if after:
+            statement = statement.where(tuple_(Job.date_posted, Job.id) < tuple_(*after))
+
+        statement = statement.order_by(Job.date_posted.desc(), Job.id.desc())
+
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        return statement
+
+    def _job_filter_clauses(self, filters: Optional[JobFilters]) -> list:
+        """
+        The WHERE clauses of list-jobs (and of its facet counts), AND-ed. company / location / owner_id each have an index
+        that starts with them, then is_active and the keyset order (orm_models/job.py). Without any of them the page
+        comes from ix_job_active_date_posted_id, like before filters existed.
+
+        is_active is compared with a literal true / false, not a bound parameter: SQLite only uses a partial index
+        (ix_job_active_date_posted_id) when it sees, while preparing the statement, that the WHERE implies its own.
+        """
+        if filters is None:
+            filters = JobFilters()
+
         # The way SQLAlchemy works, you MUST use == instead of 'is' keyword.
-        jobs: list[Job] = session.query(Job).filter(Job.is_active == True).all()
+        clauses: list = list()
+
+        if filters.is_active is not None:
+            clauses.append(Job.is_active == (true() if filters.is_active else false()))
+
+        for name in ("company", "location", "owner_id"):
+            value = getattr(filters, name)
+
+            if value is not None:
+                clauses.append(getattr(Job, name) == value)
+
+        if filters.date_from is not None:
+            clauses.append(Job.date_posted >= filters.date_from)
+
+        if filters.date_to is not None:
+            clauses.append(Job.date_posted <= filters.date_to)
+
+        return clauses
+
+    def _job_facets_statement(self, dialect_name: str, limit: int, filters: Optional[JobFilters]) -> Select:
+        return top_per_facet_statement(facet_counts_statement(dialect_name, *self._job_filter_clauses(filters)).subquery(), limit)
+
+    def _with_fields(self, statement: Select, fields: Optional[Tuple[str, ...]]) -> Select:
+        """
+        Narrows a `select(Job)` to a sparse fieldset (`fields=` of list-jobs / search):
+        - load_only     | only the asked columns are in the SELECT, the rest (above all `description`) is never read.
+                          id + date_posted always come along, the next page cursor is built from them.
+        - with_expression | `description_snippet` is `substr(description, 1, JOB_DESCRIPTION_SNIPPET_LENGTH + 1)`,
+                          the database cuts the text, only the snippet travels. (+1 tells the serializer it was cut.)
+
+        populate_existing | a job already in the session's identity map would otherwise keep its old state,
+                            without the snippet.
+        """
+        if fields is None:
+            return statement
+
+        columns: list = [getattr(Job, field) for field in fields if field not in ("id", "date_posted", "description_snippet")]
+        statement = statement.options(load_only(Job.id, Job.date_posted, *columns))
+
+        if "description_snippet" in fields:
+            snippet = func.substr(Job.description, 1, config_object.JOB_DESCRIPTION_SNIPPET_LENGTH + 1)
+            statement = statement.options(with_expression(Job.description_snippet, snippet))
+
+        return statement.execution_options(populate_existing=True)
+
+    def stream_jobs(self, session: Session, batch_size: int, is_active: Optional[bool] = None) -> Iterator[list[Row]]:
+        """
+        Every job (or only active / inactive ones), as plain rows in batches of `batch_size`.
+        yield_per turns on a server-side cursor (stream_results), so only one batch is in memory at a time.
+        """
+        result = session.execute(self._export_jobs_statement(is_active).execution_options(yield_per=batch_size))
+
+        for partition in result.partitions():
+            yield partition
+
+    def stream_suggest_terms(self, session: Session, batch_size: int) -> Iterator[list[Row]]:
+        """
+        (id, title, company, location) of every active job, in batches, to build the typeahead index
+        (services/job_suggest_service.py). Same server-side cursor as stream_jobs(), without the big columns.
+        """
+        statement: Select = select(Job.id, Job.title, Job.company, Job.location).where(Job.is_active == True)
+        result = session.execute(statement.execution_options(yield_per=batch_size))
+
+        for partition in result.partitions():
+            yield partition
+
+    def _export_jobs_statement(self, is_active: Optional[bool] = None) -> Select:
+        # Columns only, no ORM objects to build for every row.
+        statement: Select = select(*EXPORT_JOB_COLUMNS).order_by(Job.id)
+
+        if is_active is not None:
+            statement = statement.where(Job.is_active == is_active)
+
+        return statement
+
+    @read_only
+    def search_jobs(
+        self,
+        session: Session,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        is_active: Optional[bool] = True,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> list[Job]:
+        statement: Optional[Select] = self._search_jobs_statement(
+            session.bind.dialect.name, query, limit, offset, is_active, date_from, date_to
+        )
+
+        if statement is None:
+            return list()
+
+        jobs: list[Job] = list(session.scalars(self._with_fields(statement, fields)).all())
         return jobs
 
+    def _search_jobs_statement(
+        self,
+        dialect_name: str,
+        query: str,
+        limit: int,
+        offset: int,
+        is_active: Optional[bool],
+        date_from: Optional[date],
+        date_to: Optional[date]
+    ) -> Optional[Select]:
+        """
+        Full-text search over title, company, description and location, best match first.
+        Uses the index created next to the `Job` model (orm_models/job.py):
+        - postgresql | `search_vector` tsvector column + GIN index, ranked with ts_rank_cd.
+        - sqlite     | `job_fts` FTS5 table, ranked with bm25.
+
+        Returns None when the query has no searchable words.
+        """
+        if dialect_name == "postgresql":
+            ts_query = func.websearch_to_tsquery("english", query)
+            search_vector = literal_column("job.search_vector")
+            rank = func.ts_rank_cd(search_vector, ts_query)
+
+            statement: Select = select(Job).where(search_vector.op("@@")(ts_query)).order_by(rank.desc(), Job.id.desc())
+
+        elif dialect_name == "sqlite":
+            fts_query: str = self._fts5_query(query)
+
+            if not fts_query:
+                return None
+
+            job_fts = table("job_fts", column("rowid"))
+            # bm25 weights follow the FTS5 column order: title, company, description, location. Lower is better.
+            rank = func.bm25(literal_column("job_fts"), 10.0, 5.0, 1.0, 3.0)
+
+            statement: Select = select(Job).join(job_fts, job_fts.c.rowid == Job.id).where(
+                literal_column("job_fts").op("MATCH")(fts_query)
+            ).order_by(rank, Job.id.desc())
+
+        else:
+            raise NotImplementedError(f"Job search is not supported on {dialect_name}.")
+
+        if is_active is not None:
+            statement = statement.where(Job.is_active == is_active)
+
+        if date_from is not None:
+            statement = statement.where(Job.date_posted >= date_from)
+
+        if date_to is not None:
+            statement = statement.where(Job.date_posted <= date_to)
+
+        return statement.limit(limit).offset(offset)
+
+    def _fts5_query(self, query: str) -> str:
+        # Quote every word, so user input can't use (or break) the FTS5 query syntax. Words are AND-ed.
+        return " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+
     def update_job_by_id(
         self,
         job_id: int,
         update_job: UpdateJob,
-        user: User,
+        user: TokenPrincipal,
         session: Session
-    ) -> Optional[Job]:
-        update_job_dict: dict = self._update_job_payload(update_job)
+    ) -> Tuple[JobMutationStatus, Optional[Job]]:
+        """
+        One round trip: UPDATE ... WHERE id = :job_id AND <user may edit it> RETURNING *.
+        Only when no row comes back do we ask why (not found vs not the owner), that's the rare path.
 
-        update_statement: Update = update(Job).where(
-            and_(
-                Job.id == job_id,
-                Job.owner_id == user.id
-            )
-        ).values(update_job_dict).returning(Job)
+        An update of company / location / date_posted / is_active also moves the job stats: the same UPDATE returns
+        the old values too (see _update_job_statement), and one query after moves the counters.
+        """
+        row: Optional[Row] = session.execute(self._update_job_statement(session.bind.dialect.name, job_id, update_job, user)).first()
+        db_job: Optional[Job] = row[0] if row is not None else None
+
+        if db_job is not None:
+            if self._changes_job_stats(update_job):
+                # the row's old_job columns are named after the facets, it reads like the job before the update.
+                self.job_stat_dao.apply_deltas(job_stat_deltas(old=[row], new=[db_job]), session)
+
+            # commit() would expire the RETURNING values and reading them again would cost a SELECT.
+            session.expunge(db_job)
 
-        db_job: Job = session.execute(update_statement).scalar()
         # Flushes (loads up the operations), and commits(saves) to the DB.
         session.commit()
 
-        return db_job
+        if db_job is not None:
+            return JobMutationStatus.DONE, db_job
+
+        return self._missing_job_status(session.execute(self._job_exists_statement(job_id)).first()), None
+
+    def _update_job_statement(self, dialect_name: str, job_id: int, update_job: UpdateJob, user: TokenPrincipal) -> Update:
+        """
+        RETURNING the job, and when the update moves the job stats, its old company / location / date_posted / is_active.
+        - postgresql | UPDATE job ... FROM (SELECT ... FOR UPDATE) old_job RETURNING job.*, old_job.*: the row is locked
+                       before it is read, nobody changes it between the read and our UPDATE, the old values stay right.
+        - others     | SQLite can't RETURN the columns of an UPDATE ... FROM. A MATERIALIZED CTE is read (by the WHERE)
+                       before any row changes, scalar subqueries on it in the RETURNING give the old values.
+        """
+        update_job_dict: dict = self._update_job_payload(update_job)
+
+        if not update_job_dict:
+            # nothing to change, still run the (no-op) UPDATE so ownership is checked and the row is returned.
+            # The version stays the same, so clients keep their ETag.
+            update_job_dict = {"id": Job.id}
+        else:
+            update_job_dict.update({"version": Job.version + 1, "updated_at": datetime.utcnow()})
+
+        statement: Update = update(Job).values(update_job_dict)
+
+        if not self._changes_job_stats(update_job):
+            return statement.where(self._can_modify_job_clause(job_id, user)).returning(Job)
+
+        old_job_statement: Select = select(Job.id, *JOB_STAT_FACETS.values(), Job.is_active).where(
+            self._can_modify_job_clause(job_id, user)
+        ).with_for_update()
+
+        if dialect_name == "postgresql":
+            old_job = old_job_statement.subquery("old_job")
+            return statement.where(Job.id == old_job.c.id).returning(
+                Job, *[old_job.c[name].label(name) for name in (*JOB_STAT_FACETS, "is_active")]
+            )
+
+        old_job = old_job_statement.cte("old_job").prefix_with("MATERIALIZED")
+        return statement.where(Job.id.in_(select(old_job.c.id))).returning(
+            Job, *[select(old_job.c[name]).scalar_subquery().label(name) for name in (*JOB_STAT_FACETS, "is_active")]
+        )
 
     def _update_job_payload(self, update_job: UpdateJob) -> dict:
-        update_job_payload: dict = dict()
-        for update_job_key, update_job_value in update_job.model_dump().items():
-            if update_job_value:
-                update_job_payload[update_job_key] = update_job_value
-        return update_job_payload
-
-    def delete_job_by_id(self, job_id: int, session: Session):
-        delete_statement: Delete = delete(Job).where(Job.id == job_id)
-        session.execute(delete_statement)
+        # exclude_none, not "if value", so False (ex. is_active=False) is still applied.
+        return update_job.model_dump(exclude_none=True)
+
+    def _changes_job_stats(self, update_job: UpdateJob) -> bool:
+        return any(field in self._update_job_payload(update_job) for field in (*JOB_STAT_FACETS, "is_active"))
+
+    def delete_job_by_id(self, job_id: int, user: TokenPrincipal, session: Session) -> JobMutationStatus:
+        """
+        One round trip: DELETE ... WHERE id = :job_id AND <user may delete it> RETURNING id + the job stats columns,
+        then one more for the job stats.
+        """
+        deleted_job: Optional[Row] = session.execute(self._delete_job_statement(job_id, user)).first()
+
+        if deleted_job is not None:
+            self.job_stat_dao.apply_deltas(job_stat_deltas(old=[deleted_job]), session)
+
         session.commit()
 
+        if deleted_job is not None:
+            return JobMutationStatus.DONE
+
+        return self._missing_job_status(session.execute(self._job_exists_statement(job_id)).first())
+
+    def _delete_job_statement(self, job_id: int, user: TokenPrincipal) -> Delete:
+        return delete(Job).where(self._can_modify_job_clause(job_id, user)).returning(Job.id, *JOB_STAT_FACETS.values(), Job.is_active)
+
+    def _can_modify_job_clause(self, job_id: int, user: TokenPrincipal):
+        # Owner or superuser. The superuser check is done here in Python, so their SQL stays a plain primary key lookup.
+        if user.is_superuser:
+            return Job.id == job_id
+
+        return and_(
+            Job.id == job_id,
+            Job.owner_id == user.id
+        )
+
+    def _job_exists_statement(self, job_id: int) -> Select:
+        return select(Job.id).where(Job.id == job_id)
+
+    def _missing_job_status(self, existing_row) -> JobMutationStatus:
+        return JobMutationStatus.FORBIDDEN if existing_row is not None else JobMutationStatus.NOT_FOUND
+
+    # ------- Async twins, same queries on an AsyncSession ------- #
+
+    async def create_new_job_async(self, job: JobCreate, owner_id: int, session: AsyncSession) -> Job:
+        db_job: Job = await session.scalar(self._insert_job_statement(job, owner_id))
+        await self.job_stat_dao.apply_deltas_async(job_stat_deltas(new=[job]), session)
+
+        session.expunge(db_job)
+        await session.commit()
+
+        return db_job
+
+    async def create_new_jobs_async(self, jobs: list[JobCreate], owner_id: int, session: AsyncSession) -> list[int]:
+        if not jobs:
+            return list()
+
+        job_ids: list[int] = list((await session.scalars(self._insert_jobs_statement(), self._insert_jobs_rows(jobs, owner_id))).all())
+        await self.job_stat_dao.apply_deltas_async(job_stat_deltas(new=jobs), session)
+        await session.commit()
+
+        return job_ids
+
+    @read_only
+    async def retrieve_job_async(self, job_id: int, session: AsyncSession) -> Optional[Job]:
+        return await session.get(Job, job_id)
+
+    @read_only
+    async def retrieve_job_validator_async(self, job_id: int, session: AsyncSession) -> Optional[Row]:
+        return (await session.execute(self._job_validator_statement(job_id))).first()
+
+    @read_only
+    async def list_jobs_async(
+        self,
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, int]] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> list[Job]:
+        statement: Select = self._with_fields(self._list_jobs_statement(limit, after, filters=filters), fields)
+        jobs: list[Job] = list((await session.scalars(statement)).all())
+        return jobs
+
+    @read_only
+    async def list_jobs_validators_async(
+        self,
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, int]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> list[Row]:
+        return list((await session.execute(self._list_jobs_statement(limit, after, JOB_VALIDATOR_COLUMNS, filters))).all())
+
+    @read_only
+    async def list_jobs_validators_and_facets_async(
+        self,
+        session: AsyncSession,
+        limit: int,
+        facets_limit: int,
+        after: Optional[Tuple[date, int]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> Tuple[list[Row], list[Row]]:
+        rows: list[Row] = list((await session.execute(
+            self._list_jobs_validators_and_facets_statement(session.bind.dialect.name, limit, facets_limit, after, filters)
+        )).all())
+
+        return self._split_validators_and_facets(rows)
+
+    async def stream_jobs_async(self, session: AsyncSession, batch_size: int, is_active: Optional[bool] = None) -> AsyncIterator[list[Row]]:
+        result = await session.stream(self._export_jobs_statement(is_active).execution_options(yield_per=batch_size))
+
+        async for partition in result.partitions():
+            yield partition
+
+    @read_only
+    async def search_jobs_async(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        is_active: Optional[bool] = True,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> list[Job]:
+        statement: Optional[Select] = self._search_jobs_statement(
+            session.bind.dialect.name, query, limit, offset, is_active, date_from, date_to
+        )
+
+        if statement is None:
+            return list()
+
+        jobs: list[Job] = list((await session.scalars(self._with_fields(statement, fields))).all())
+        return jobs
+
+    async def update_job_by_id_async(
+        self,
+        job_id: int,
+        update_job: UpdateJob,
+        user: TokenPrincipal,
+        session: AsyncSession
+    ) -> Tuple[JobMutationStatus, Optional[Job]]:
+        row: Optional[Row] = (await session.execute(self._update_job_statement(session.bind.dialect.name, job_id, update_job, user))).first()
+        db_job: Optional[Job] = row[0] if row is not None else None
+
+        if db_job is not None:
+            if self._changes_job_stats(update_job):
+                await self.job_stat_dao.apply_deltas_async(job_stat_deltas(old=[row], new=[db_job]), session)
+
+            session.expunge(db_job)
+
+        await session.commit()
+
+        if db_job is not None:
+            return JobMutationStatus.DONE, db_job
+
+        return self._missing_job_status((await session.execute(self._job_exists_statement(job_id))).first()), None
+
+    async def delete_job_by_id_async(self, job_id: int, user: TokenPrincipal, session: AsyncSession) -> JobMutationStatus:
+        deleted_job: Optional[Row] = (await session.execute(self._delete_job_statement(job_id, user))).first()
+
+        if deleted_job is not None:
+            await self.job_stat_dao.apply_deltas_async(job_stat_deltas(old=[deleted_job]), session)
+
+        await session.commit()
+
+        if deleted_job is not None:
+            return JobMutationStatus.DONE
+
+        return self._missing_job_status((await session.execute(self._job_exists_statement(job_id))).first())
+
 
-job_dao: JobDao = JobDao()
+job_dao: JobDao = JobDao(job_stat_dao)
@@ -0,0 +1,213 @@
+"""
+Counters of active jobs per company / location / posting date, the `jobstat` table behind /jobs/stats.
+
+Incremental | JobDao passes the deltas of every write to apply_deltas(), inside the write's own transaction, so a
+              counter never moves without its job (and a rolled back write rolls its counters back too):
+              create +1 per value of the new job, delete -1 per value of the old one, update -1 old / +1 new.
+              All of them in one upsert, INSERT ... ON CONFLICT (facet, value) DO UPDATE SET count = count + delta.
+              A write that doesn't touch a counted column (ex. a new title) costs nothing.
+Reconcile   | recounts with one grouped statement over the active jobs and fixes the counters that drifted: jobs written
+              around JobDao, a database from before this table existed. Run periodically (main.py), it is the only
+              GROUP BY over `job`.
+"""
+
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import Row, String, bindparam, case, cast, func, literal, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import delete, Delete, FromClause, Insert, select, Select
+
+from database.orm_models.job import Job
+from database.orm_models.job_stat import JobStat
+from database.replicas import read_only
+
+# facet -> the Job column it counts.
+JOB_STAT_FACETS: Dict[str, Any] = {
+    "company": Job.company,
+    "location": Job.location,
+    "date_posted": Job.date_posted,
+}
+
+JobStatKey = Tuple[str, str]  # (facet, value)
+
+
+def job_stat_values(job: Any) -> List[JobStatKey]:
+    """
+    :param job: a Job, a Row with the facet columns + is_active, or a JobCreate (no is_active, it is active).
+    :return: the counters this job is in, none if it is inactive.
+    """
+    if not getattr(job, "is_active", True):
+        return list()
+
+    keys: List[JobStatKey] = list()
+
+    for facet in JOB_STAT_FACETS:
+        value: Any = getattr(job, facet)
+
+        if value is None:
+            continue
+
+        # UpdateJob.date_posted is a datetime, the column keeps the date.
+        if isinstance(value, datetime):
+            value = value.date()
+
+        keys.append((facet, value.isoformat() if isinstance(value, date) else value))
+
+    return keys
+
+
+def job_stat_deltas(old: Iterable[Any] = (), new: Iterable[Any] = ()) -> Dict[JobStatKey, int]:
+    """
+    :param old: the jobs as they were before the write (deleted / updated), they leave their counters.
+    :param new: the jobs as they are after it (created / updated), they join theirs.
+    :return: the non-zero changes, an update that kept company, location, date and is_active has none.
+    """
+    deltas: Counter = Counter()
+
+    for job in old:
+        deltas.subtract(job_stat_values(job))
+
+    for job in new:
+        deltas.update(job_stat_values(job))
+
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def facet_counts_statement(dialect_name: str, *where: Any) -> Select:
+    """
+    (facet, value, count) of the jobs matching `where`, for every facet, in one statement. Shared by the reconciliation
+    here and the `facets=` of list-jobs (JobDao.list_jobs_validators_and_facets).
+    - postgresql | GROUP BY GROUPING SETS ((company), (location), (date_posted)), one scan of the matching jobs.
+                   grouping() tells the sets apart, the columns outside a set are NULL so coalesce() finds the value.
+    - others     | a GROUP BY per facet glued with UNION ALL, one round trip still.
+    Values as text, like the counters. Jobs without a value aren't counted.
+    """
+    if dialect_name == "postgresql":
+        columns: list = list(JOB_STAT_FACETS.values())
+        facet = case(*[(func.grouping(column) == 0, literal(name)) for name, column in JOB_STAT_FACETS.items()])
+
+        grouped: Select = select(
+            facet.label("facet"),
+            func.coalesce(*[cast(column, String) for column in columns]).label("value"),
+            func.count().label("count")
+        ).where(*where).group_by(func.grouping_sets(*columns)).subquery()
+
+        return select(grouped.c.facet, grouped.c.value, grouped.c.count).where(grouped.c.value.isnot(None))
+
+    return union_all(*[
+        select(literal(facet).label("facet"), cast(column, String).label("value"), func.count().label("count"))
+        .where(*where, column.isnot(None))
+        .group_by(column)
+        for facet, column in JOB_STAT_FACETS.items()
+    ])
+
+
+def top_per_facet_statement(counts: FromClause, limit: int) -> Select:
+    """
+    At most `limit` rows of (facet, value, count) per facet, most jobs first, grouped by facet. One window query.
+    """
+    rank = func.row_number().over(partition_by=counts.c.facet, order_by=(counts.c.count.desc(), counts.c.value)).label("rank")
+
+    ranked: FromClause = select(counts.c.facet, counts.c.value, counts.c.count, rank).subquery()
+
+    return select(ranked.c.facet, ranked.c.value, ranked.c.count).where(ranked.c.rank <= limit).order_by(ranked.c.facet, ranked.c.rank)
+
+
+class JobStatDao:
+    def apply_deltas(self, deltas: Dict[JobStatKey, int], session: Session) -> None:
+        """
+        No commit, the caller's write commits the counters with it.
+        """
+        if not deltas:
+            return
+
+        session.execute(self._upsert_statement(session.bind.dialect.name, increment=True), self._delta_rows(deltas))
+
+    def _upsert_statement(self, dialect_name: str, increment: bool) -> Insert:
+        """
+        INSERT ... ON CONFLICT (facet, value) DO UPDATE, run with one parameter set per counter (executemany).
+        :param increment: add `count` to the counter (apply_deltas), or overwrite it (reconcile).
+        """
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise NotImplementedError(f"Job stats are not supported on {dialect_name}.")
+
+        # On the Table, not the mapped class: the ORM's bulk INSERT path doesn't take ON CONFLICT with executemany.
+        statement = dialect_insert(JobStat.__table__)
+        count = JobStat.__table__.c.count + statement.excluded.count if increment else statement.excluded.count
+
+        return statement.on_conflict_do_update(index_elements=["facet", "value"], set_={"count": count})
+
+    def _delta_rows(self, deltas: Dict[JobStatKey, int]) -> List[dict]:
+        # Always the same order, so two writes touching the same counters lock them in the same order (no deadlock).
+        return [{"facet": facet, "value": value, "count": delta} for (facet, value), delta in sorted(deltas.items())]
+
+    @read_only
+    def list_job_stats(self, limit: int, session: Session) -> List[Row]:
+        """
+        (facet, value, count), at most `limit` per facet, most jobs first. One query, however many facets.
+        """
+        return list(session.execute(self._list_job_stats_statement(limit)).all())
+
+    def _list_job_stats_statement(self, limit: int) -> Select:
+        return top_per_facet_statement(select(JobStat.facet, JobStat.value, JobStat.count).where(JobStat.count > 0).subquery(), limit)
+
+    def reconcile(self, session: Session) -> int:
+        """
+        Recounts every counter from the jobs, writes the ones that are wrong and removes the ones at 0.
+        :return: how many counters had drifted.
+
+        Postgres | the table is locked against writes (reads go on) first. A job write then either committed before,
+                   and the recount sees it, or waits for us and applies its delta on top of the recount. Nothing is
+                   counted twice or lost.
+        SQLite   | writes are serialized by the database already.
+        """
+        dialect_name: str = session.bind.dialect.name
+
+        if dialect_name == "postgresql":
+            session.execute(text("LOCK TABLE jobstat IN EXCLUSIVE MODE"))
+
+        counted: Dict[JobStatKey, int] = {(row.facet, row.value): row.count for row in session.execute(select(JobStat.facet, JobStat.value, JobStat.count))}
+        actual: Dict[JobStatKey, int] = {
+            (row.facet, row.value): row.count for row in session.execute(facet_counts_statement(dialect_name, Job.is_active == True))
+        }
+
+        drifted: List[JobStatKey] = [key for key, count in actual.items() if counted.get(key) != count]
+        stale: List[JobStatKey] = [key for key in counted if key not in actual]
+
+        if drifted:
+            session.execute(self._upsert_statement(dialect_name, increment=False), self._delta_rows({key: actual[key] for key in drifted}))
+
+        if stale:
+            session.execute(self._delete_job_stat_statement(), [{"stat_facet": facet, "stat_value": value} for facet, value in stale])
+
+        session.commit()
+
+        return len(drifted) + sum(1 for key in stale if counted[key] != 0)
+
+    def _delete_job_stat_statement(self) -> Delete:
+        return delete(JobStat.__table__).where(
+            JobStat.__table__.c.facet == bindparam("stat_facet"),
+            JobStat.__table__.c.value == bindparam("stat_value")
+        )
+
+    # ------- Async twins, what the job write paths and /jobs/stats need in async mode ------- #
+
+    async def apply_deltas_async(self, deltas: Dict[JobStatKey, int], session: AsyncSession) -> None:
+        if not deltas:
+            return
+
+        await session.execute(self._upsert_statement(session.bind.dialect.name, increment=True), self._delta_rows(deltas))
+
+    @read_only
+    async def list_job_stats_async(self, limit: int, session: AsyncSession) -> List[Row]:
+        return list((await session.execute(self._list_job_stats_statement(limit))).all())
+
+
+job_stat_dao: JobStatDao = JobStatDao()
@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, Row, bindparam, func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import delete, Delete, insert, Insert, select, Select
+
+from api_models.saved_search import SavedSearchCreate
+from database.orm_models.job import Job
+from database.orm_models.saved_search import SavedSearch, SavedSearchMatch
+from database.replicas import read_only
+
+
+class SavedSearchDao:
+    def create_saved_search(self, saved_search: SavedSearchCreate, owner_id: int, session: Session) -> SavedSearch:
+        db_saved_search: SavedSearch = SavedSearch(**saved_search.model_dump(), owner_id=owner_id)
+
+        session.add(db_saved_search)
+        session.commit()
+        session.refresh(db_saved_search)
+
+        return db_saved_search
+
+    def count_saved_searches(self, owner_id: int, session: Session) -> int:
+        return session.scalar(select(func.count()).select_from(SavedSearch).where(SavedSearch.owner_id == owner_id))
+
+    @read_only
+    def list_saved_searches(self, owner_id: int, session: Session) -> list[SavedSearch]:
+        return list(session.scalars(select(SavedSearch).where(SavedSearch.owner_id == owner_id).order_by(SavedSearch.id)).all())
+
+    def delete_saved_search(self, saved_search_id: int, owner_id: int, session: Session) -> bool:
+        """
+        Deletes the saved search and its matches, if the user owns it. False if there was nothing to delete.
+        The matches are deleted explicitly too, SQLite doesn't enforce the ON DELETE CASCADE unless told to.
+        """
+        deleted_id: Optional[int] = session.scalar(self._delete_saved_search_statement(saved_search_id, owner_id))
+
+        if deleted_id is not None:
+            session.execute(delete(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == deleted_id))
+
+        session.commit()
+
+        return deleted_id is not None
+
+    def _delete_saved_search_statement(self, saved_search_id: int, owner_id: int) -> Delete:
+        return delete(SavedSearch).where(SavedSearch.id == saved_search_id, SavedSearch.owner_id == owner_id).returning(SavedSearch.id)
+
+    def saved_searches_after(self, after_id: int, limit: int, session: Session) -> list[Row]:
+        """
+        (id, owner_id, keywords, location, company) of the saved searches with an id above `after_id`, in id order.
+        Keyset batches over the primary key, how the matching index loads / catches up (services/saved_search_service.py).
+        """
+        return list(session.execute(self._saved_searches_after_statement(after_id, limit)).all())
+
+    def _saved_searches_after_statement(self, after_id: int, limit: int) -> Select:
+        return select(
+            SavedSearch.id, SavedSearch.owner_id, SavedSearch.keywords, SavedSearch.location, SavedSearch.company
+        ).where(SavedSearch.id > after_id).order_by(SavedSearch.id).limit(limit)
+
+    def first_saved_search_id_since(self, since: datetime, session: Session) -> Optional[int]:
+        """
+        The lowest id of the saved searches created since `since` (ix_savedsearch_created_at), None if there are none.
+        """
+        return session.scalar(select(func.min(SavedSearch.id)).where(SavedSearch.created_at >= since))
+
+    def record_matches(self, matches: list[tuple[int, int]], session: Session) -> None:
+        """
+        :param matches: (saved_search_id, job_id) pairs.
+        """
+        if not matches:
+            return
+
+        session.execute(self._record_matches_statement(), self._record_matches_rows(matches))
+        session.commit()
+
+    def _record_matches_statement(self) -> Insert:
+        # INSERT ... SELECT, run once per pair (executemany): the owner comes from the saved search, and a saved search
+        # deleted in the meantime (ex. through another worker) selects nothing, instead of failing the foreign key.
+        # On the Table, not the mapped class: the ORM's bulk INSERT path doesn't take INSERT ... SELECT.
+        return insert(SavedSearchMatch.__table__).from_select(
+            ["saved_search_id", "owner_id", "job_id", "matched_at"],
+            select(SavedSearch.id, SavedSearch.owner_id, bindparam("job_id", type_=Integer), bindparam("matched_at", type_=DateTime))
+            .where(SavedSearch.id == bindparam("saved_search_id", type_=Integer))
+        )
+
+    def _record_matches_rows(self, matches: list[tuple[int, int]]) -> list[dict]:
+        now: datetime = datetime.utcnow()
+        return [{"saved_search_id": saved_search_id, "job_id": job_id, "matched_at": now} for saved_search_id, job_id in matches]
+
+    @read_only
+    def list_matches(self, owner_id: int, limit: int, before: Optional[int], session: Session) -> list[Row]:
+        """
+        Newest matches first, with the job's headline columns. Keyset on the match id (ix_savedsearchmatch_owner_id_id).
+        :param before: the id of the last match of the previous page.
+        """
+        return list(session.execute(self._list_matches_statement(owner_id, limit, before)).all())
+
+    def _list_matches_statement(self, owner_id: int, limit: int, before: Optional[int]) -> Select:
+        # inner joins | a match of a deleted job or saved search (SQLite leaves them behind) isn't listed.
+        statement: Select = select(
+            SavedSearchMatch.id,
+            SavedSearchMatch.saved_search_id,
+            SavedSearchMatch.matched_at,
+            Job.id.label("job_id"),
+            Job.title,
+            Job.company,
+            Job.location,
+            Job.date_posted,
+        ).join(Job, Job.id == SavedSearchMatch.job_id).join(SavedSearch, SavedSearch.id == SavedSearchMatch.saved_search_id)
+
+        statement = statement.where(SavedSearchMatch.owner_id == owner_id)
+
+        if before is not None:
+            statement = statement.where(SavedSearchMatch.id < before)
+
+        return statement.order_by(SavedSearchMatch.id.desc()).limit(limit)
+
+
+saved_search_dao: SavedSearchDao = SavedSearchDao()
@@ -1,10 +1,13 @@
 from typing import Optional
 
-from sqlalchemy import or_
+from sqlalchemy import func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import update, Update, select, Select
 
 from api_models.user import UserCreate
 from database.orm_models.user import User
+from database.replicas import read_only
 
 
 class UserDao:
@@ -16,8 +19,9 @@ class UserDao:
         # Like: id, metadata, registry, etc.!
 
         db_user: User = User(
-            username=user_create.username,
-            email=user_create.email,
+            # lower case, logins are case-insensitive (see the lower() indexes on User)
+            username=user_create.username.lower(),
+            email=user_create.email.lower(),
             hashed_password=bcrypt_hashed_password,
 
             # We can't unpack user as shown below
@@ -45,13 +49,83 @@ class UserDao:
 
         return db_user
 
+    @read_only
     def get_user_by_email_or_username(self, username_or_email: Optional[str], session: Session) -> Optional[User]:
-        user: Optional[User] = session.query(User).filter(
+        user: Optional[User] = session.scalars(self._user_by_email_or_username_statement(username_or_email)).first()
+        return user
+
+    def _user_by_email_or_username_statement(self, username_or_email: Optional[str]) -> Select:
+        # Case-insensitive, "Flexer" and "flexer" are the same login. Matches the (unique) lower() indexes on User.
+        # Unique per column, but one user's username can be another one's email: the oldest account wins, always.
+        return select(User).where(
             or_(
-                User.username == username_or_email,
-                User.email == username_or_email
+                func.lower(User.username) == func.lower(username_or_email),
+                func.lower(User.email) == func.lower(username_or_email)
             )
-        ).first()
+        ).order_by(User.id).limit(1)
+
+    def get_user_by_id(self, user_id: int, session: Session) -> Optional[User]:
+        # primary key lookup, cheaper than the username OR email query above.
+        return session.get(User, user_id)
+
+    # Both updates below bump token_version, which revokes every token minted before.
+    def deactivate_user(self, user_id: int, session: Session) -> Optional[User]:
+        user: Optional[User] = session.execute(self._deactivate_user_statement(user_id)).scalar()
+        session.commit()
+
+        return user
+
+    def update_password(self, user_id: int, bcrypt_hashed_password: str, session: Session) -> Optional[User]:
+        user: Optional[User] = session.execute(self._update_password_statement(user_id, bcrypt_hashed_password)).scalar()
+        session.commit()
+
+        return user
+
+    def _deactivate_user_statement(self, user_id: int) -> Update:
+        return update(User).where(User.id == user_id).values(
+            is_active=False,
+            token_version=User.token_version + 1
+        ).returning(User)
+
+    def _update_password_statement(self, user_id: int, bcrypt_hashed_password: str) -> Update:
+        return update(User).where(User.id == user_id).values(
+            hashed_password=bcrypt_hashed_password,
+            token_version=User.token_version + 1
+        ).returning(User)
+
+    # ------- Async twins, same queries on an AsyncSession ------- #
+
+    async def create_new_user_async(self, user_create: UserCreate, bcrypt_hashed_password: str, db_session: AsyncSession) -> User:
+        db_user: User = User(
+            username=user_create.username.lower(),
+            email=user_create.email.lower(),
+            hashed_password=bcrypt_hashed_password,
+        )
+
+        db_session.add(db_user)
+        await db_session.commit()
+        await db_session.refresh(db_user)
+
+        return db_user
+
+    @read_only
+    async def get_user_by_email_or_username_async(self, username_or_email: Optional[str], session: AsyncSession) -> Optional[User]:
+        user: Optional[User] = (await session.scalars(self._user_by_email_or_username_statement(username_or_email))).first()
+        return user
+
+    async def get_user_by_id_async(self, user_id: int, session: AsyncSession) -> Optional[User]:
+        return await session.get(User, user_id)
+
+    async def deactivate_user_async(self, user_id: int, session: AsyncSession) -> Optional[User]:
+        user: Optional[User] = (await session.execute(self._deactivate_user_statement(user_id))).scalar()
+        await session.commit()
+
+        return user
+
+    async def update_password_async(self, user_id: int, bcrypt_hashed_password: str, session: AsyncSession) -> Optional[User]:
+        user: Optional[User] = (await session.execute(self._update_password_statement(user_id, bcrypt_hashed_password))).scalar()
+        await session.commit()
+
         return user
 
 
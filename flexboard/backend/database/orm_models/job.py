@@ -23,8 +23,10 @@ What is indexing in postgresql?
 - An index in a database is very similar to an index in the back of a book.
 
 """
-from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey
-from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, DDL, Index, event, func
+from sqlalchemy.orm import query_expression, relationship
 
 from database.base import Base
 
@@ -36,20 +38,34 @@ from database.base import Base
 # @as_declarative will also bring in more attributes behind the scenes
 # Not PLURAL, just Job class.
 class Job(Base):
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # no index=True, the primary key already comes with its own index.
+    id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String)
     company = Column(String)
     company_url = Column(String)
     location = Column(String)
     description = Column(String)
-    date_posted = Column(Date)
+    # NOT NULL | list-jobs pages by (date_posted, id), a NULL would compare as unknown and end the pages early.
+    # A job inserted without one (outside JobCreate) is posted today.
+    date_posted = Column(Date, nullable=False, server_default=func.current_date())
 
     # control the showing of job post, if active or not
     # to make sure the Job Posting has _some_ verification
     is_active = Column(Boolean, nullable=False, default=True)
 
+    # Conditional GETs (ETag / Last-Modified, see services/conditional_request_service.py)
+    # version    | starts at 1, every UPDATE in JobDao bumps it. The ETag is built from it.
+    # updated_at | UTC time of the last write, sent as Last-Modified.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Not a column. The first characters of `description`, cut by the database, only filled in when a list query asks
+    # for it (`fields=description_snippet`, see JobDao._with_fields), so lists never read the full text.
+    description_snippet = query_expression()
+
     # foreign key to User table
-    owner_id = Column(Integer, ForeignKey('user.id'))
+    # index=True | ownership checks (update / delete) and `User.jobs` look jobs up by owner
+    owner_id = Column(Integer, ForeignKey('user.id'), index=True)
 
     # "jobs" can be any name
     # "owner" variable will be a User object
@@ -58,3 +74,83 @@ class Job(Base):
     # like: user1.jobs
     # go to users.py | 'jobs' correlates to jobs variable | will show user who posted this job
     owner = relationship('User', back_populates='jobs')
+
+
+# Partial index for list-jobs: only active jobs, in (date_posted, id) order.
+# The keyset pagination in JobDao.list_jobs reads it in order and stops after `limit` rows, no sort, no table scan.
+# Inactive jobs are not in it at all, so it stays small.
+# version / updated_at / is_active ride along at the end (they don't change the order), so the list-jobs ETag query
+# is answered from the index alone (SQLite only counts an index as covering if the WHERE columns are in it too).
+Index(
+    "ix_job_active_date_posted_id",
+    Job.date_posted,
+    Job.id,
+    Job.version,
+    Job.updated_at,
+    Job.is_active,
+    postgresql_where=Job.is_active == True,
+    sqlite_where=Job.is_active == True,
+)
+
+# Covering index for the get-job ETag query (id -> version, updated_at), no need to read the row itself.
+Index("ix_job_id_version", Job.id, Job.version, Job.updated_at)
+
+# Filtered list-jobs (`company=` / `location=` / `owner_id=`, see JobDao._job_filter_clauses): equality on the filter
+# column and is_active first, then the keyset order. A filtered page is still one range of one index, read in order,
+# stopped after `limit` rows, and its ETag query still never reads the table. Other filters are checked on the way.
+# A filter on several of these columns uses one of the indexes and checks the others.
+for job_filter_column in (Job.company, Job.location, Job.owner_id):
+    Index(
+        f"ix_job_{job_filter_column.key}_active_date_posted_id",
+        job_filter_column,
+        Job.is_active,
+        Job.date_posted,
+        Job.id,
+        Job.version,
+        Job.updated_at,
+    )
+
+
+# ------- Full-text search (used by JobDao.search_jobs) ------- #
+# Created with raw DDL right after the `job` table, because each database does it differently
+# and the ORM model above has to work on both.
+
+# Postgres | a generated tsvector column, kept up to date by Postgres itself, plus a GIN index on it.
+# Weights: title (A) > company (B) > location (C) > description (D), so a match in the title ranks higher.
+JOB_SEARCH_VECTOR_POSTGRES: str = """
+ALTER TABLE job ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(company, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(location, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'D')
+) STORED
+"""
+
+event.listen(Job.__table__, "after_create", DDL(JOB_SEARCH_VECTOR_POSTGRES).execute_if(dialect="postgresql"))
+event.listen(
+    Job.__table__,
+    "after_create",
+    DDL("CREATE INDEX IF NOT EXISTS ix_job_search_vector ON job USING GIN (search_vector)").execute_if(dialect="postgresql")
+)
+
+# SQLite (local / tests) | an FTS5 index over the same 4 columns, kept in sync with triggers.
+# content='job' means FTS5 reads the text from `job` itself, it only stores the index.
+JOB_SEARCH_SQLITE: list = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5(title, company, description, location, content='job', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS job_fts_after_insert AFTER INSERT ON job BEGIN
+        INSERT INTO job_fts(rowid, title, company, description, location) VALUES (new.id, new.title, new.company, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_fts_after_delete AFTER DELETE ON job BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company, description, location) VALUES ('delete', old.id, old.title, old.company, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_fts_after_update AFTER UPDATE ON job BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company, description, location) VALUES ('delete', old.id, old.title, old.company, old.description, old.location);
+        INSERT INTO job_fts(rowid, title, company, description, location) VALUES (new.id, new.title, new.company, new.description, new.location);
+    END""",
+]
+
+for job_search_sqlite_statement in JOB_SEARCH_SQLITE:
+    event.listen(Job.__table__, "after_create", DDL(job_search_sqlite_statement).execute_if(dialect="sqlite"))
+
+# the triggers go away with the `job` table, the FTS5 table has to be dropped by hand.
+event.listen(Job.__table__, "before_drop", DDL("DROP TABLE IF EXISTS job_fts").execute_if(dialect="sqlite"))
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+
+from database.base import Base
+
+
+# Counters behind /jobs/stats: how many ACTIVE jobs have this company / location / posting date.
+# JobDao keeps them up to date in the same transaction as every job write (see database/daos/job_stat_dao.py),
+# so the endpoint reads a few hundred small rows instead of GROUP BY-ing the whole `job` table.
+# facet | "company", "location" or "date_posted".
+# value | the column's value, dates as YYYY-MM-DD. Jobs without a value aren't counted.
+# count | may drop to 0, such rows are skipped when read and removed by the next reconciliation.
+class JobStat(Base):
+    facet = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
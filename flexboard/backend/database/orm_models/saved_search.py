@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+
+from database.base import Base
+
+
+# A saved query, "tell me when a job like this is posted". See services/saved_search_service.py.
+# Every term must match: each keyword anywhere in the job, location words in the job's location, company words in its company.
+class SavedSearch(Base):
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # index=True | "my saved searches" and the per user limit look them up by owner
+    owner_id = Column(Integer, ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    keywords = Column(String)
+    location = Column(String)
+    company = Column(String)
+
+    # index=True | the matcher's catch-up reads the recently created ones again (SavedSearchDao.first_saved_search_id_since)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+# One row per (saved search, new job) that matched, written when the job is created. Users fetch them instead of polling.
+# owner_id is copied from the saved search so "my matches" is one index range, no join to saved_search.
+class SavedSearchMatch(Base):
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    saved_search_id = Column(Integer, ForeignKey('savedsearch.id', ondelete='CASCADE'), nullable=False, index=True)
+    job_id = Column(Integer, ForeignKey('job.id', ondelete='CASCADE'), nullable=False)
+    owner_id = Column(Integer, nullable=False)
+    matched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# Newest matches of a user first, keyset paginated on id (see SavedSearchDao.list_matches).
+Index("ix_savedsearchmatch_owner_id_id", SavedSearchMatch.owner_id, SavedSearchMatch.id)
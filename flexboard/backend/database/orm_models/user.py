@@ -1,12 +1,12 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, Index, func
 from sqlalchemy.orm import relationship
 
 from database.base import Base
 
 
 class User(Base):
-    # index is used for fast search
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # no index=True, the primary key already comes with its own index.
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     username = Column(String, unique=True, nullable=False)
 
@@ -22,6 +22,19 @@ class User(Base):
     # this will be able to control everything | an Admin
     is_superuser = Column(Boolean, default=False)
 
+    # bumped whenever the user changes password or is deactivated | tokens carry it in the 'ver' claim
+    # a token with an older 'ver' is no longer accepted by the DB-backed auth path
+    token_version = Column(Integer, default=0, nullable=False)
+
     # go to jobs.py | 'owner' correlates to owner variable | will show jobs this person has posted
     jobs = relationship('Job', back_populates='owner')
     # is relationship going to be a column? No, column() is not used.
+
+
+# Login looks users up by lower(username) OR lower(email), see UserDao.get_user_by_email_or_username.
+# An index on the plain column can't serve lower(column), so we index the expression itself.
+# Postgres can combine both (BitmapOr) instead of scanning the table.
+# unique | "Bob" and "bob" are the same login, so they can't be two users (the plain unique constraints above are
+#          case-sensitive). UserDao.create_new_user stores both in lower case too.
+Index("ix_user_username_lower", func.lower(User.username), unique=True)
+Index("ix_user_email_lower", func.lower(User.email), unique=True)
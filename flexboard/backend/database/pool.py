@@ -0,0 +1,130 @@
+"""
+Connection pool settings + metrics.
+
+What is a connection pool?
+- Opening a Postgres connection is slow (TCP + auth), so SQLAlchemy keeps a few open and lends them to sessions.
+- pool_size       | connections kept open all the time.
+- max_overflow    | extra connections allowed during a burst, closed again when returned.
+- pool_timeout    | seconds a request waits for a free connection before `sqlalchemy.exc.TimeoutError`.
+- pool_recycle    | seconds after which a connection is replaced, so we never use one the server / a proxy already dropped.
+- pool_pre_ping   | runs a tiny "SELECT 1" on checkout, a dead connection is replaced instead of failing the request.
+
+Metrics:
+- The pools below time every checkout, how long a request waited for a connection, and count checkout timeouts.
+- In-use / idle / overflow counts are read live from the pool.
+- All of it is served by `/monitoring/db-pool`.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from config import config_object
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[Pool] = None
+
+        self.checkouts: int = 0
+        self.checkout_timeouts: int = 0
+        self.checkout_wait_seconds_total: float = 0.0
+        self.checkout_wait_seconds_max: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_seconds_total += wait_seconds
+            self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, wait_seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def snapshot(self) -> dict:
+        pool: Optional[Pool] = self.pool
+        snapshot: dict = {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait_seconds_total": self.checkout_wait_seconds_total,
+            "checkout_wait_seconds_max": self.checkout_wait_seconds_max,
+            "checkout_wait_seconds_avg": self.checkout_wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+        }
+
+        if isinstance(pool, QueuePool):
+            snapshot.update({
+                "size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+
+        return snapshot
+
+
+class PoolMetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, PoolMetrics] = dict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, name: str) -> PoolMetrics:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = PoolMetrics(name)
+            return self._metrics[name]
+
+    def snapshot(self) -> dict:
+        return {name: metrics.snapshot() for name, metrics in list(self._metrics.items())}
+
+
+pool_metrics_registry: PoolMetricsRegistry = PoolMetricsRegistry()
+
+
+class InstrumentedPoolMixin:
+    """
+    Times `connect()`, the call every session goes through to borrow a connection.
+    Metrics are keyed by the pool's logging name (`pool_logging_name=` in create_engine), which survives `dispose()`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics: PoolMetrics = pool_metrics_registry.get(self._orig_logging_name or "default")
+        self.metrics.pool = self
+
+    def connect(self):
+        start: float = time.perf_counter()
+
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_pool_options() -> dict:
+    """
+    Pool keyword arguments for create_engine() / create_async_engine(), from config.
+    """
+    return {
+        "pool_size": config_object.DB_POOL_SIZE,
+        "max_overflow": config_object.DB_MAX_OVERFLOW,
+        "pool_timeout": config_object.DB_POOL_TIMEOUT,
+        "pool_recycle": config_object.DB_POOL_RECYCLE,
+        "pool_pre_ping": config_object.DB_POOL_PRE_PING,
+    }
@@ -0,0 +1,134 @@
+"""
+Per-request database statistics: how many statements ran and how long they took.
+
+How it works:
+- A middleware calls `start_query_stats()` when a request comes in, that puts a fresh QueryStats into a ContextVar.
+- `install_query_timing(engine)` hooks the engine's before / after cursor execute events, every statement adds
+  its time to the QueryStats of the request that ran it.
+- Sync routes run on the threadpool, but Starlette copies the context into the thread, so they see the same QueryStats.
+
+Outside of a request (no QueryStats set) the event handlers return right away.
+
+Profiling (`profile=True`, used by middleware/sql_profiler_middleware.py and `count_queries()` in tests) also keeps
+- the slowest statements, and
+- how often each statement ran. The SQL text has placeholders instead of values, so the same text running again and
+  again in one request (ex. "SELECT ... FROM user WHERE user.id = ?" once per job) is the classic N+1 pattern.
+"""
+
+import heapq
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+
+
+class QueryStats:
+    def __init__(self, profile: bool = False, slowest_limit: int = 5):
+        self.count: int = 0
+        self.seconds: float = 0.0
+
+        self.profile = profile
+        self.slowest_limit = slowest_limit
+        self.statement_counts: Dict[str, int] = dict()
+        self._slowest: List[Tuple[float, int, str]] = list()  # min-heap of (seconds, order, statement)
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+
+        if not self.profile:
+            return
+
+        self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+
+        if len(self._slowest) < self.slowest_limit:
+            heapq.heappush(self._slowest, (seconds, self.count, statement))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, self.count, statement))
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        """
+        (seconds, statement) of the slowest statements, slowest first.
+        """
+        return [(seconds, statement) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+    def repeated_statements(self, threshold: int) -> Dict[str, int]:
+        """
+        Statements that ran at least `threshold` times, likely an N+1 (a query per row of an earlier query).
+        """
+        return {statement: count for statement, count in self.statement_counts.items() if count >= threshold}
+
+
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def start_query_stats(profile: bool = False, slowest_limit: int = 5) -> Tuple[QueryStats, Optional[Token]]:
+    """
+    Starts counting for the current request. Pass the token to `stop_query_stats()` when the request is done.
+
+    If a QueryStats is already running (ex. the metrics and the profiler middleware are both installed), that one is
+    shared instead of starting a second one that would hide the statements from the first.
+    """
+    query_stats: Optional[QueryStats] = _current_query_stats.get()
+
+    if query_stats is not None:
+        if profile and not query_stats.profile:
+            query_stats.profile = True
+            query_stats.slowest_limit = slowest_limit
+        return query_stats, None
+
+    query_stats = QueryStats(profile=profile, slowest_limit=slowest_limit)
+    return query_stats, _current_query_stats.set(query_stats)
+
+
+def stop_query_stats(token: Optional[Token]):
+    if token is not None:
+        _current_query_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_query_stats.get()
+
+
+def _before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    if _current_query_stats.get() is not None:
+        connection.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    query_stats: Optional[QueryStats] = _current_query_stats.get()
+    start_times: Optional[list] = connection.info.get("query_start_times")
+
+    if query_stats is not None and start_times:
+        query_stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Profiles the statements run inside the block, for tests of DAO / ORM code:
+
+        with count_queries() as query_stats:
+            jobs = job_dao.list_jobs(session, limit=50)
+        assert query_stats.count == 1
+
+    Only code running in this thread / context is counted. TestClient runs the app in its own thread,
+    for routes use the query budgets of middleware/sql_profiler_middleware.py instead.
+    """
+    query_stats, token = start_query_stats(profile=True)
+
+    try:
+        yield query_stats
+    finally:
+        stop_query_stats(token)
+
+
+def install_query_timing(engine: Engine):
+    """
+    :param engine: a sync Engine, for an AsyncEngine pass `async_engine.sync_engine`.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
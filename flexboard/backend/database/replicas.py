@@ -0,0 +1,214 @@
+"""
+Read replica routing (config: DATABASE_REPLICA_URLS).
+
+Writes always go to the primary. DAO methods marked with `@read_only` (get-job, list-jobs, the login lookup, ...) may
+read from a replica instead, which takes the read-heavy traffic off the primary.
+
+How a statement picks its engine (`RoutingSession.get_bind`, SQLAlchemy asks it for every statement / flush):
+- primary | not inside a `@read_only` method, or
+          | the session already wrote (flush / INSERT / UPDATE / DELETE), it must see its own writes, or
+          | the client wrote a moment ago (read-your-writes, see below).
+- replica | otherwise. One replica per session, picked by the balancer on first use, so every read of a request
+            (ex. the ETag and then the body of get-job) sees the same snapshot.
+
+Balancers:
+- round_robin       | replicas take turns.
+- least_connections | the replica whose pool has the fewest connections checked out right now.
+
+Read-your-writes:
+A replica lags the primary a little, a client that just created a job and reloads the list must still see it.
+middleware/read_your_writes_middleware.py puts a `ReadYourWrites` into a ContextVar for every request:
+- `stick_to_primary` is True when the client wrote within the last READ_YOUR_WRITES_SECONDS. Two ways to remember it:
+  - a cookie, works across workers, for browsers.
+  - the user id, in process: API clients with a bearer token send no cookies. get_current_principal_from_token calls
+    identify_read_your_writes() once it knows the user, before the route reads anything.
+- the session sets `wrote` when it writes, and the middleware then (re)sets the cookie and the user's window.
+Like query_stats.py, Starlette copies the context into the threadpool, so sync routes see the same ReadYourWrites.
+"""
+
+import functools
+import inspect
+import itertools
+import threading
+from contextvars import ContextVar, Token
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy import Delete, Engine, Insert, Update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+# ------- Balancers ------- #
+
+class ReplicaBalancer:
+    def choose(self, replicas: Sequence[Engine]) -> Engine:
+        raise NotImplementedError
+
+
+class RoundRobinBalancer(ReplicaBalancer):
+    def __init__(self):
+        self._counter: itertools.count = itertools.count()
+        self._lock: threading.Lock = threading.Lock()
+
+    def choose(self, replicas: Sequence[Engine]) -> Engine:
+        with self._lock:
+            index: int = next(self._counter)
+        return replicas[index % len(replicas)]
+
+
+class LeastConnectionsBalancer(ReplicaBalancer):
+    def choose(self, replicas: Sequence[Engine]) -> Engine:
+        # checkedout() is a plain read of the pool's counters, no lock needed for a "good enough" pick.
+        return min(replicas, key=lambda replica: replica.pool.checkedout())
+
+
+BALANCERS: dict = {
+    "round_robin": RoundRobinBalancer,
+    "least_connections": LeastConnectionsBalancer,
+}
+
+
+def create_balancer(name: str) -> ReplicaBalancer:
+    if name not in BALANCERS:
+        raise ValueError(f"Unknown replica balancing '{name}', expected one of: {', '.join(BALANCERS)}.")
+    return BALANCERS[name]()
+
+
+# ------- Read-your-writes (per request) ------- #
+
+class ReadYourWrites:
+    def __init__(self, stick_to_primary: bool = False, user_wrote_recently: Optional[Callable[[int], bool]] = None):
+        """
+        :param user_wrote_recently: user id -> whether that user is in their read-your-writes window.
+        """
+        self.stick_to_primary = stick_to_primary
+        self.wrote: bool = False
+        self.user_id: Optional[int] = None
+        self.user_wrote_recently = user_wrote_recently
+
+    def identify(self, user_id: int):
+        self.user_id = user_id
+
+        if not self.stick_to_primary and self.user_wrote_recently is not None:
+            self.stick_to_primary = self.user_wrote_recently(user_id)
+
+
+_current_read_your_writes: ContextVar[Optional[ReadYourWrites]] = ContextVar("current_read_your_writes", default=None)
+
+
+def start_read_your_writes(
+    stick_to_primary: bool,
+    user_wrote_recently: Optional[Callable[[int], bool]] = None
+) -> tuple[ReadYourWrites, Token]:
+    read_your_writes: ReadYourWrites = ReadYourWrites(stick_to_primary, user_wrote_recently)
+    return read_your_writes, _current_read_your_writes.set(read_your_writes)
+
+
+def stop_read_your_writes(token: Token):
+    _current_read_your_writes.reset(token)
+
+
+def current_read_your_writes() -> Optional[ReadYourWrites]:
+    return _current_read_your_writes.get()
+
+
+def identify_read_your_writes(user_id: int):
+    """
+    The request is from this user. A no-op without the middleware (no replicas).
+    """
+    read_your_writes: Optional[ReadYourWrites] = current_read_your_writes()
+
+    if read_your_writes is not None:
+        read_your_writes.identify(user_id)
+
+
+# ------- Session ------- #
+
+class RoutingSession(Session):
+    """
+    A Session with a primary (`bind=`) and replicas. Also used as the `sync_session_class` of AsyncSession, then the
+    engines are the `.sync_engine` of the async ones.
+    """
+
+    def __init__(self, *args, replicas: Sequence[Engine] = (), balancer: Optional[ReplicaBalancer] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas: Sequence[Engine] = replicas
+        self.balancer: ReplicaBalancer = balancer or RoundRobinBalancer()
+
+        self.read_only_depth: int = 0
+        self.wrote: bool = False
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._mark_write()
+        elif self._can_use_replica():
+            if self._replica is None:
+                self._replica = self.balancer.choose(self.replicas)
+            return self._replica
+
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def _can_use_replica(self) -> bool:
+        if not self.replicas or self.read_only_depth == 0 or self.wrote:
+            return False
+
+        read_your_writes: Optional[ReadYourWrites] = current_read_your_writes()
+        return read_your_writes is None or not read_your_writes.stick_to_primary
+
+    def _mark_write(self):
+        self.wrote = True
+        read_your_writes: Optional[ReadYourWrites] = current_read_your_writes()
+
+        if read_your_writes is not None:
+            read_your_writes.wrote = True
+
+
+def _routing_session(session) -> Optional[RoutingSession]:
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    return session if isinstance(session, RoutingSession) else None
+
+
+def _find_session(args: tuple, kwargs: dict):
+    if "session" in kwargs:
+        return kwargs["session"]
+    return next((argument for argument in args if isinstance(argument, (Session, AsyncSession))), None)
+
+
+def read_only(method: Callable) -> Callable:
+    """
+    Marks a DAO method (sync or async) as safe to answer from a replica. It must only read, and find its session in
+    a `session` argument. With a plain Session (no replicas configured, tests) it just calls the method.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            session: Optional[RoutingSession] = _routing_session(_find_session(args, kwargs))
+
+            if session is None:
+                return await method(*args, **kwargs)
+
+            session.read_only_depth += 1
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                session.read_only_depth -= 1
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        session: Optional[RoutingSession] = _routing_session(_find_session(args, kwargs))
+
+        if session is None:
+            return method(*args, **kwargs)
+
+        session.read_only_depth += 1
+        try:
+            return method(*args, **kwargs)
+        finally:
+            session.read_only_depth -= 1
+
+    return wrapper
+
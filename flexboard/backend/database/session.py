@@ -1,15 +1,74 @@
-from typing import Optional
+import threading
+from typing import List, Optional
 
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from config import config_object
+from database.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, engine_pool_options
+from database.query_stats import install_query_timing
+from database.replicas import RoutingSession, create_balancer
 
-# Creating the factory for sessions
-engine: Engine = create_engine(config_object.POSTGRES_DATABASE_URL)
+# Both engines are created on first use (a request, or the warm-up in main.py's lifespan), NOT at import:
+# importing the app (tests, tools, `uvicorn --workers`) never connects to the database.
+engine: Optional[Engine] = None
+session: Optional[sessionmaker] = None
 
-# Creating the local session
-session: sessionmaker = sessionmaker(bind=engine, autoflush=False)
+# Read replicas (config: DATABASE_REPLICA_URLS), see database/replicas.py. Empty when there are none.
+replica_engines: List[Engine] = list()
+
+# First use can come from several threads at once (threadpool routes, the lifespan), one of them creates the engines.
+# Double-checked: the sessionmaker is published last, once it is set everything else is too.
+_engine_lock: threading.Lock = threading.Lock()
+
+
+def _create_engine(url: str, name: str) -> Engine:
+    # Pool size / overflow / timeout / recycle / pre-ping come from config, see database/pool.py
+    created: Engine = create_engine(url, poolclass=InstrumentedQueuePool, pool_logging_name=name, **engine_pool_options())
+
+    # Per-request statement count + DB time, see database/query_stats.py
+    install_query_timing(created)
+    return created
+
+
+def get_engine() -> Engine:
+    if session is None:
+        _create_engines()
+
+    return engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    if session is None:
+        _create_engines()
+
+    return session
+
+
+def _create_engines():
+    global engine, session, replica_engines
+
+    with _engine_lock:
+        if session is not None:
+            return
+
+        engine = _create_engine(config_object.POSTGRES_DATABASE_URL, "primary")
+        replica_engines = [
+            _create_engine(url, f"replica_{index}") for index, url in enumerate(config_object.DATABASE_REPLICA_URLS)
+        ]
+
+        # Creating the local session, it routes read-only DAO methods to the replicas when there are some.
+        if replica_engines:
+            session = sessionmaker(
+                bind=engine,
+                autoflush=False,
+                class_=RoutingSession,
+                replicas=replica_engines,
+                balancer=create_balancer(config_object.DATABASE_REPLICA_BALANCING)
+            )
+        else:
+            session = sessionmaker(bind=engine, autoflush=False)
 
 
 # Why use yield in get_database() function?
@@ -35,7 +94,7 @@ session: sessionmaker = sessionmaker(bind=engine, autoflush=False)
 def get_database():
     database: Optional[Session] = None
     try:
-        database: Optional[Session] = session()
+        database: Optional[Session] = get_sessionmaker()()
         # `yield` returns a generator object. Depends() handles parsing out the Session object from the generator.
         # https://stackoverflow.com/questions/64763770/why-we-use-yield-to-get-sessionlocal-in-fastapi-with-sqlalchemy
         yield database
@@ -47,3 +106,116 @@ def get_database():
             print("Database could not be found.")
 
 
+# ------- Async (config: DATABASE_ASYNC_MODE) ------- #
+# Created on first use, so the sync-only setup never needs asyncpg / aiosqlite installed.
+# expire_on_commit=False | after commit() an async session can NOT lazy load expired attributes (no implicit IO allowed),
+# so we keep the loaded values around instead.
+async_engine: Optional[AsyncEngine] = None
+async_session: Optional[async_sessionmaker] = None
+async_replica_engines: List[AsyncEngine] = list()
+
+
+def _create_async_engine(url: str, name: str) -> AsyncEngine:
+    created: AsyncEngine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name=name,
+        **engine_pool_options()
+    )
+    install_query_timing(created.sync_engine)
+    return created
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    if async_session is None:
+        _create_async_engines()
+
+    return async_session
+
+
+def _create_async_engines():
+    global async_engine, async_session, async_replica_engines
+
+    # the same lock as the sync engines, first use is rare and short.
+    with _engine_lock:
+        if async_session is not None:
+            return
+
+        async_engine = _create_async_engine(config_object.POSTGRES_ASYNC_DATABASE_URL, "primary_async")
+        async_replica_engines = [
+            _create_async_engine(url, f"replica_{index}_async")
+            for index, url in enumerate(config_object.DATABASE_ASYNC_REPLICA_URLS)
+        ]
+
+        if async_replica_engines:
+            # AsyncSession runs a RoutingSession underneath, which routes between the sync side of the async engines.
+            async_session = async_sessionmaker(
+                bind=async_engine,
+                autoflush=False,
+                expire_on_commit=False,
+                sync_session_class=RoutingSession,
+                replicas=[replica.sync_engine for replica in async_replica_engines],
+                balancer=create_balancer(config_object.DATABASE_REPLICA_BALANCING)
+            )
+        else:
+            async_session = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_database():
+    # Same idea as get_database(), `async with` closes the session once the response is sent.
+    async with get_async_sessionmaker()() as database:
+        yield database
+
+
+# ------- Startup / shutdown (see the lifespan in main.py) ------- #
+
+def warm_up_pool(connections: int):
+    """
+    Opens `connections` connections up front on the primary and every replica (all checked out at once, so they are
+    really new ones) and returns them to the pool, the first requests after a deploy don't pay for TCP + auth.
+    """
+    opened: list = list()
+
+    try:
+        for warmed_engine in [get_engine(), *replica_engines]:
+            for _ in range(connections):
+                connection = warmed_engine.connect()
+                opened.append(connection)
+                connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+async def warm_up_async_pool(connections: int):
+    opened: list = list()
+    get_async_sessionmaker()
+
+    try:
+        for warmed_engine in [async_engine, *async_replica_engines]:
+            for _ in range(connections):
+                connection = await warmed_engine.connect()
+                opened.append(connection)
+                await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            await connection.close()
+
+
+async def dispose_engines():
+    """
+    Closes every pooled connection. The engines are created again on next use.
+    """
+    global engine, session, replica_engines, async_engine, async_session, async_replica_engines
+
+    with _engine_lock:
+        disposed_engines: List[Engine] = [engine, *replica_engines] if engine is not None else list()
+        disposed_async_engines: List[AsyncEngine] = [async_engine, *async_replica_engines] if async_engine is not None else list()
+        engine, session, replica_engines = None, None, list()
+        async_engine, async_session, async_replica_engines = None, None, list()
+
+    for disposed_engine in disposed_engines:
+        disposed_engine.dispose()
+
+    for disposed_async_engine in disposed_async_engines:
+        await disposed_async_engine.dispose()
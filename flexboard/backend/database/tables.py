@@ -8,3 +8,5 @@
 from database.base import Base
 from database.orm_models.user import User
 from database.orm_models.job import Job
+from database.orm_models.saved_search import SavedSearch, SavedSearchMatch
+from database.orm_models.job_stat import JobStat
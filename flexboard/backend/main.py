@@ -1,9 +1,26 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 
 from api.api_routes import api_router
 from config import config_object
 from database.tables import Base
-from database.session import engine
+from database.session import dispose_engines, get_engine, get_sessionmaker, warm_up_async_pool, warm_up_pool
+from middleware.metrics_middleware import MetricsMiddleware
+from middleware.read_your_writes_middleware import ReadYourWritesMiddleware
+from middleware.sql_profiler_middleware import SqlProfilerMiddleware
+from services.hash_service import hash_service
+from services.health_service import health_service
+from services.job_event_service import job_event_service
+from services.job_service import job_service
+from services.job_stats_service import job_stats_service
+from services.saved_search_service import saved_search_service
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 def create_tables():
@@ -11,27 +28,132 @@ def create_tables():
     Connects to the database and creates tables from objects extends the Base class. Users, Jobs, etc.
     """
     # https://docs.sqlalchemy.org/en/14/core/metadata.html#creating-and-dropping-database-tables
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+
+
+async def warm_up():
+    """
+    Pays the one-time costs before traffic arrives: opening pool connections and loading bcrypt.
+    """
+    connections: int = config_object.DB_POOL_WARM_UP_CONNECTIONS
+
+    if connections > 0:
+        # login / users always use the sync engine, /jobs uses the async one in async mode.
+        await run_in_threadpool(warm_up_pool, connections)
+
+        if config_object.DATABASE_ASYNC_MODE:
+            await warm_up_async_pool(connections)
+
+    await hash_service.warm_up_async()
+
+
+def build_suggest_index():
+    """
+    The /jobs/suggest index lives in memory, it is filled from one streaming scan of the active jobs.
+    """
+    with get_sessionmaker()() as session:
+        job_service.rebuild_suggest_index(session, config_object.JOB_SUGGEST_BUILD_BATCH_SIZE)
+
+
+def load_saved_searches():
+    """
+    The saved search matching index lives in memory too, it is filled from the saved searches in id order.
+    """
+    with get_sessionmaker()() as session:
+        saved_search_service.sync(session, force=True)
 
 
-def start():
+def reconcile_job_stats():
+    with get_sessionmaker()() as session:
+        job_stats_service.reconcile(session)
+
+
+async def reconcile_job_stats_periodically(interval_seconds: float):
+    """
+    Recounts the /jobs/stats counters right away (they may be new, or behind), then every `interval_seconds`.
+    A failed run is logged and retried at the next interval, the counters just stay as they are meanwhile.
+    """
+    while True:
+        try:
+            await run_in_threadpool(reconcile_job_stats)
+        except Exception:
+            logger.exception("Could not reconcile the job stats.")
+
+        await asyncio.sleep(interval_seconds)
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    # Runs once per worker when the server starts it, NOT when the module is imported.
+    if config_object.DATABASE_CREATE_TABLES:
+        await run_in_threadpool(create_tables)
+
+    if config_object.WARM_UP_ON_STARTUP:
+        await warm_up()
+
+    if config_object.JOB_SUGGEST_ENABLED:
+        await run_in_threadpool(build_suggest_index)
+
+    if config_object.SAVED_SEARCHES_ENABLED:
+        await run_in_threadpool(load_saved_searches)
+        saved_search_service.start(get_sessionmaker())
+
+    # the Postgres backend connects and starts LISTENing here.
+    await run_in_threadpool(job_event_service.start)
+
+    job_stats_reconciler: Optional[asyncio.Task] = None
+
+    if config_object.JOB_STATS_RECONCILE_SECONDS > 0:
+        job_stats_reconciler = asyncio.create_task(reconcile_job_stats_periodically(config_object.JOB_STATS_RECONCILE_SECONDS))
+
+    health_service.mark_started()
+
+    yield
+
+    # /readyz fails first, so the load balancer stops sending requests while we close things.
+    health_service.mark_stopped()
+
+    if job_stats_reconciler is not None:
+        job_stats_reconciler.cancel()
+
+    await run_in_threadpool(job_event_service.stop)
+
+    # matches the jobs still queued while the engines are up.
+    await run_in_threadpool(saved_search_service.stop)
+    await dispose_engines()
+    hash_service.shutdown()
+
+
+def create_app() -> FastAPI:
+    """
+    Application factory, nothing here connects to anything. `uvicorn main:app` or `uvicorn main:create_app --factory`.
+    """
     application: FastAPI = FastAPI(
         title=config_object.PROJECT_TITLE,
         version=config_object.PROJECT_VERSION,
-        summary=config_object.AUTHOR
+        summary=config_object.AUTHOR,
+        lifespan=lifespan
     )
 
     application.include_router(api_router)
 
-    create_tables()
+    # Only matters when reads can go to a replica.
+    if config_object.DATABASE_REPLICA_URLS or config_object.DATABASE_ASYNC_REPLICA_URLS:
+        application.add_middleware(ReadYourWritesMiddleware)
 
-    return application
+    # The last one added is the outermost, metrics wrap the profiler so its overhead is in the latency too.
+    if config_object.SQL_PROFILER_ENABLED:
+        application.add_middleware(SqlProfilerMiddleware)
 
+    if config_object.METRICS_ENABLED:
+        application.add_middleware(MetricsMiddleware)
 
-app: FastAPI = start()
+    # Test Endpoint
+    @application.get("/")
+    def a():
+        return 'Hello'
+
+    return application
 
 
-# Test Endpoint
-@app.get("/")
-def a():
-    return 'Hello'
+app: FastAPI = create_app()
@@ -0,0 +1,79 @@
+"""
+Request metrics, as a plain ASGI middleware (no BaseHTTPMiddleware, it costs an extra task + body streaming per request).
+
+Per request we record:
+- http_requests_total{method, route, status}               | counter
+- http_request_duration_seconds{method, route}             | histogram, until the last byte of the body is sent
+- http_request_db_duration_seconds{method, route}          | histogram, time spent in SQL (database/query_stats.py)
+- http_requests_in_flight{method}                          | gauge
+
+`route` is the route template (ex. /jobs/get-job/{job_id}), never the raw path, so /jobs/get-job/1 and /jobs/get-job/2
+are one series. Requests that match no route share the "<unmatched>" label, so scanners can't blow up the series count.
+"""
+
+import time
+from typing import Any, Optional
+
+from database.query_stats import QueryStats, start_query_stats, stop_query_stats
+from services.metrics_service import MetricsRegistry, metrics_registry
+
+UNMATCHED_ROUTE: str = "<unmatched>"
+
+
+def route_template(scope: dict) -> str:
+    # FastAPI puts the matched APIRoute into the scope while routing, its `path` is the template, prefix included.
+    route: Any = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+
+        self.requests_total = registry.counter(
+            "http_requests_total", "HTTP requests served.", ("method", "route", "status")
+        )
+        self.request_duration = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route")
+        )
+        self.request_db_duration = registry.histogram(
+            "http_request_db_duration_seconds", "Time spent in database statements per HTTP request, in seconds.", ("method", "route")
+        )
+        self.requests_in_flight = registry.gauge(
+            "http_requests_in_flight", "HTTP requests being served right now.", ("method",)
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method: str = scope["method"]
+        status_code: Optional[int] = None
+
+        async def send_with_status(message: dict):
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+        query_stats, token = start_query_stats()
+        self.requests_in_flight.inc(method)
+        start: float = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration: float = time.perf_counter() - start
+            stop_query_stats(token)
+            self.requests_in_flight.dec(method)
+
+            # No response started means the app raised, the server will answer 500.
+            self._record(method, route_template(scope), status_code or 500, duration, query_stats)
+
+    def _record(self, method: str, route: str, status_code: int, duration: float, query_stats: QueryStats):
+        self.requests_total.inc(method, route, str(status_code))
+        self.request_duration.observe(duration, method, route)
+        self.request_db_duration.observe(query_stats.seconds, method, route)
@@ -0,0 +1,71 @@
+"""
+Read-your-writes for read replicas, as a plain ASGI middleware (see database/replicas.py).
+
+- Request in  | the client wrote recently -> its reads use the primary. Recently means either:
+                - the cookie `flexboard_primary_until` is in the future, or
+                - the user wrote within the window, once the token says who it is (identify_read_your_writes).
+- Response    | the request wrote -> (re)set the cookie, and the user's window, to now + READ_YOUR_WRITES_SECONDS.
+
+The cookie works whichever worker / instance answers the next request, but API clients with a bearer token don't
+send cookies. For them the window is kept by user id, in this process (READ_YOUR_WRITES_MAX_USERS at most): their
+next request sees its write when it reaches the same worker. Behind several workers, send the cookie back too.
+"""
+
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+
+from config import config_object
+from database.replicas import start_read_your_writes, stop_read_your_writes
+from services.lru_cache import TTLLRUCache
+
+PRIMARY_UNTIL_COOKIE: str = "flexboard_primary_until"
+
+
+def primary_until(scope: dict) -> float:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            try:
+                return float(cookie_parser(value.decode("latin-1")).get(PRIMARY_UNTIL_COOKIE, 0))
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app, window_seconds: Optional[float] = None, max_users: int = config_object.READ_YOUR_WRITES_MAX_USERS):
+        self.app = app
+        self.window_seconds: float = config_object.READ_YOUR_WRITES_SECONDS if window_seconds is None else window_seconds
+
+        # user id -> True until the end of their window, the TTL does the expiring.
+        self.user_windows: TTLLRUCache = TTLLRUCache(max_size=max_users)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        read_your_writes, token = start_read_your_writes(
+            stick_to_primary=primary_until(scope) > time.time(),
+            user_wrote_recently=lambda user_id: self.user_windows.get(user_id, False)
+        )
+
+        async def send_with_cookie(message: dict):
+            if message["type"] == "http.response.start" and read_your_writes.wrote:
+                MutableHeaders(scope=message).append("set-cookie", self._cookie())
+
+                if read_your_writes.user_id is not None:
+                    self.user_windows.set(read_your_writes.user_id, True, ttl=self.window_seconds)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            stop_read_your_writes(token)
+
+    def _cookie(self) -> str:
+        until: float = time.time() + self.window_seconds
+        return f"{PRIMARY_UNTIL_COOKIE}={until:.3f}; Max-Age={int(self.window_seconds) + 1}; Path=/; HttpOnly; SameSite=Lax"
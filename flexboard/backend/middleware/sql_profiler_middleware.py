@@ -0,0 +1,119 @@
+"""
+SQL profiler (config: SQL_PROFILER_ENABLED), for development and tests.
+
+Per request:
+- `Server-Timing: db;dur=<ms>;desc="<n> queries"` on the response, browsers show it in the network tab.
+- a log line with the statement count, DB time and the slowest statements.
+- a warning for statements that ran SQL_PROFILER_N_PLUS_ONE_THRESHOLD times or more, the usual sign of an N+1
+  (ex. touching `job.owner` for every job of a page, one SELECT per job).
+- a check against ROUTE_QUERY_BUDGETS. Over budget is a warning, or QueryBudgetExceededError when strict
+  (SQL_QUERY_BUDGET_STRICT, the tests turn it on so a route that starts issuing more queries fails the build).
+
+The numbers come from database/query_stats.py, shared with the metrics middleware.
+"""
+
+import logging
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from config import config_object
+from database.query_stats import QueryStats, start_query_stats, stop_query_stats
+from middleware.metrics_middleware import route_template
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Max statements per request, by route template. Budgets don't depend on the page size, that is the point.
+# They are a contract, not a measurement: a feature that needs more statements on one of these routes changes how the
+# route reads / writes (one statement, or off the request path), it doesn't raise the number here. Pinned by
+# tests/test_middleware/test_sql_profiler_middleware.py, a change of budget goes through the backend maintainers' review.
+# get-job / list-jobs | the index-only ETag query + the full read on a cache miss, filtered or not.
+#                     | list-jobs `facets=true` reads the facet counts in the ETag query (UNION ALL).
+# update / delete     | the UPDATE / DELETE ... RETURNING + the "not found or not yours?" probe when nothing matched,
+#                     | or the job stats upsert when it did. An update of a counted column RETURNs the old values too.
+# create-job          | INSERT ... RETURNING + job stats upsert. Saved search matching runs after, off the request.
+# stats               | the counters, one query.
+ROUTE_QUERY_BUDGETS: Dict[str, int] = {
+    "/jobs/create-job": 2,
+    "/jobs/get-job/{job_id}": 2,
+    "/jobs/list-jobs": 2,
+    "/jobs/search": 1,
+    "/jobs/stats": 1,
+    "/jobs/update-job/{job_id}": 2,
+    "/jobs/delete-job/{job_id}": 2,
+    "/login/token": 1,
+}
+
+
+class QueryBudgetExceededError(RuntimeError):
+    pass
+
+
+class SqlProfilerMiddleware:
+    def __init__(
+        self,
+        app,
+        slowest_limit: int = config_object.SQL_PROFILER_SLOWEST,
+        n_plus_one_threshold: int = config_object.SQL_PROFILER_N_PLUS_ONE_THRESHOLD,
+        budgets: Optional[Dict[str, int]] = None,
+        strict: bool = config_object.SQL_QUERY_BUDGET_STRICT,
+        on_request: Optional[Callable[[str, str, QueryStats], None]] = None
+    ):
+        """
+        :param on_request: called with (method, route template, QueryStats) after every request, ex. to collect them in tests.
+        """
+        self.app = app
+        self.slowest_limit = slowest_limit
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.budgets = ROUTE_QUERY_BUDGETS if budgets is None else budgets
+        self.strict = strict
+        self.on_request = on_request
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        query_stats, token = start_query_stats(profile=True, slowest_limit=self.slowest_limit)
+
+        async def send_with_server_timing(message: dict):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", self.server_timing(query_stats))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            stop_query_stats(token)
+
+        self._report(scope["method"], route_template(scope), query_stats)
+
+    def server_timing(self, query_stats: QueryStats) -> str:
+        return f'db;dur={query_stats.seconds * 1000:.2f};desc="{query_stats.count} queries"'
+
+    def _report(self, method: str, route: str, query_stats: QueryStats):
+        if self.on_request is not None:
+            self.on_request(method, route, query_stats)
+
+        if query_stats.count == 0:
+            return
+
+        logger.info(
+            "%s %s: %d queries in %.2f ms, slowest: %s",
+            method, route, query_stats.count, query_stats.seconds * 1000,
+            "; ".join(f"{seconds * 1000:.2f} ms {' '.join(statement.split())}" for seconds, statement in query_stats.slowest())
+        )
+
+        for statement, count in query_stats.repeated_statements(self.n_plus_one_threshold).items():
+            logger.warning("%s %s: possible N+1, ran %d times: %s", method, route, count, " ".join(statement.split()))
+
+        budget: Optional[int] = self.budgets.get(route)
+
+        if budget is not None and query_stats.count > budget:
+            message: str = f"{method} {route} ran {query_stats.count} queries, budget is {budget}."
+
+            if self.strict:
+                raise QueryBudgetExceededError(message)
+
+            logger.warning(message)
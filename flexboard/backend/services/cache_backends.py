@@ -0,0 +1,64 @@
+"""
+Pluggable key/value cache backends, used by JobCacheService.
+
+Values are bytes (already serialized responses), so any key/value store can hold them.
+No delete: the job cache's keys carry the ETag, a write makes the old entries unreachable and they age out (TTL / LRU).
+
+- InMemoryCacheBackend | default, a TTL/LRU dict in this process. Fast, but every worker has its own copy.
+- RedisCacheBackend    | wraps any Redis-compatible client (redis-py, a local stand-in, ...), shared by all workers.
+                         We don't depend on a Redis package, pass in whatever client you have.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from services.lru_cache import TTLLRUCache
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    def __init__(self, max_size: int):
+        self.cache: TTLLRUCache = TTLLRUCache(max_size=max_size)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.cache.set(key, value, ttl=ttl)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, client: Any, prefix: str = "flexboard:"):
+        """
+        :param client: anything with Redis' get / set(ex=) / delete / scan_iter methods.
+        :param prefix: namespace for our keys, `clear()` only deletes keys with this prefix.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self.prefix + key, value, ex=max(1, math.ceil(ttl)))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(key)
@@ -0,0 +1,132 @@
+"""
+Conditional GETs for get-job / list-jobs (ETag, Last-Modified, 304 Not Modified).
+
+A polling client sends back the validators of the copy it already has:
+    If-None-Match: "<etag>"              -> 304 if the ETag is still the same
+    If-Modified-Since: <http date>       -> 304 if nothing changed since (only looked at without If-None-Match)
+
+The validators come from (id, version, updated_at) only, read straight from an index (see JobDao.retrieve_job_validator),
+so a 304 never loads the full row nor serializes anything.
+
+- get-job   | ETag "job-<id>-<hash of version + updated_at>", Last-Modified = updated_at.
+- list-jobs | ETag = hash of (limit, fieldset, id + version + updated_at of every row of the page, plus the one-extra
+              row that decides next_cursor). Another `fields=` is another representation, so another ETag.
+              With filters they are in the hash too, and with `facets=true` the facet counts themselves: they move
+              when jobs outside the page change, which the page's rows don't show.
+              No Last-Modified: a deleted / deactivated job changes the page without moving any updated_at that is still on it.
+
+updated_at is in the hash too, so a new job that gets the id of a deleted one (SQLite reuses ids) never matches an old ETag.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+
+from fastapi.responses import Response
+from sqlalchemy import Row
+
+from api_models.job import JobFilters
+from api_models.job_serializer import dumps
+
+
+class JobValidator:
+    def __init__(self, etag: str, last_modified: Optional[datetime] = None):
+        """
+        :param etag: quoted strong ETag.
+        :param last_modified: naive UTC datetime.
+        """
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ConditionalRequestService:
+    def job_validator(self, row: Row) -> JobValidator:
+        """
+        :param row: (id, version, updated_at) of a job.
+        """
+        digest: str = hashlib.sha256(self._row_token(row).encode()).hexdigest()[:16]
+        return JobValidator(etag=f'"job-{row.id}-{digest}"', last_modified=row.updated_at)
+
+    def page_validator(
+        self,
+        rows: Iterable[Row],
+        limit: int,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None,
+        facets: Optional[dict] = None
+    ) -> JobValidator:
+        """
+        :param rows: (id, version, updated_at) of the page, as fetched for it, `limit + 1` rows at most.
+        :param fields: the sparse fieldset of the response, None for whole jobs.
+        :param filters: the list-jobs filters, only the ones that differ from the defaults count.
+        :param facets: the facet counts sent with the page, if any.
+        """
+        digest = hashlib.sha256(f"{limit}:{','.join(fields)}".encode() if fields else f"{limit}".encode())
+
+        # unfiltered (default) pages keep the ETag they always had.
+        if filters is not None and filters != JobFilters():
+            digest.update(b"|filters:" + filters.model_dump_json(exclude_defaults=True).encode())
+
+        if facets is not None:
+            digest.update(b"|facets:" + dumps(facets))
+
+        for row in rows:
+            digest.update(f"|{self._row_token(row)}".encode())
+
+        return JobValidator(etag=f'"jobs-{digest.hexdigest()[:32]}"')
+
+    def is_not_modified(
+        self,
+        validator: JobValidator,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None
+    ) -> bool:
+        if if_none_match is not None:
+            return self._etag_matches(validator.etag, if_none_match)
+
+        if if_modified_since is not None and validator.last_modified is not None:
+            since: Optional[datetime] = self._parse_http_date(if_modified_since)
+
+            # HTTP dates have no fractions of a second.
+            return since is not None and self._as_utc(validator.last_modified).replace(microsecond=0) <= since
+
+        return False
+
+    def headers(self, validator: JobValidator) -> dict:
+        headers: dict = {"ETag": validator.etag}
+
+        if validator.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self._as_utc(validator.last_modified), usegmt=True)
+
+        return headers
+
+    def not_modified_response(self, validator: JobValidator) -> Response:
+        return Response(status_code=304, headers=self.headers(validator))
+
+    def _row_token(self, row: Row) -> str:
+        return f"{row.id}:{row.version}:{row.updated_at.isoformat() if row.updated_at else ''}"
+
+    def _etag_matches(self, etag: str, if_none_match: str) -> bool:
+        # If-None-Match uses the weak comparison, so W/"x" matches "x".
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+
+            if candidate == "*" or candidate.removeprefix("W/") == etag:
+                return True
+
+        return False
+
+    def _parse_http_date(self, value: str) -> Optional[datetime]:
+        try:
+            parsed: datetime = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        return self._as_utc(parsed)
+
+    def _as_utc(self, value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+conditional_request_service: ConditionalRequestService = ConditionalRequestService()
@@ -0,0 +1,71 @@
+"""
+Opaque cursors for keyset (seek) pagination.
+
+Why not OFFSET?
+- `OFFSET 10000` still makes the database read and throw away 10000 rows, so page N gets slower and slower.
+- With a cursor we remember the last row we sent, (date_posted, id), and ask for rows "after" it.
+  The database jumps straight there using the index, so page N costs the same as page 1.
+
+The cursor is just base64 of that (date_posted, id) pair. Clients should treat it as an opaque string.
+
+Lists ordered by id alone (ex. saved search matches) use `encode_id`, the id of the last row.
+
+Ranked search results use an offset cursor instead (`encode_offset`), the database has to score every match
+to sort by rank anyway, so seeking would not save anything there.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class CursorService:
+    def encode(self, date_posted: date, job_id: int) -> str:
+        return self._dump([date_posted.isoformat(), job_id])
+
+    def decode(self, cursor: str) -> Tuple[date, int]:
+        # date_posted is NOT NULL, a cursor without one can't come from us.
+        try:
+            date_posted, job_id = self._load(cursor)
+            return date.fromisoformat(date_posted), int(job_id)
+        except (binascii.Error, ValueError, TypeError) as error:
+            raise InvalidCursorError("Invalid cursor.") from error
+
+    def encode_id(self, row_id: int) -> str:
+        return self._dump({"id": row_id})
+
+    def decode_id(self, cursor: str) -> int:
+        try:
+            return int(self._load(cursor)["id"])
+        except (binascii.Error, ValueError, TypeError, KeyError) as error:
+            raise InvalidCursorError("Invalid cursor.") from error
+
+    def encode_offset(self, offset: int) -> str:
+        return self._dump({"offset": offset})
+
+    def decode_offset(self, cursor: str) -> int:
+        try:
+            offset: int = int(self._load(cursor)["offset"])
+        except (binascii.Error, ValueError, TypeError, KeyError) as error:
+            raise InvalidCursorError("Invalid cursor.") from error
+
+        if offset < 0:
+            raise InvalidCursorError("Invalid cursor.")
+
+        return offset
+
+    def _dump(self, value) -> str:
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+    def _load(self, cursor: str):
+        padded: str = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+cursor_service: CursorService = CursorService()
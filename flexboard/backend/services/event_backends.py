@@ -0,0 +1,201 @@
+"""
+Pluggable event backends, used by JobEventService (the /jobs/stream change feed).
+
+A backend carries a published event to `deliver` of every worker, including the one that published it.
+When it may have lost events (ex. the connection dropped), it delivers RESET_EVENT, so nobody resumes across the gap.
+
+- LocalEventBackend    | default, hands the event straight to this process' `deliver`. One worker only, or a stand-in
+                         for tests / local runs.
+- PostgresEventBackend | NOTIFY on publish, and a thread per worker that LISTENs and delivers. Every worker sees every
+                         event in the same (commit) order, without anything else to run next to Postgres.
+                         Uses psycopg2 directly, imported on first use, so SQLite setups never need it.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import select
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy.engine import make_url
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+Deliver = Callable[[dict], None]
+
+RESET_EVENT: dict = {"type": "reset"}
+
+
+class EventBackend(ABC):
+    def __init__(self):
+        self.deliver: Optional[Deliver] = None
+
+    def start(self, deliver: Deliver):
+        """
+        :param deliver: called with every event, from any thread.
+        """
+        self.deliver = deliver
+
+    @abstractmethod
+    def publish(self, event: dict):
+        pass
+
+    async def publish_async(self, event: dict):
+        self.publish(event)
+
+    def publish_many(self, events: List[dict]):
+        """
+        The events in order, ex. the jobs of a bulk-create batch. Backends that talk to a server do it in one round trip.
+        """
+        for event in events:
+            self.publish(event)
+
+    async def publish_many_async(self, events: List[dict]):
+        self.publish_many(events)
+
+    def stop(self):
+        pass
+
+
+class LocalEventBackend(EventBackend):
+    def publish(self, event: dict):
+        if self.deliver is not None:
+            self.deliver(event)
+
+
+class PostgresEventBackend(EventBackend):
+    # NOTIFY payloads must be shorter than 8000 bytes, events only carry a job's headline columns.
+    MAX_PAYLOAD_BYTES: int = 7999
+
+    def __init__(self, url: str, channel: str = "job_events", poll_seconds: float = 1.0, reconnect_seconds: float = 1.0):
+        """
+        :param url: SQLAlchemy URL of the database, ex. POSTGRES_DATABASE_URL. The driver part is dropped for psycopg2.
+        :param channel: LISTEN / NOTIFY channel, an identifier.
+        :param poll_seconds: how often the listener wakes up to check if it should stop.
+        """
+        super().__init__()
+
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", channel):
+            raise ValueError(f"Invalid channel name '{channel}'.")
+
+        self.dsn: str = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self.reconnect_seconds = reconnect_seconds
+
+        self._publisher: Any = None
+        self._publisher_lock: threading.Lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._stopping: threading.Event = threading.Event()
+
+    def start(self, deliver: Deliver):
+        super().start(deliver)
+        self._stopping.clear()
+        self._listener = threading.Thread(target=self._listen, name="job-events-listener", daemon=True)
+        self._listener.start()
+
+    def publish(self, event: dict):
+        self._notify("SELECT pg_notify(%s, %s)", (self.channel, self._payload(event)))
+
+    def publish_many(self, events: List[dict]):
+        if not events:
+            return
+
+        # one statement for the whole batch, in order: a NOTIFY per row of the array.
+        self._notify(
+            "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) WITH ORDINALITY AS events(payload, position) ORDER BY position",
+            (self.channel, [self._payload(event) for event in events])
+        )
+
+    async def publish_async(self, event: dict):
+        # a network round trip, keep it off the event loop.
+        await asyncio.to_thread(self.publish, event)
+
+    async def publish_many_async(self, events: List[dict]):
+        await asyncio.to_thread(self.publish_many, events)
+
+    def _payload(self, event: dict) -> str:
+        payload: str = json.dumps(event, separators=(",", ":"))
+
+        if len(payload.encode()) > self.MAX_PAYLOAD_BYTES:
+            raise ValueError("Event is too big for NOTIFY.")
+
+        return payload
+
+    def _notify(self, statement: str, parameters: tuple):
+        # One connection shared by the publishing threads, NOTIFY is a quick autocommit statement.
+        with self._publisher_lock:
+            for attempt in range(2):
+                try:
+                    if self._publisher is None or self._publisher.closed:
+                        self._publisher = self._connect()
+
+                    with self._publisher.cursor() as cursor:
+                        cursor.execute(statement, parameters)
+                    return
+                except Exception:
+                    # a dropped connection, ex. Postgres restarted. Reconnect once, then give up on these events.
+                    self._close(self._publisher)
+                    self._publisher = None
+
+                    if attempt == 1:
+                        raise
+
+    def stop(self):
+        self._stopping.set()
+
+        if self._listener is not None:
+            self._listener.join(timeout=self.poll_seconds * 2)
+            self._listener = None
+
+        with self._publisher_lock:
+            self._close(self._publisher)
+            self._publisher = None
+
+    def _listen(self):
+        reconnecting: bool = False
+
+        while not self._stopping.is_set():
+            connection: Any = None
+
+            try:
+                connection = self._connect()
+
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+
+                if reconnecting:
+                    self.deliver(RESET_EVENT)
+                    reconnecting = False
+
+                while not self._stopping.is_set():
+                    # wait until Postgres sends something, or poll_seconds went by.
+                    if select.select([connection], [], [], self.poll_seconds) == ([], [], []):
+                        continue
+
+                    connection.poll()
+
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        self.deliver(json.loads(notify.payload))
+            except Exception:
+                # events NOTIFYed while we are away are lost, RESET_EVENT once we are back.
+                logger.exception("Job events listener lost its connection, reconnecting.")
+                reconnecting = True
+                self._stopping.wait(self.reconnect_seconds)
+            finally:
+                self._close(connection)
+
+    def _connect(self) -> Any:
+        import psycopg2
+
+        connection: Any = psycopg2.connect(self.dsn)
+        connection.autocommit = True
+        return connection
+
+    def _close(self, connection: Any):
+        if connection is not None and not connection.closed:
+            connection.close()
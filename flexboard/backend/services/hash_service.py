@@ -7,24 +7,133 @@ We are giving the context of what encryptor we will be using, in this case, bcry
 - I didn't want to remove it from the class declaration
 - Since we don't use 'self' or instances of the class, Python suggests that this method is a static method..
 - Because it is a static method.
+
+Why a worker pool?
+- bcrypt is slow ON PURPOSE, a single verify can take a few hundred milliseconds.
+- Calling it inside an `async def` route blocks the whole event loop, every other request on the worker waits.
+- bcrypt releases the GIL, so a small dedicated thread pool lets hashing run in parallel without blocking the loop.
+- The pool is bounded, if too many hashes are already waiting we fail fast (HashServiceSaturatedError -> 503)
+  instead of letting a login burst queue up forever.
 """
 
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
 from passlib.context import CryptContext
 
+from config import config_object
+
 # type of encryptor, bcrypt password encryptor
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class HashServiceSaturatedError(Exception):
+    """
+    Raised when the auth worker pool already has `HASH_MAX_PENDING` hashes in flight.
+    Routes turn this into a 503 so the client can retry later.
+    """
+
+
 class HashService:
+    def __init__(self, max_workers: int, max_pending: int):
+        """
+        :param max_workers: number of threads allowed to run bcrypt at the same time.
+        :param max_pending: number of hashes (running + waiting) allowed before we start rejecting.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         # returns 'true' or 'false'
-        is_password_valid: bool = pwd_context.verify(plain_password, hashed_password)
+        is_password_valid: bool = pwd_context.verify(plain_password, HashService.parse_hashed_password(hashed_password))
         return is_password_valid
 
     @staticmethod
     def hash(plain_password: str) -> str:
         return pwd_context.hash(plain_password)
 
+    @staticmethod
+    def parse_hashed_password(hashed_password: str) -> str:
+        """
+        Passwords may be stored with a scheme prefix, ex. "{bcrypt}$2b$12$...". passlib only understands the part after "}".
+        """
+        if hashed_password.startswith("{") and "}" in hashed_password:
+            return hashed_password.split("}", 1)[1]
+        return hashed_password
+
+    # ------- Bounded worker pool ------- #
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hash-worker")
+        return self._executor
+
+    def _submit(self, function: Callable, *args) -> Future:
+        """
+        Hands the work to the pool, or raises HashServiceSaturatedError right away when the pool is full.
+        """
+        executor: ThreadPoolExecutor = self._get_executor()
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashServiceSaturatedError("Too many password hashes in flight.")
+            self._pending += 1
+
+        try:
+            future: Future = executor.submit(function, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Same as verify_password(), but runs on the auth worker pool so the event loop is free while bcrypt works.
+        """
+        return await asyncio.wrap_future(self._submit(self.verify_password, plain_password, hashed_password))
+
+    async def hash_async(self, plain_password: str) -> str:
+        return await asyncio.wrap_future(self._submit(self.hash, plain_password))
+
+    def hash_bounded(self, plain_password: str) -> str:
+        """
+        For sync routes (already running in Starlette's threadpool). Blocks the calling thread, not the event loop,
+        but still goes through the bounded pool so the number of concurrent bcrypt calls stays capped.
+        """
+        return self._submit(self.hash, plain_password).result()
+
+    async def warm_up_async(self):
+        """
+        passlib loads (and self-tests) the bcrypt backend on the first hash, and the pool starts its threads lazily.
+        Doing one hash at startup keeps that cost off the first login.
+        """
+        await self.hash_async("warm-up")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
 
-hash_service: HashService = HashService()
+hash_service: HashService = HashService(
+    max_workers=config_object.HASH_WORKER_POOL_SIZE,
+    max_pending=config_object.HASH_MAX_PENDING
+)
@@ -0,0 +1,34 @@
+"""
+Liveness / readiness, served by /healthz and /readyz.
+
+- live  | the process is up and answering. Never looks at the database: a database outage should not get every
+          worker restarted by the orchestrator, they would all come back to the same outage.
+- ready | startup is done (tables, pool + bcrypt warm-up, see the lifespan in main.py) AND the database answers.
+          Load balancers only send traffic to ready workers.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+
+class HealthService:
+    def __init__(self):
+        # Flipped by the lifespan in main.py, True between startup and shutdown.
+        self.started: bool = False
+
+    def mark_started(self):
+        self.started = True
+
+    def mark_stopped(self):
+        self.started = False
+
+    def database_is_reachable(self, session: Session) -> bool:
+        try:
+            session.execute(text("SELECT 1"))
+            return True
+        except SQLAlchemyError:
+            return False
+
+
+health_service: HealthService = HealthService()
@@ -0,0 +1,128 @@
+"""
+Read-through cache of serialized get-job / list-jobs responses.
+
+    request -> ETag, index-only query (always)
+            -> cache hit?  -> bytes, no row load, no serialization
+            -> cache miss  -> load from the database + serialize (once, see single-flight) -> store -> bytes
+
+A hit still costs the validator query, it saves the row load and the serialization, not the round trip.
+
+Keys carry the ETag of what they hold (see services/conditional_request_service.py):
+- jobs:job:{id}:{etag}    | one job
+- jobs:list:{etag}        | one page
+
+The ETag is read from the database (index-only) on every request, and every write changes it, so a write makes
+the old entries unreachable: no invalidation calls, and no stale answers from another worker's cache either.
+Old entries simply age out (TTL / LRU).
+
+We cache bytes, not ORM objects: an ORM object belongs to the session that loaded it, bytes can be shared
+by every request and stored in an external cache (see services/cache_backends.py).
+"""
+
+import threading
+from typing import Awaitable, Callable, Optional
+
+from config import config_object
+from services.cache_backends import CacheBackend, InMemoryCacheBackend
+from services.single_flight import AsyncSingleFlight, SingleFlight
+
+class JobCacheService:
+    def __init__(self, backend: CacheBackend, job_ttl_seconds: float, list_ttl_seconds: float, enabled: bool = True):
+        self.backend = backend
+        self.job_ttl_seconds = job_ttl_seconds
+        self.list_ttl_seconds = list_ttl_seconds
+        self.enabled = enabled
+
+        self.single_flight: SingleFlight = SingleFlight()
+        self.async_single_flight: AsyncSingleFlight = AsyncSingleFlight()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def job_key(self, job_id: int, etag: str) -> str:
+        return f"jobs:job:{job_id}:{etag}"
+
+    def list_key(self, etag: str) -> str:
+        return f"jobs:list:{etag}"
+
+    def get_job(self, job_id: int, etag: str, loader: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """
+        :param etag: the job's current ETag.
+        :param loader: loads + serializes the job, returns None when there is no such job (a miss is not cached).
+        """
+        return self._read_through(self.job_key(job_id, etag), self.job_ttl_seconds, loader)
+
+    async def get_job_async(self, job_id: int, etag: str, loader: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        return await self._read_through_async(self.job_key(job_id, etag), self.job_ttl_seconds, loader)
+
+    def get_list_page(self, etag: str, loader: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        return self._read_through(self.list_key(etag), self.list_ttl_seconds, loader)
+
+    async def get_list_page_async(self, etag: str, loader: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        return await self._read_through_async(self.list_key(etag), self.list_ttl_seconds, loader)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _read_through(self, key: str, ttl: float, loader: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        if not self.enabled:
+            return loader()
+
+        cached: Optional[bytes] = self.backend.get(key)
+
+        if cached is not None:
+            self._count(hit=True)
+            return cached
+
+        self._count(hit=False)
+        return self.single_flight.do(key, lambda: self._load(key, ttl, loader()))
+
+    async def _read_through_async(
+        self,
+        key: str,
+        ttl: float,
+        loader: Callable[[], Awaitable[Optional[bytes]]]
+    ) -> Optional[bytes]:
+        if not self.enabled:
+            return await loader()
+
+        cached: Optional[bytes] = self.backend.get(key)
+
+        if cached is not None:
+            self._count(hit=True)
+            return cached
+
+        self._count(hit=False)
+
+        async def load() -> Optional[bytes]:
+            return self._load(key, ttl, await loader())
+
+        return await self.async_single_flight.do(key, load)
+
+    def _load(self, key: str, ttl: float, value: Optional[bytes]) -> Optional[bytes]:
+        if value is not None:
+            self.backend.set(key, value, ttl)
+        return value
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+job_cache_service: JobCacheService = JobCacheService(
+    backend=InMemoryCacheBackend(max_size=config_object.JOB_CACHE_MAX_SIZE),
+    job_ttl_seconds=config_object.JOB_CACHE_TTL_SECONDS,
+    list_ttl_seconds=config_object.JOB_LIST_CACHE_TTL_SECONDS,
+    enabled=config_object.JOB_CACHE_ENABLED
+)
@@ -0,0 +1,327 @@
+"""
+Change feed for /jobs/stream (Server-Sent Events): dashboards get job creates / updates / deletes pushed to them
+instead of polling list-jobs.
+
+Publishing | JobService calls publish_created / publish_updated / publish_deleted after every committed write, and
+             publish_created_many once per bulk-create batch (one NOTIFY round trip for the batch, not one per job).
+             The event goes through the backend (services/event_backends.py) to every worker, this one included.
+
+Delivery (`_deliver`, any thread) | the event is appended to a ring buffer (the last JOB_EVENTS_BUFFER_SIZE events)
+             and offered to every subscriber's queue, on the subscriber's event loop (call_soon_threadsafe), so sync
+             routes running in the threadpool can publish too.
+
+Subscribers | one bounded queue (JOB_EVENTS_QUEUE_SIZE) per open stream. A subscriber whose queue is full is too slow:
+             it is dropped, its queue emptied and its stream ended with a `dropped` event, instead of the queue growing
+             without bounds or slowing down everybody else. Its client reconnects (EventSource does so by itself)
+             and resumes.
+
+Resuming | the client sends the id of the last event it got as `Last-Event-ID`. If that event is still in the ring
+             buffer the stream starts with the events after it. If not (too old, or from before a backend reset),
+             the stream starts with a `reset` event: reload list-jobs, then follow the stream.
+
+Event ids are "<worker>-<sequence>" of the publishing worker. With the Postgres backend every worker delivers the same
+events in the same order, so a client can resume on any worker.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import uuid
+from collections import deque
+from datetime import date
+from typing import Any, AsyncIterator, Deque, Iterable, List, Optional, Set, Tuple
+
+from api_models.job_serializer import dumps
+from config import config_object
+from services.event_backends import RESET_EVENT, EventBackend, LocalEventBackend, PostgresEventBackend
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# The columns of a job sent with `created` / `updated` events, the headline, no description (NOTIFY payloads are small).
+EVENT_JOB_FIELDS: Tuple[str, ...] = ("title", "company", "company_url", "location", "date_posted", "is_active")
+
+# Put into a subscriber's queue when it is dropped, ends its stream.
+_DROPPED: dict = {"type": "dropped"}
+
+
+class JobEventSubscribersExceededError(RuntimeError):
+    pass
+
+
+class JobEventSubscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped: bool = False
+
+    def offer(self, event: dict):
+        """
+        Runs on the subscriber's loop.
+        """
+        if self.dropped:
+            return
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+            self.queue.put_nowait(_DROPPED)
+
+
+class JobEventService:
+    def __init__(
+        self,
+        backend: EventBackend,
+        buffer_size: int = 1000,
+        queue_size: int = 100,
+        max_subscribers: int = 1000,
+        heartbeat_seconds: float = 15.0
+    ):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat_seconds = heartbeat_seconds
+
+        self._buffer: Deque[dict] = deque(maxlen=buffer_size)
+        self._subscribers: Set[JobEventSubscriber] = set()
+        self._lock: threading.Lock = threading.Lock()
+
+        self._worker: str = uuid.uuid4().hex[:8]
+        self._sequence: itertools.count = itertools.count(1)
+
+        self.published: int = 0
+        self.dropped_subscribers: int = 0
+
+        # Started by the lifespan (main.py), or on first use, so importing this module never connects anywhere.
+        self.started: bool = False
+        self._start_lock: threading.Lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if not self.started:
+                self.backend.start(self._deliver)
+                self.started = True
+
+    def stop(self):
+        with self._start_lock:
+            if self.started:
+                self.backend.stop()
+                self.started = False
+
+    def clear(self):
+        with self._lock:
+            self._buffer.clear()
+
+    # ------- Publishing (JobService) ------- #
+
+    def publish_created(self, job_id: int, job: Any):
+        self._publish(self._event("created", job_id, job))
+
+    def publish_updated(self, job_id: int, job: Any):
+        self._publish(self._event("updated", job_id, job))
+
+    def publish_deleted(self, job_id: int):
+        self._publish(self._event("deleted", job_id))
+
+    def publish_created_many(self, jobs: Iterable[Tuple[int, Any]]):
+        """
+        :param jobs: (id, job) of the jobs of one bulk-create batch.
+        """
+        self._publish_many([self._event("created", job_id, job) for job_id, job in jobs])
+
+    async def publish_created_async(self, job_id: int, job: Any):
+        await self._publish_async(self._event("created", job_id, job))
+
+    async def publish_updated_async(self, job_id: int, job: Any):
+        await self._publish_async(self._event("updated", job_id, job))
+
+    async def publish_deleted_async(self, job_id: int):
+        await self._publish_async(self._event("deleted", job_id))
+
+    async def publish_created_many_async(self, jobs: Iterable[Tuple[int, Any]]):
+        await self._publish_many_async([self._event("created", job_id, job) for job_id, job in jobs])
+
+    def _event(self, event_type: str, job_id: int, job: Any = None) -> dict:
+        """
+        Plain JSON types only, the Postgres backend sends it as a NOTIFY payload.
+        :param job: a Job, or the JobCreate of a bulk-created job (no is_active, it is active).
+        """
+        data: dict = {"id": job_id}
+
+        if job is not None:
+            for field in EVENT_JOB_FIELDS:
+                value: Any = getattr(job, field, True if field == "is_active" else None)
+                data[field] = value.isoformat() if isinstance(value, date) else value
+
+        return {"id": f"{self._worker}-{next(self._sequence)}", "type": event_type, "data": data}
+
+    # The write is committed already, a feed that can't publish must not fail it. Streams miss the event.
+    def _publish(self, event: dict):
+        try:
+            self.start()
+            self.backend.publish(event)
+            self.published += 1
+        except Exception:
+            logger.exception("Could not publish job event.")
+
+    async def _publish_async(self, event: dict):
+        try:
+            self.start()
+            await self.backend.publish_async(event)
+            self.published += 1
+        except Exception:
+            logger.exception("Could not publish job event.")
+
+    def _publish_many(self, events: List[dict]):
+        if not events:
+            return
+
+        try:
+            self.start()
+            self.backend.publish_many(events)
+            self.published += len(events)
+        except Exception:
+            logger.exception("Could not publish %d job events.", len(events))
+
+    async def _publish_many_async(self, events: List[dict]):
+        if not events:
+            return
+
+        try:
+            self.start()
+            await self.backend.publish_many_async(events)
+            self.published += len(events)
+        except Exception:
+            logger.exception("Could not publish %d job events.", len(events))
+
+    # ------- Delivery (backend, any thread) ------- #
+
+    def _deliver(self, event: dict):
+        with self._lock:
+            if event["type"] == RESET_EVENT["type"]:
+                # events may be missing from here on, nobody can resume from before this point.
+                self._buffer.clear()
+            else:
+                self._buffer.append(event)
+
+            subscribers: List[JobEventSubscriber] = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(self._offer, subscriber, event)
+            except RuntimeError:
+                # its loop is closed, the stream is long gone.
+                self._unsubscribe(subscriber)
+
+    def _offer(self, subscriber: JobEventSubscriber, event: dict):
+        was_dropped: bool = subscriber.dropped
+        subscriber.offer(event)
+
+        if subscriber.dropped and not was_dropped:
+            self.dropped_subscribers += 1
+            self._unsubscribe(subscriber)
+
+    # ------- Subscribing (/jobs/stream, on the event loop) ------- #
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[JobEventSubscriber, Optional[List[dict]]]:
+        """
+        Raises JobEventSubscribersExceededError when JOB_EVENTS_MAX_SUBSCRIBERS streams are open.
+        :return: the subscriber, and the events after `last_event_id` (None if it is not in the buffer anymore).
+        Registering and reading the buffer happen under one lock, no event is missed or sent twice in between.
+        """
+        self.start()
+        subscriber: JobEventSubscriber = JobEventSubscriber(asyncio.get_running_loop(), self.queue_size)
+
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise JobEventSubscribersExceededError("Too many open job streams.")
+
+            backlog: Optional[List[dict]] = self._events_after(last_event_id) if last_event_id else list()
+            self._subscribers.add(subscriber)
+
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: JobEventSubscriber):
+        self._unsubscribe(subscriber)
+
+    async def stream(self, subscriber: JobEventSubscriber, backlog: Optional[List[dict]]) -> AsyncIterator[bytes]:
+        """
+        The SSE body of one /jobs/stream response. Unsubscribes when the client goes away (the generator is closed).
+        """
+        try:
+            # EventSource waits this long (ms) before reconnecting.
+            yield b"retry: 3000\n\n"
+
+            for event in (backlog if backlog is not None else [RESET_EVENT]):
+                yield self.sse(event)
+
+            while True:
+                try:
+                    event: dict = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    # a comment line, keeps proxies from closing an idle connection.
+                    yield b": keep-alive\n\n"
+                    continue
+
+                yield self.sse(event)
+
+                if event is _DROPPED:
+                    return
+        finally:
+            self._unsubscribe(subscriber)
+
+    def sse(self, event: dict) -> bytes:
+        lines: List[bytes] = list()
+
+        # reset / dropped have no id, a client resuming after them keeps the id of the last real event.
+        if "id" in event:
+            lines.append(b"id: " + event["id"].encode())
+
+        lines.append(b"event: " + event["type"].encode())
+        lines.append(b"data: " + dumps(event.get("data", dict())))
+
+        return b"\n".join(lines) + b"\n\n"
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "buffered": len(self._buffer),
+            "published": self.published,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+    def _events_after(self, last_event_id: str) -> Optional[List[dict]]:
+        # newest events are at the right, a resuming client is usually only a few events behind.
+        for index in range(len(self._buffer) - 1, -1, -1):
+            if self._buffer[index]["id"] == last_event_id:
+                return list(itertools.islice(self._buffer, index + 1, None))
+
+        return None
+
+    def _unsubscribe(self, subscriber: JobEventSubscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+
+def create_event_backend() -> EventBackend:
+    if config_object.JOB_EVENTS_BACKEND == "postgres":
+        return PostgresEventBackend(config_object.POSTGRES_DATABASE_URL, channel=config_object.JOB_EVENTS_CHANNEL)
+
+    if config_object.JOB_EVENTS_BACKEND == "local":
+        return LocalEventBackend()
+
+    raise ValueError(f"Unknown job events backend '{config_object.JOB_EVENTS_BACKEND}', expected 'local' or 'postgres'.")
+
+
+job_event_service: JobEventService = JobEventService(
+    create_event_backend(),
+    buffer_size=config_object.JOB_EVENTS_BUFFER_SIZE,
+    queue_size=config_object.JOB_EVENTS_QUEUE_SIZE,
+    max_subscribers=config_object.JOB_EVENTS_MAX_SUBSCRIBERS,
+    heartbeat_seconds=config_object.JOB_EVENTS_HEARTBEAT_SECONDS
+)
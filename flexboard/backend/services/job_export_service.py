@@ -0,0 +1,105 @@
+"""
+Streaming export of the job table, used by /jobs/export.
+
+Rows come from the database in batches (server-side cursor), each batch is turned into bytes and sent right away.
+Memory stays the same whether the table has 100 rows or 10 million.
+
+Formats:
+- ndjson | one JSON object per line.
+- csv    | header row, then one row per job.
+
+Optionally gzip-ed on the fly, batch by batch.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from enum import Enum
+from typing import AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import Row
+
+from database.daos.job_dao import EXPORT_JOB_COLUMNS
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES: dict = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class JobExportService:
+    def __init__(self):
+        self.field_names: list = [export_column.key for export_column in EXPORT_JOB_COLUMNS]
+
+    def media_type(self, export_format: ExportFormat) -> str:
+        return MEDIA_TYPES[export_format]
+
+    def iter_export(self, batches: Iterable[list[Row]], export_format: ExportFormat, gzip: bool = False) -> Iterator[bytes]:
+        compressor = self._compressor() if gzip else None
+
+        yield self._compress(compressor, self._header(export_format))
+
+        for batch in batches:
+            yield self._compress(compressor, self._encode_batch(batch, export_format))
+
+        if compressor is not None:
+            yield compressor.flush()
+
+    async def iter_export_async(self, batches: AsyncIterator[list[Row]], export_format: ExportFormat, gzip: bool = False) -> AsyncIterator[bytes]:
+        compressor = self._compressor() if gzip else None
+
+        yield self._compress(compressor, self._header(export_format))
+
+        async for batch in batches:
+            yield self._compress(compressor, self._encode_batch(batch, export_format))
+
+        if compressor is not None:
+            yield compressor.flush()
+
+    def _header(self, export_format: ExportFormat) -> bytes:
+        if export_format == ExportFormat.CSV:
+            return self._csv_lines([self.field_names])
+        return b""
+
+    def _encode_batch(self, batch: list[Row], export_format: ExportFormat) -> bytes:
+        if export_format == ExportFormat.CSV:
+            return self._csv_lines([[self._csv_value(value) for value in row] for row in batch])
+
+        return "".join(
+            json.dumps(dict(zip(self.field_names, row)), default=self._json_default) + "\n" for row in batch
+        ).encode()
+
+    def _csv_lines(self, rows: list) -> bytes:
+        buffer: io.StringIO = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def _csv_value(self, value):
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+    def _json_default(self, value):
+        if isinstance(value, date):
+            return value.isoformat()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+    def _compressor(self):
+        # wbits=31 | gzip container (header + crc), what `Content-Encoding: gzip` expects.
+        return zlib.compressobj(wbits=31)
+
+    def _compress(self, compressor, chunk: bytes) -> bytes:
+        if compressor is None:
+            return chunk
+        return compressor.compress(chunk)
+
+
+job_export_service: JobExportService = JobExportService()
@@ -0,0 +1,193 @@
+"""
+Bulk import of jobs, used by /jobs/bulk-create.
+
+The body is either:
+- a JSON array of JobCreate objects (Content-Type: application/json), or
+- NDJSON, one JobCreate object per line (Content-Type: application/x-ndjson). Read as a stream,
+  so we never hold more than one batch in memory.
+
+Memory stays bounded either way:
+- a JSON array has to be parsed whole, so its body is capped at `max_body_bytes` (ImportBodyTooLargeError, 413).
+- an NDJSON line longer than `max_line_bytes` is reported as a bad item and skipped without being kept.
+
+Items are validated and inserted `batch_size` at a time, one multi-row INSERT per batch.
+A bad item (invalid JSON, failed validation, failed insert) is reported with its index, it does not stop the import.
+"""
+
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+
+from api_models.job import JobBulkCreateError, JobBulkCreateResult, JobCreate
+from config import config_object
+
+
+class InvalidImportBodyError(ValueError):
+    pass
+
+
+class ImportBodyTooLargeError(InvalidImportBodyError):
+    pass
+
+
+class ImportItemError:
+    """
+    Placeholder for an item that could not even be parsed, so it keeps its index in the stream.
+    """
+
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
+class JobImportService:
+    def __init__(self, batch_size: int, max_items: int, max_body_bytes: int, max_line_bytes: int):
+        self.batch_size = batch_size
+        self.max_items = max_items
+        self.max_body_bytes = max_body_bytes
+        self.max_line_bytes = max_line_bytes
+
+    def is_ndjson(self, content_type: str) -> bool:
+        return "ndjson" in (content_type or "").lower()
+
+    async def iter_items(self, content_type: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Yields (index, raw item) pairs from the request body, raw item is an ImportItemError when the line is not JSON
+        or too long.
+        Raises InvalidImportBodyError if a JSON body is not an array, ImportBodyTooLargeError if it is over max_body_bytes.
+        """
+        if self.is_ndjson(content_type):
+            index: int = 0
+            async for line in self._iter_lines(chunks):
+                if line is None:
+                    yield index, ImportItemError(f"Line longer than {self.max_line_bytes} bytes.")
+                    index += 1
+                    continue
+
+                if not line.strip():
+                    continue
+
+                try:
+                    yield index, json.loads(line)
+                except ValueError:
+                    yield index, ImportItemError("Invalid JSON.")
+
+                index += 1
+            return
+
+        body: bytearray = bytearray()
+
+        async for chunk in chunks:
+            body += chunk
+
+            # stop reading as soon as we know, the rest of the body is never buffered.
+            if len(body) > self.max_body_bytes:
+                raise ImportBodyTooLargeError(f"A JSON array body can't be over {self.max_body_bytes} bytes, send NDJSON instead.")
+
+        try:
+            items: Any = json.loads(body)
+        except ValueError:
+            raise InvalidImportBodyError("Body must be a JSON array.")
+
+        if not isinstance(items, list):
+            raise InvalidImportBodyError("Body must be a JSON array.")
+
+        for index, item in enumerate(items):
+            yield index, item
+
+    async def import_jobs(
+        self,
+        items: AsyncIterator[Tuple[int, Any]],
+        insert_batch: Callable[[List[JobCreate]], Awaitable[List[Union[int, str]]]]
+    ) -> JobBulkCreateResult:
+        """
+        :param items: (index, raw item) pairs, see iter_items().
+        :param insert_batch: inserts valid jobs, returns an id or an error message per job (JobService.create_new_jobs).
+        """
+        result: JobBulkCreateResult = JobBulkCreateResult(created=0, ids=list(), errors=list())
+        batch: List[Tuple[int, JobCreate]] = list()
+
+        async for index, raw_item in items:
+            if index >= self.max_items:
+                result.truncated = True
+                break
+
+            if isinstance(raw_item, ImportItemError):
+                result.errors.append(JobBulkCreateError(index=index, detail=raw_item.detail))
+                continue
+
+            try:
+                batch.append((index, JobCreate.model_validate(raw_item)))
+            except ValidationError as error:
+                result.errors.append(JobBulkCreateError(index=index, detail=self._validation_detail(error)))
+                continue
+
+            if len(batch) >= self.batch_size:
+                await self._flush(batch, insert_batch, result)
+                batch = list()
+
+        await self._flush(batch, insert_batch, result)
+
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
+    async def _flush(
+        self,
+        batch: List[Tuple[int, JobCreate]],
+        insert_batch: Callable[[List[JobCreate]], Awaitable[List[Union[int, str]]]],
+        result: JobBulkCreateResult
+    ):
+        if not batch:
+            return
+
+        outcomes: List[Union[int, str]] = await insert_batch([job for _, job in batch])
+
+        for (index, _), outcome in zip(batch, outcomes):
+            if isinstance(outcome, int):
+                result.ids.append(outcome)
+                result.created += 1
+            else:
+                result.errors.append(JobBulkCreateError(index=index, detail=outcome))
+
+    async def _iter_lines(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[bytes]]:
+        """
+        The lines of the body. A line over max_line_bytes is yielded as None, once, and the rest of it is skipped:
+        at most one line (plus a chunk) is ever buffered.
+        """
+        buffer: bytes = b""
+        skipping: bool = False
+
+        async for chunk in chunks:
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+
+            for line in lines:
+                if skipping:
+                    # the end of the too long line.
+                    skipping = False
+                    continue
+
+                yield line if len(line) <= self.max_line_bytes else None
+
+            if len(buffer) > self.max_line_bytes:
+                if not skipping:
+                    yield None
+
+                skipping = True
+                buffer = b""
+
+        if buffer and not skipping:
+            yield buffer if len(buffer) <= self.max_line_bytes else None
+
+    def _validation_detail(self, error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(location) for location in item['loc']) or 'item'}: {item['msg']}" for item in error.errors()
+        )
+
+
+job_import_service: JobImportService = JobImportService(
+    batch_size=config_object.JOBS_BULK_BATCH_SIZE,
+    max_items=config_object.JOBS_BULK_MAX_ITEMS,
+    max_body_bytes=config_object.JOBS_BULK_MAX_BODY_BYTES,
+    max_line_bytes=config_object.JOBS_BULK_MAX_LINE_BYTES
+)
@@ -1,16 +1,51 @@
-from typing import Optional
+from datetime import date
+from typing import AsyncIterator, Iterator, Optional, Tuple, Union
 
+from sqlalchemy import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from api_models.job import JobCreate, UpdateJob
-from database.daos.job_dao import JobDao, job_dao
+from api_models.job import JobCreate, JobFilters, UpdateJob
+from api_models.job_serializer import JobSerializer, job_serializer
+from api_models.token import TokenPrincipal
+from database.daos.job_dao import JobDao, JobMutationStatus, job_dao
 from database.orm_models.job import Job
-from database.orm_models.user import User
+from services.conditional_request_service import ConditionalRequestService, JobValidator, conditional_request_service
+from services.cursor_service import CursorService, cursor_service
+from services.job_event_service import JobEventService, job_event_service
+from services.job_stats_service import facet_buckets
+from services.job_cache_service import JobCacheService, job_cache_service
+from services.job_suggest_service import JobSuggestService, job_suggest_service
+from services.saved_search_service import SavedSearchService, saved_search_service
 
 
 class JobService:
-    def __init__(self, job_dao_param: JobDao):
+    def __init__(
+        self,
+        job_dao_param: JobDao,
+        cursor_service_param: CursorService,
+        job_cache_service_param: JobCacheService,
+        job_serializer_param: JobSerializer,
+        conditional_request_service_param: ConditionalRequestService,
+        job_suggest_service_param: JobSuggestService,
+        saved_search_service_param: SavedSearchService,
+        job_event_service_param: JobEventService
+    ):
         self.job_dao = job_dao_param
+        self.cursor_service = cursor_service_param
+        self.job_cache_service = job_cache_service_param
+        self.job_serializer = job_serializer_param
+        self.conditional_request_service = conditional_request_service_param
+
+        # The typeahead index is in memory, every write below has to tell it (see services/job_suggest_service.py).
+        self.job_suggest_service = job_suggest_service_param
+
+        # New jobs are queued to be matched against the users' saved searches (see services/saved_search_service.py).
+        self.saved_search_service = saved_search_service_param
+
+        # Every committed write is also pushed to the /jobs/stream change feed (see services/job_event_service.py).
+        self.job_event_service = job_event_service_param
 
     def create_new_job(self, job: JobCreate, owner_id: int, session: Session) -> Optional[Job]:
         job: Job = self.job_dao.create_new_job(job, owner_id, session)
@@ -18,8 +53,50 @@ class JobService:
         if not job:
             return None
 
+        self.job_suggest_service.add_job(job)
+        self.job_event_service.publish_created(job.id, job)
+        self.saved_search_service.match_new_jobs([(job.id, job)])
+
         return job
 
+    def create_new_jobs(self, jobs: list[JobCreate], owner_id: int, session: Session) -> list[Union[int, str]]:
+        """
+        Batch insert. Returns, for every job in order, the new id or an error message.
+        If the batch INSERT fails, the batch is retried one job at a time so only the bad rows are reported.
+        """
+        try:
+            results: list[Union[int, str]] = list(self.job_dao.create_new_jobs(jobs, owner_id, session))
+        except SQLAlchemyError:
+            session.rollback()
+            results = list()
+
+            for job in jobs:
+                try:
+                    results.extend(self.job_dao.create_new_jobs([job], owner_id, session))
+                except SQLAlchemyError:
+                    session.rollback()
+                    results.append("Job could not be inserted.")
+
+        created: list[Tuple[int, JobCreate]] = self._index_created(jobs, results)
+
+        self.job_event_service.publish_created_many(created)
+
+        self.saved_search_service.match_new_jobs(created)
+
+        return results
+
+    def _index_created(self, jobs: list[JobCreate], results: list[Union[int, str]]) -> list[Tuple[int, JobCreate]]:
+        """
+        Puts the inserted jobs into the typeahead index and returns them as (id, job).
+        """
+        # results line up with jobs, an int is the id of an inserted job, a str an error.
+        created: list[Tuple[int, JobCreate]] = [(result, job) for job, result in zip(jobs, results) if isinstance(result, int)]
+
+        for job_id, job in created:
+            self.job_suggest_service.index_job(job_id, job.title, job.company, job.location)
+
+        return created
+
     def retrieve_job(self, job_id: int, session: Session) -> Optional[Job]:
         job: Job = self.job_dao.retrieve_job(job_id, session)
 
@@ -28,6 +105,24 @@ class JobService:
 
         return job
 
+    def retrieve_job_validator(self, job_id: int, session: Session) -> Optional[JobValidator]:
+        """
+        ETag / Last-Modified of the job, from an index-only query. None if the job does not exist.
+        """
+        row: Optional[Row] = self.job_dao.retrieve_job_validator(job_id, session)
+        return self.conditional_request_service.job_validator(row) if row else None
+
+    def retrieve_job_json(self, job_id: int, validator: JobValidator, session: Session) -> Optional[bytes]:
+        """
+        The job as ShowJob JSON, served from the response cache when possible. None if the job does not exist.
+        :param validator: from retrieve_job_validator(), the cache entry is tied to its ETag.
+        """
+        def load() -> Optional[bytes]:
+            job: Optional[Job] = self.retrieve_job(job_id, session)
+            return self.job_serializer.show_job(job) if job else None
+
+        return self.job_cache_service.get_job(job_id, validator.etag, load)
+
     def list_jobs(self, session: Session) -> Optional[list[Job]]:
         jobs: list[Job] = self.job_dao.list_jobs(session)
 
@@ -36,22 +131,308 @@ class JobService:
 
         return jobs
 
+    def list_jobs_page(
+        self,
+        session: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> Tuple[list[Job], Optional[str]]:
+        """
+        Returns one page of active jobs (or the jobs matching `filters`) and the cursor for the next page (None when
+        this is the last page). Raises InvalidCursorError if the cursor can not be decoded.
+        :param fields: sparse fieldset (see JobSerializer.parse_fields), only those columns are loaded.
+        """
+        after = self.cursor_service.decode(cursor) if cursor else None
+
+        # Ask for one extra row, if it comes back we know there is another page.
+        jobs: list[Job] = self.job_dao.list_jobs(session, limit=limit + 1, after=after, fields=fields, filters=filters)
+
+        return self._to_page(jobs, limit)
+
+    def list_jobs_page_validator(
+        self,
+        session: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None,
+        facets_limit: Optional[int] = None
+    ) -> Tuple[Optional[JobValidator], Optional[dict]]:
+        """
+        ETag of one page, from the same keyset query as list_jobs_page() but index-only. None if the page is empty.
+        Raises InvalidCursorError if the cursor can not be decoded.
+        :param facets_limit: `facets=true` of list-jobs, also returns the company / location / date_posted buckets of
+                             every job matching `filters`, read in the same query. They change without the page changing,
+                             so they are in the ETag too.
+        """
+        after = self.cursor_service.decode(cursor) if cursor else None
+
+        if facets_limit is None:
+            rows: list[Row] = self.job_dao.list_jobs_validators(session, limit=limit + 1, after=after, filters=filters)
+            return self._page_validator(rows, limit, fields, filters), None
+
+        rows, facet_rows = self.job_dao.list_jobs_validators_and_facets(session, limit + 1, facets_limit, after, filters)
+        facets: dict = facet_buckets(facet_rows)
+
+        return self._page_validator(rows, limit, fields, filters, facets), facets
+
+    def _page_validator(
+        self,
+        rows: list[Row],
+        limit: int,
+        fields: Optional[Tuple[str, ...]],
+        filters: Optional[JobFilters],
+        facets: Optional[dict] = None
+    ) -> Optional[JobValidator]:
+        return self.conditional_request_service.page_validator(rows, limit, fields, filters, facets) if rows else None
+
+    def list_jobs_page_json(
+        self,
+        session: Session,
+        limit: int,
+        cursor: Optional[str],
+        validator: JobValidator,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None,
+        facets: Optional[dict] = None
+    ) -> Optional[bytes]:
+        """
+        One page as JobPage JSON, served from the response cache when possible. None if the page is empty.
+        :param validator: from list_jobs_page_validator() with the same `fields` and `filters`, `facets` being what
+                          it returned. The cache entry is tied to its ETag.
+        """
+        def load() -> Optional[bytes]:
+            jobs, next_cursor = self.list_jobs_page(session, limit, cursor, fields, filters)
+            return self.job_serializer.job_page(jobs, next_cursor, fields, facets) if jobs else None
+
+        return self.job_cache_service.get_list_page(validator.etag, load)
+
+    def stream_jobs(self, session: Session, batch_size: int, is_active: Optional[bool] = None) -> Iterator[list[Row]]:
+        return self.job_dao.stream_jobs(session, batch_size, is_active)
+
+    def search_jobs_page(
+        self,
+        session: Session,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[list[Job], Optional[str]]:
+        """
+        One page of ranked search results and the cursor for the next page. Raises InvalidCursorError on a bad cursor.
+        """
+        offset: int = self.cursor_service.decode_offset(cursor) if cursor else 0
+        jobs: list[Job] = self.job_dao.search_jobs(session, query, limit + 1, offset, is_active, date_from, date_to, fields)
+
+        return self._to_search_page(jobs, limit, offset)
+
+    def _to_search_page(self, jobs: list[Job], limit: int, offset: int) -> Tuple[list[Job], Optional[str]]:
+        if len(jobs) <= limit:
+            return jobs, None
+
+        return jobs[:limit], self.cursor_service.encode_offset(offset + limit)
+
+    def _to_page(self, jobs: list[Job], limit: int) -> Tuple[list[Job], Optional[str]]:
+        if len(jobs) <= limit:
+            return jobs, None
+
+        jobs = jobs[:limit]
+        last_job: Job = jobs[-1]
+        return jobs, self.cursor_service.encode(last_job.date_posted, last_job.id)
+
     def update_job_by_id(
         self,
         job_id: int,
         update_job: UpdateJob,
-        user: User,
+        user: TokenPrincipal,
         session: Session
-    ) -> Optional[Job]:
-        job: Job = self.job_dao.update_job_by_id(job_id, update_job, user, session)
+    ) -> Tuple[JobMutationStatus, Optional[Job]]:
+        """
+        Ownership (or superuser) is checked inside the UPDATE itself, no need to retrieve the job first.
+        """
+        mutation_status, updated_job = self.job_dao.update_job_by_id(job_id, update_job, user, session)
+
+        if updated_job is not None:
+            self.job_suggest_service.add_job(updated_job)
+            self.job_event_service.publish_updated(job_id, updated_job)
+
+        return mutation_status, updated_job
+
+    def delete_job_by_id(self, job_id: int, user: TokenPrincipal, session: Session) -> JobMutationStatus:
+        mutation_status: JobMutationStatus = self.job_dao.delete_job_by_id(job_id, user, session)
+
+        if mutation_status == JobMutationStatus.DONE:
+            self.job_suggest_service.remove_job(job_id)
+            self.job_event_service.publish_deleted(job_id)
+
+        return mutation_status
+
+    def suggest(self, prefix: str, limit: int, field: Optional[str] = None) -> list[dict]:
+        """
+        Typeahead over job titles, companies and locations, from memory only.
+        """
+        return self.job_suggest_service.suggest(prefix, limit, field)
+
+    def rebuild_suggest_index(self, session: Session, batch_size: int):
+        """
+        One streaming scan of the active jobs, at startup (main.py).
+        """
+        self.job_suggest_service.rebuild(self.job_dao.stream_suggest_terms(session, batch_size))
+
+    # ------- Async twins (config: DATABASE_ASYNC_MODE) ------- #
+
+    async def create_new_job_async(self, job: JobCreate, owner_id: int, session: AsyncSession) -> Optional[Job]:
+        job: Job = await self.job_dao.create_new_job_async(job, owner_id, session)
+
+        if not job:
+            return None
+
+        self.job_suggest_service.add_job(job)
+        await self.job_event_service.publish_created_async(job.id, job)
+        self.saved_search_service.match_new_jobs([(job.id, job)])
+
+        return job
+
+    async def create_new_jobs_async(self, jobs: list[JobCreate], owner_id: int, session: AsyncSession) -> list[Union[int, str]]:
+        try:
+            results: list[Union[int, str]] = list(await self.job_dao.create_new_jobs_async(jobs, owner_id, session))
+        except SQLAlchemyError:
+            await session.rollback()
+            results = list()
+
+            for job in jobs:
+                try:
+                    results.extend(await self.job_dao.create_new_jobs_async([job], owner_id, session))
+                except SQLAlchemyError:
+                    await session.rollback()
+                    results.append("Job could not be inserted.")
+
+        created: list[Tuple[int, JobCreate]] = self._index_created(jobs, results)
+
+        await self.job_event_service.publish_created_many_async(created)
+
+        self.saved_search_service.match_new_jobs(created)
+
+        return results
+
+    async def retrieve_job_async(self, job_id: int, session: AsyncSession) -> Optional[Job]:
+        job: Job = await self.job_dao.retrieve_job_async(job_id, session)
 
         if not job:
             return None
 
         return job
 
-    def delete_job_by_id(self, job_id: int, session: Session):
-        self.job_dao.delete_job_by_id(job_id, session)
+    async def retrieve_job_validator_async(self, job_id: int, session: AsyncSession) -> Optional[JobValidator]:
+        row: Optional[Row] = await self.job_dao.retrieve_job_validator_async(job_id, session)
+        return self.conditional_request_service.job_validator(row) if row else None
+
+    async def retrieve_job_json_async(self, job_id: int, validator: JobValidator, session: AsyncSession) -> Optional[bytes]:
+        async def load() -> Optional[bytes]:
+            job: Optional[Job] = await self.retrieve_job_async(job_id, session)
+            return self.job_serializer.show_job(job) if job else None
+
+        return await self.job_cache_service.get_job_async(job_id, validator.etag, load)
+
+    async def list_jobs_page_async(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None
+    ) -> Tuple[list[Job], Optional[str]]:
+        after = self.cursor_service.decode(cursor) if cursor else None
+        jobs: list[Job] = await self.job_dao.list_jobs_async(session, limit=limit + 1, after=after, fields=fields, filters=filters)
+
+        return self._to_page(jobs, limit)
+
+    async def list_jobs_page_validator_async(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None,
+        facets_limit: Optional[int] = None
+    ) -> Tuple[Optional[JobValidator], Optional[dict]]:
+        after = self.cursor_service.decode(cursor) if cursor else None
+
+        if facets_limit is None:
+            rows: list[Row] = await self.job_dao.list_jobs_validators_async(session, limit=limit + 1, after=after, filters=filters)
+            return self._page_validator(rows, limit, fields, filters), None
+
+        rows, facet_rows = await self.job_dao.list_jobs_validators_and_facets_async(session, limit + 1, facets_limit, after, filters)
+        facets: dict = facet_buckets(facet_rows)
+
+        return self._page_validator(rows, limit, fields, filters, facets), facets
+
+    async def list_jobs_page_json_async(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str],
+        validator: JobValidator,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[JobFilters] = None,
+        facets: Optional[dict] = None
+    ) -> Optional[bytes]:
+        async def load() -> Optional[bytes]:
+            jobs, next_cursor = await self.list_jobs_page_async(session, limit, cursor, fields, filters)
+            return self.job_serializer.job_page(jobs, next_cursor, fields, facets) if jobs else None
+
+        return await self.job_cache_service.get_list_page_async(validator.etag, load)
+
+    def stream_jobs_async(self, session: AsyncSession, batch_size: int, is_active: Optional[bool] = None) -> AsyncIterator[list[Row]]:
+        return self.job_dao.stream_jobs_async(session, batch_size, is_active)
+
+    async def search_jobs_page_async(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[list[Job], Optional[str]]:
+        offset: int = self.cursor_service.decode_offset(cursor) if cursor else 0
+        jobs: list[Job] = await self.job_dao.search_jobs_async(session, query, limit + 1, offset, is_active, date_from, date_to, fields)
+
+        return self._to_search_page(jobs, limit, offset)
+
+    async def update_job_by_id_async(
+        self,
+        job_id: int,
+        update_job: UpdateJob,
+        user: TokenPrincipal,
+        session: AsyncSession
+    ) -> Tuple[JobMutationStatus, Optional[Job]]:
+        mutation_status, updated_job = await self.job_dao.update_job_by_id_async(job_id, update_job, user, session)
+
+        if updated_job is not None:
+            self.job_suggest_service.add_job(updated_job)
+            await self.job_event_service.publish_updated_async(job_id, updated_job)
+
+        return mutation_status, updated_job
+
+    async def delete_job_by_id_async(self, job_id: int, user: TokenPrincipal, session: AsyncSession) -> JobMutationStatus:
+        mutation_status: JobMutationStatus = await self.job_dao.delete_job_by_id_async(job_id, user, session)
+
+        if mutation_status == JobMutationStatus.DONE:
+            self.job_suggest_service.remove_job(job_id)
+            await self.job_event_service.publish_deleted_async(job_id)
+
+        return mutation_status
 
 
-job_service: JobService = JobService(job_dao)
+job_service: JobService = JobService(
+    job_dao, cursor_service, job_cache_service, job_serializer, conditional_request_service, job_suggest_service, saved_search_service,
+    job_event_service
+)
@@ -0,0 +1,83 @@
+"""
+/jobs/stats: active jobs per company, per location and per posting date.
+
+Read from the `jobstat` counters that JobDao moves with every job write (database/daos/job_stat_dao.py), one small
+query however many jobs there are, instead of a GROUP BY over `job` per request.
+
+Reconciliation | reconcile() recounts from the jobs and fixes what drifted. main.py runs it at startup and then every
+JOB_STATS_RECONCILE_SECONDS, on every worker (the recount locks the counters, they take turns). `drifted` in stats()
+should stay at 0, anything else means some write moved jobs without their counters.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import config_object
+from database.daos.job_stat_dao import JOB_STAT_FACETS, JobStatDao, job_stat_dao
+
+
+def facet_buckets(rows: List[Row]) -> Dict[str, List[dict]]:
+    """
+    :param rows: (facet, value, count) grouped by facet, most jobs first (job_stat_dao.top_per_facet_statement).
+    :return: {"company": [{"value", "count"}, ...], "location": [...], "date_posted": [...]}, the JobStats shape.
+             Also the `facets` of list-jobs.
+    """
+    buckets: Dict[str, List[dict]] = {facet: list() for facet in JOB_STAT_FACETS}
+
+    for row in rows:
+        buckets[row.facet].append({"value": row.value, "count": row.count})
+
+    return buckets
+
+
+class JobStatsService:
+    def __init__(self, job_stat_dao_param: JobStatDao, reconcile_seconds: float = 3600.0):
+        self.job_stat_dao = job_stat_dao_param
+        self.reconcile_seconds = reconcile_seconds
+
+        self.reconciliations: int = 0
+        self.drifted: int = 0              # counters fixed by the last reconciliation
+        self.drifted_total: int = 0
+        self.reconciled_at: Optional[datetime] = None
+        self.reconcile_seconds_taken: float = 0.0
+
+    def job_stats(self, limit: int, session: Session) -> Dict[str, List[dict]]:
+        """
+        At most `limit` values per facet, most jobs first, see facet_buckets().
+        """
+        return facet_buckets(self.job_stat_dao.list_job_stats(limit, session))
+
+    def reconcile(self, session: Session) -> int:
+        started: float = time.perf_counter()
+        drifted: int = self.job_stat_dao.reconcile(session)
+
+        self.reconciliations += 1
+        self.drifted = drifted
+        self.drifted_total += drifted
+        self.reconciled_at = datetime.utcnow()
+        self.reconcile_seconds_taken = time.perf_counter() - started
+
+        return drifted
+
+    def stats(self) -> dict:
+        return {
+            "reconcile_seconds": self.reconcile_seconds,
+            "reconciliations": self.reconciliations,
+            "drifted": self.drifted,
+            "drifted_total": self.drifted_total,
+            "reconciled_at": self.reconciled_at.isoformat() if self.reconciled_at else None,
+            "reconcile_seconds_taken": round(self.reconcile_seconds_taken, 3),
+        }
+
+    # ------- Async twins (config: DATABASE_ASYNC_MODE) ------- #
+
+    async def job_stats_async(self, limit: int, session: AsyncSession) -> Dict[str, List[dict]]:
+        return facet_buckets(await self.job_stat_dao.list_job_stats_async(limit, session))
+
+
+job_stats_service: JobStatsService = JobStatsService(job_stat_dao, reconcile_seconds=config_object.JOB_STATS_RECONCILE_SECONDS)
@@ -0,0 +1,225 @@
+"""
+Typeahead for the search box: GET /jobs/suggest?prefix=pyth -> "Python Developer", "Python Engineer", ...
+
+Answered from memory, never from the database: the search box sends a request per keystroke.
+
+The index, per field (title, company, location):
+- counts  | how many active jobs have each value, values are compared case / space insensitive ("key").
+- entries | one sorted array of (suffix, field, key), a suffix per word of the value, so "pyth" finds
+            "Senior Python Developer" too. A prefix is a range of that array, found with two binary searches.
+- Results are the matching values with the most jobs first.
+
+One or two letter prefixes match a big part of the array, their top results (for up to JOB_SUGGEST_LIMIT_MAX) are
+kept in `_top_cache` until a value starting with that prefix changes, so every keystroke stays well under a millisecond.
+
+Kept up to date:
+- built once at startup (main.py lifespan) from a single streaming scan of the active jobs (JobDao.stream_suggest_terms),
+- then JobService tells it about every create / update / delete. It remembers the values it indexed per job, so an
+  update or delete can take the old ones out without reading the job again.
+Each worker has its own index and only sees the writes it served itself until it restarts, fine for suggestions.
+"""
+
+import bisect
+import heapq
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import config_object
+
+SUGGEST_FIELDS: Tuple[str, ...] = ("title", "company", "location")
+
+# Prefixes this short have their results cached, longer ones match few entries and are computed every time.
+CACHED_PREFIX_LENGTH: int = 2
+
+# Sorts after every character, (prefix + this) is the end of the range of entries starting with prefix.
+_MAX_CHARACTER: str = "\U0010ffff"
+
+
+def normalize(value: Optional[str]) -> str:
+    return " ".join(value.casefold().split()) if value else ""
+
+
+class JobSuggestService:
+    def __init__(self, enabled: bool = True, max_limit: int = 50):
+        self.enabled = enabled
+        self.max_limit = max_limit
+
+        self._counts: Dict[Tuple[str, str], int] = dict()       # (field, key) -> active jobs with that value
+        self._display: Dict[Tuple[str, str], str] = dict()      # (field, key) -> the value as first written
+        self._entries: List[Tuple[str, str, str]] = list()      # sorted (suffix, field, key)
+        self._jobs: Dict[int, Tuple[Optional[str], ...]] = dict()  # job id -> the values indexed for it
+        self._top_cache: Dict[Tuple[str, Optional[str]], List[dict]] = dict()
+
+        self.built: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    # ------- Building ------- #
+
+    def rebuild(self, batches: Iterable[Iterable[Any]]):
+        """
+        :param batches: batches of rows with id, title, company, location (JobDao.stream_suggest_terms), active jobs only.
+        The new index is built on the side and swapped in, suggestions keep working meanwhile.
+        """
+        fresh: JobSuggestService = JobSuggestService(self.enabled, self.max_limit)
+
+        for batch in batches:
+            for row in batch:
+                fresh._add(row.id, tuple(getattr(row, field) for field in SUGGEST_FIELDS))
+
+        # one sort at the end instead of an insort per new value.
+        fresh._entries.sort()
+
+        with self._lock:
+            self._counts, self._display, self._entries, self._jobs = fresh._counts, fresh._display, fresh._entries, fresh._jobs
+            self._top_cache = dict()
+            self.built = True
+
+    def clear(self):
+        with self._lock:
+            self._counts, self._display, self._entries, self._jobs, self._top_cache = dict(), dict(), list(), dict(), dict()
+            self.built = False
+
+    # ------- Updates (JobService) ------- #
+
+    def add_job(self, job: Any):
+        """
+        :param job: a Job that was just created / updated. Replaces what was indexed for it before.
+        """
+        self.index_job(job.id, job.title, job.company, job.location, job.is_active)
+
+    def index_job(
+        self,
+        job_id: int,
+        title: Optional[str],
+        company: Optional[str],
+        location: Optional[str],
+        is_active: Optional[bool] = True
+    ):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._remove(job_id)
+
+            # lists only show active jobs, an inactive one should not be suggested either.
+            if is_active is not False:
+                self._add(job_id, (title, company, location), keep_sorted=True)
+
+    def remove_job(self, job_id: int):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._remove(job_id)
+
+    # ------- Reading ------- #
+
+    def suggest(self, prefix: str, limit: int, field: Optional[str] = None) -> List[dict]:
+        """
+        :param field: only suggest from this field, None for all of SUGGEST_FIELDS.
+        :return: up to `limit` of {"field", "value", "count"}, most jobs first.
+        """
+        key_prefix: str = normalize(prefix)
+        limit = min(limit, self.max_limit)
+
+        if not key_prefix or not self.enabled:
+            return list()
+
+        with self._lock:
+            if len(key_prefix) <= CACHED_PREFIX_LENGTH:
+                cached: Optional[List[dict]] = self._top_cache.get((key_prefix, field))
+
+                if cached is None:
+                    cached = self._top(key_prefix, field, self.max_limit)
+                    self._top_cache[(key_prefix, field)] = cached
+
+                return cached[:limit]
+
+            return self._top(key_prefix, field, limit)
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "built": self.built, "jobs": len(self._jobs), "values": len(self._counts)}
+
+    # ------- Internals, called with the lock held ------- #
+
+    def _top(self, key_prefix: str, field: Optional[str], limit: int) -> List[dict]:
+        start: int = bisect.bisect_left(self._entries, (key_prefix,))
+        end: int = bisect.bisect_left(self._entries, (key_prefix + _MAX_CHARACTER,), lo=start)
+
+        # a value can match through several of its words, count it once.
+        matches: set = {(entry_field, key) for _, entry_field, key in self._entries[start:end] if field in (None, entry_field)}
+        counts: Dict[Tuple[str, str], int] = self._counts
+        best: List[Tuple[int, str, str]] = heapq.nsmallest(limit, [(-counts[match], match[1], match[0]) for match in matches])
+
+        return [{"field": entry_field, "value": self._display[(entry_field, key)], "count": -count} for count, key, entry_field in best]
+
+    def _add(self, job_id: int, values: Tuple[Optional[str], ...], keep_sorted: bool = False):
+        self._jobs[job_id] = values
+
+        for field, value in zip(SUGGEST_FIELDS, values):
+            key: str = normalize(value)
+
+            if not key:
+                continue
+
+            count: int = self._counts.get((field, key), 0)
+            self._counts[(field, key)] = count + 1
+
+            if count == 0:
+                self._display[(field, key)] = value.strip()
+
+                for suffix in self._suffixes(key):
+                    if keep_sorted:
+                        bisect.insort(self._entries, (suffix, field, key))
+                    else:
+                        self._entries.append((suffix, field, key))
+
+            self._forget_cached(field, key)
+
+    def _remove(self, job_id: int):
+        values: Optional[Tuple[Optional[str], ...]] = self._jobs.pop(job_id, None)
+
+        if values is None:
+            return
+
+        for field, value in zip(SUGGEST_FIELDS, values):
+            key: str = normalize(value)
+
+            if not key:
+                continue
+
+            count: int = self._counts.get((field, key), 0) - 1
+
+            if count > 0:
+                self._counts[(field, key)] = count
+            else:
+                self._counts.pop((field, key), None)
+                self._display.pop((field, key), None)
+
+                for suffix in self._suffixes(key):
+                    index: int = bisect.bisect_left(self._entries, (suffix, field, key))
+
+                    if index < len(self._entries) and self._entries[index] == (suffix, field, key):
+                        del self._entries[index]
+
+            self._forget_cached(field, key)
+
+    def _suffixes(self, key: str) -> List[str]:
+        # "senior python developer" -> itself, "python developer", "developer"
+        words: List[str] = key.split(" ")
+        return [" ".join(words[index:]) for index in range(len(words))]
+
+    def _forget_cached(self, field: str, key: str):
+        if not self._top_cache:
+            return
+
+        for suffix in self._suffixes(key):
+            for length in range(1, CACHED_PREFIX_LENGTH + 1):
+                self._top_cache.pop((suffix[:length], field), None)
+                self._top_cache.pop((suffix[:length], None), None)
+
+
+job_suggest_service: JobSuggestService = JobSuggestService(
+    enabled=config_object.JOB_SUGGEST_ENABLED,
+    max_limit=config_object.JOB_SUGGEST_LIMIT_MAX
+)
@@ -0,0 +1,122 @@
+"""
+A small thread-safe LRU cache where every entry also has an expiry time.
+
+- LRU (least recently used): when the cache is full, the entry nobody has asked for in the longest time is dropped.
+- TTL (time to live): an entry is never returned after its `expires_at`, even if the cache is not full.
+
+OrderedDict keeps the order of use for us, `move_to_end()` marks an entry as the most recently used.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class TTLLRUCache:
+    def __init__(
+        self,
+        max_size: int,
+        default_ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        :param max_size: max number of entries, the least recently used one is evicted past this.
+        :param default_ttl: seconds an entry lives when `set()` is not given a ttl / expires_at. None means forever.
+        :param on_evict: called with (key, value) whenever an entry leaves the cache (eviction, expiry or delete).
+        :param clock: returns the current time in seconds, swappable for tests.
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.on_evict = on_evict
+        self.clock = clock
+
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+
+            if expires_at is not None and expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                self._notify(key, value)
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        """
+        :param ttl: seconds from now. Falls back to `default_ttl`.
+        :param expires_at: absolute time. If both are given, whichever comes first wins.
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+
+        deadlines: list = [deadline for deadline in (expires_at, self.clock() + ttl if ttl is not None else None) if deadline is not None]
+        entry_expires_at: Optional[float] = min(deadlines) if deadlines else None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (value, entry_expires_at)
+
+            while len(self._entries) > self.max_size:
+                evicted_key, (evicted_value, _) = self._entries.popitem(last=False)
+                self.evictions += 1
+                self._notify(evicted_key, evicted_value)
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+            if entry is None:
+                return False
+
+            self._notify(key, entry[0])
+            return True
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+
+            for key, (value, _) in entries:
+                self._notify(key, value)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _notify(self, key: Hashable, value: Any):
+        # called with the lock held, keep callbacks cheap and never call back into the cache.
+        if self.on_evict is not None:
+            self.on_evict(key, value)
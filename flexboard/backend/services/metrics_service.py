@@ -0,0 +1,202 @@
+"""
+A small in-process metrics registry that renders the Prometheus text format (served by GET /metrics).
+
+We only need counters, gauges and histograms with labels, so this is written by hand instead of pulling in
+prometheus_client. Every metric is thread safe (sync routes run on the threadpool).
+
+- Counter   | only goes up, ex. requests served.
+- Gauge     | goes up and down, ex. requests in flight.
+- Histogram | counts observations into buckets, ex. request latency. Prometheus computes p50 / p95 / p99 from the buckets.
+
+Collectors are callables that return extra lines at scrape time, used for numbers that already live somewhere else
+(DB pool, token cache, job cache), so they are read once per scrape instead of being updated on every request.
+"""
+
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Prometheus' default latency buckets, in seconds.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs: List[str] = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    metric_type: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._lock: threading.Lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}", *self._samples()]
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = dict()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values: List = list(self._values.items())
+
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in values]
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+
+        # labels -> [count per bucket (last one is +Inf), sum]. Counts are per bucket, made cumulative when rendered.
+        self._values: Dict[Tuple[str, ...], list] = dict()
+
+    def observe(self, value: float, *label_values: str):
+        index: int = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series: Optional[list] = self._values.get(label_values)
+
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0]
+                self._values[label_values] = series
+
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *label_values: str) -> int:
+        series: Optional[list] = self._values.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values: List = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+
+        lines: List[str] = list()
+
+        for labels, counts, total in values:
+            cumulative: int = 0
+
+            for upper_bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le: str = "+Inf" if upper_bound == float("inf") else _format_value(upper_bound)
+                bucket_labels: str = _format_labels(self.label_names, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = dict()
+        self._collectors: List[Callable[[], Iterable[str]]] = list()
+        self._lock: threading.Lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, label_names)
+
+    def gauge(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, label_names)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, label_names, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]):
+        """
+        :param collector: returns ready-made exposition lines (with their # HELP / # TYPE), called on every scrape.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = list()
+
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+
+        for collector in self._collectors:
+            lines.extend(collector())
+
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, label_names: Tuple[str, ...], **kwargs):
+        # Same name -> same metric, so modules (and tests) can ask for a metric without caring who created it.
+        with self._lock:
+            metric: Optional[Metric] = self._metrics.get(name)
+
+            if metric is None:
+                metric = metric_class(name, documentation, label_names, **kwargs)
+                self._metrics[name] = metric
+
+            return metric
+
+
+def metric_lines(name: str, documentation: str, samples: Iterable[Tuple[dict, float]], metric_type: str = "gauge") -> List[str]:
+    """
+    Exposition lines for a collector. :param samples: (labels dict, value) pairs.
+    """
+    lines: List[str] = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+
+    return lines
+
+
+metrics_registry: MetricsRegistry = MetricsRegistry()
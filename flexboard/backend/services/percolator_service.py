@@ -0,0 +1,157 @@
+"""
+Saved search matching, "percolator" style: a new job is run against the saved searches, instead of every saved
+search being run against the jobs table (Elasticsearch calls this a percolate query).
+
+Terms | what a saved search asks for, ALL of them must be in the job:
+- ("keyword", word)  | the word is anywhere in the job: title, company, location or description.
+- ("location", word) | the word is in the job's location.
+- ("company", word)  | the word is in the job's company.
+Words are casefolded \\w+ runs, so "Python," and "python" are the same word.
+
+Inverted index | each saved search is filed under ONE of its terms, its anchor. Matching a job:
+1. the job's terms, a set,
+2. candidates | the saved searches filed under any of those terms, one dict lookup per job term,
+3. a candidate matches if all of its terms are in the job's set (frozenset <=, runs in C).
+A job only ever looks at the saved searches whose anchor it contains, never at all of them.
+
+The anchor should be a rare term, few jobs contain it, so few candidates fail step 3. Without statistics we guess:
+company words first (few jobs share a company), then keywords, then location words (lots of jobs are "Remote"),
+and the longest word of that field, long words tend to be rarer.
+
+Kept in sync by services/saved_search_service.py, which also owns the database side.
+"""
+
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from config import config_object
+
+Term = Tuple[str, str]
+
+# Anchor preference, the first field with a word wins.
+ANCHOR_FIELDS: Tuple[str, ...] = ("company", "keyword", "location")
+
+_WORD: re.Pattern = re.compile(r"\w+")
+
+
+def words(*texts: Optional[str]) -> Set[str]:
+    found: Set[str] = set()
+
+    for text in texts:
+        if text:
+            found.update(_WORD.findall(text.casefold()))
+
+    return found
+
+
+def saved_search_terms(keywords: Optional[str], location: Optional[str], company: Optional[str]) -> FrozenSet[Term]:
+    return frozenset(
+        [("keyword", word) for word in words(keywords)]
+        + [("location", word) for word in words(location)]
+        + [("company", word) for word in words(company)]
+    )
+
+
+def job_terms(title: Optional[str], company: Optional[str], location: Optional[str], description: Optional[str]) -> Set[Term]:
+    terms: Set[Term] = {("keyword", word) for word in words(title, company, location, description)}
+    terms.update(("location", word) for word in words(location))
+    terms.update(("company", word) for word in words(company))
+    return terms
+
+
+class PercolatorService:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+
+        self._postings: Dict[Term, Dict[int, FrozenSet[Term]]] = dict()  # anchor -> {saved search id -> its terms}
+        self._anchors: Dict[int, Term] = dict()                            # saved search id -> its anchor
+
+        # Highest saved search id read from the database so far, the next sync reads the ones after it.
+        self.synced_id: int = 0
+        self.synced_at: float = 0.0
+
+        self._lock: threading.Lock = threading.Lock()
+
+    def add(self, saved_search_id: int, keywords: Optional[str], location: Optional[str], company: Optional[str]):
+        """
+        Files (or files again) one saved search. Doesn't move `synced_id`, lower ids may still be on their way.
+        """
+        terms: FrozenSet[Term] = saved_search_terms(keywords, location, company)
+
+        with self._lock:
+            self._remove(saved_search_id)
+
+            if terms:
+                anchor: Term = self._anchor(terms)
+                self._postings.setdefault(anchor, dict())[saved_search_id] = terms
+                self._anchors[saved_search_id] = anchor
+
+    def add_synced(self, rows: Iterable, synced_at: float):
+        """
+        :param rows: (id, keywords, location, company) in id order, read after `synced_id` (SavedSearchDao.saved_searches_after).
+        """
+        for row in rows:
+            self.add(row.id, row.keywords, row.location, row.company)
+
+            with self._lock:
+                self.synced_id = max(self.synced_id, row.id)
+
+        self.synced_at = synced_at
+
+    def remove(self, saved_search_id: int):
+        with self._lock:
+            self._remove(saved_search_id)
+
+    def clear(self):
+        with self._lock:
+            self._postings, self._anchors = dict(), dict()
+            self.synced_id, self.synced_at = 0, 0.0
+
+    def percolate(
+        self,
+        title: Optional[str],
+        company: Optional[str],
+        location: Optional[str],
+        description: Optional[str]
+    ) -> List[int]:
+        """
+        :return: ids of the saved searches this job matches.
+        """
+        if not self.enabled:
+            return list()
+
+        terms: Set[Term] = job_terms(title, company, location, description)
+        matches: List[int] = list()
+
+        with self._lock:
+            for term in terms:
+                filed: Optional[Dict[int, FrozenSet[Term]]] = self._postings.get(term)
+
+                if filed:
+                    matches.extend(saved_search_id for saved_search_id, wanted in filed.items() if wanted <= terms)
+
+        return matches
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "saved_searches": len(self._anchors), "anchors": len(self._postings), "synced_id": self.synced_id}
+
+    # ------- Internals, called with the lock held ------- #
+
+    def _anchor(self, terms: FrozenSet[Term]) -> Term:
+        return min(terms, key=lambda term: (ANCHOR_FIELDS.index(term[0]), -len(term[1]), term[1]))
+
+    def _remove(self, saved_search_id: int):
+        anchor: Optional[Term] = self._anchors.pop(saved_search_id, None)
+
+        if anchor is None:
+            return
+
+        filed: Dict[int, FrozenSet[Term]] = self._postings[anchor]
+        filed.pop(saved_search_id, None)
+
+        if not filed:
+            del self._postings[anchor]
+
+
+percolator_service: PercolatorService = PercolatorService(enabled=config_object.SAVED_SEARCHES_ENABLED)
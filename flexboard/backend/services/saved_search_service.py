@@ -0,0 +1,253 @@
+"""
+Saved searches: users register a query (keywords, location, company) and every new job matching it is recorded in
+`savedsearchmatch`, which they fetch with /saved-searches/list-matches instead of polling list-jobs.
+
+Matching is off the request path. Creating a job (JobService.create_new_job / create_new_jobs and their async twins)
+only queues it, in memory. The matcher thread of this worker (start(), from main.py's lifespan) then takes everything
+queued and:
+1. catch up | reads the saved searches created through OTHER workers, at most once per SAVED_SEARCHES_SYNC_SECONDS:
+              the ones with an id above the highest we know, and again the ones created in the last
+              SAVED_SEARCHES_SYNC_WINDOW_SECONDS. Ids are handed out before commit, so a saved search can become
+              visible after a higher id already was; the trailing window still picks it up.
+2. percolate | the jobs against the in-memory inverted index of services/percolator_service.py, no database.
+3. record | the matches of the whole batch, one INSERT ... SELECT per match in one executemany, only when there is one.
+Saved searches created / deleted through this worker go into the index right away.
+
+Matches show up a moment after the job. They are best effort: the job is committed before it is matched, so a failed
+match (or a worker stopped with jobs still queued past SAVED_SEARCHES_PENDING_MAX) is logged, never a failed create.
+A saved search deleted through another worker stays in this worker's index until it restarts, its matches are
+simply not inserted (the INSERT ... SELECT finds no saved search).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from api_models.saved_search import SavedSearchCreate
+from config import config_object
+from database.daos.saved_search_dao import SavedSearchDao, saved_search_dao
+from database.orm_models.saved_search import SavedSearch
+from services.cursor_service import CursorService, cursor_service
+from services.percolator_service import PercolatorService, percolator_service
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class SavedSearchLimitError(ValueError):
+    pass
+
+
+class SavedSearchService:
+    def __init__(
+        self,
+        saved_search_dao_param: SavedSearchDao,
+        percolator_service_param: PercolatorService,
+        cursor_service_param: CursorService,
+        max_per_user: int = 100,
+        sync_seconds: float = 1.0,
+        sync_window_seconds: float = 60.0,
+        sync_batch_size: int = 5000,
+        max_pending: int = 10000
+    ):
+        self.saved_search_dao = saved_search_dao_param
+        self.percolator_service = percolator_service_param
+        self.cursor_service = cursor_service_param
+        self.max_per_user = max_per_user
+        self.sync_seconds = sync_seconds
+        self.sync_window_seconds = sync_window_seconds
+        self.sync_batch_size = sync_batch_size
+
+        # (job id, title, company, location, description) of the jobs waiting for the matcher thread. Past max_pending
+        # the deque drops the oldest one itself. Request threads fill it while the matcher drains it, _lock guards both
+        # and the `dropped` counter.
+        self._pending: Deque[Tuple[int, Any, Any, Any, Any]] = deque(maxlen=max_pending)
+        self.max_pending = max_pending
+        self.dropped: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._wake: threading.Event = threading.Event()
+        self._stopping: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def create_saved_search(self, saved_search: SavedSearchCreate, owner_id: int, session: Session) -> SavedSearch:
+        """
+        Raises SavedSearchLimitError when the user already has SAVED_SEARCHES_MAX_PER_USER of them.
+        """
+        if self.saved_search_dao.count_saved_searches(owner_id, session) >= self.max_per_user:
+            raise SavedSearchLimitError(f"A user can have at most {self.max_per_user} saved searches.")
+
+        created: SavedSearch = self.saved_search_dao.create_saved_search(saved_search, owner_id, session)
+        self.percolator_service.add(created.id, created.keywords, created.location, created.company)
+
+        return created
+
+    def list_saved_searches(self, owner_id: int, session: Session) -> list[SavedSearch]:
+        return self.saved_search_dao.list_saved_searches(owner_id, session)
+
+    def delete_saved_search(self, saved_search_id: int, owner_id: int, session: Session) -> bool:
+        deleted: bool = self.saved_search_dao.delete_saved_search(saved_search_id, owner_id, session)
+
+        if deleted:
+            self.percolator_service.remove(saved_search_id)
+
+        return deleted
+
+    def list_matches_page(self, owner_id: int, session: Session, limit: int, cursor: Optional[str] = None) -> Tuple[list[Row], Optional[str]]:
+        """
+        Raises InvalidCursorError if the cursor can not be decoded.
+        """
+        before: Optional[int] = self.cursor_service.decode_id(cursor) if cursor else None
+
+        # one extra row tells us if there is a next page, like JobService.list_jobs_page.
+        matches: list[Row] = self.saved_search_dao.list_matches(owner_id, limit + 1, before, session)
+
+        if len(matches) <= limit:
+            return matches, None
+
+        matches = matches[:limit]
+        return matches, self.cursor_service.encode_id(matches[-1].id)
+
+    # ------- Matching new jobs (JobService) ------- #
+
+    def match_new_jobs(self, jobs: Iterable[Tuple[int, Any]]):
+        """
+        Queues the jobs just created for the matcher thread, no database work. Safe from any thread or the event loop.
+        :param jobs: (id, job) of the jobs just created, job being a Job or JobCreate (title, company, location, description).
+        """
+        if not self.percolator_service.enabled:
+            return
+
+        with self._lock:
+            for job_id, job in jobs:
+                if len(self._pending) == self.max_pending:
+                    # the matcher is far behind (ex. the database is down), the oldest job waiting gives way.
+                    self.dropped += 1
+
+                self._pending.append((job_id, job.title, job.company, job.location, job.description))
+
+        self._wake.set()
+
+    def match_pending(self, session: Session) -> int:
+        """
+        Matches every queued job: catch-up sync (when due), percolate, record. Run by the matcher thread, or directly
+        (tests). Returns how many matches were recorded.
+        """
+        with self._lock:
+            jobs: List[Tuple[int, Any, Any, Any, Any]] = list(self._pending)
+            self._pending.clear()
+
+        if not jobs:
+            return 0
+
+        try:
+            self.sync(session)
+            matches: List[Tuple[int, int]] = self._percolate(jobs)
+            self.saved_search_dao.record_matches(matches, session)
+        except SQLAlchemyError:
+            session.rollback()
+            logger.exception("Could not record saved search matches of %d jobs.", len(jobs))
+            return 0
+
+        return len(matches)
+
+    def sync(self, session: Session, force: bool = False):
+        """
+        Reads the saved searches created since the last sync, and the ones created in the trailing window again.
+        At startup (force) this loads all of them.
+        """
+        if not force and time.monotonic() - self.percolator_service.synced_at < self.sync_seconds:
+            return
+
+        after: int = self.percolator_service.synced_id
+
+        if not force:
+            # a saved search of the window with an id below the highest we know may have committed since the last sync.
+            since: datetime = datetime.utcnow() - timedelta(seconds=self.sync_window_seconds)
+            first_recent_id: Optional[int] = self.saved_search_dao.first_saved_search_id_since(since, session)
+
+            if first_recent_id is not None:
+                after = min(after, first_recent_id - 1)
+
+        while True:
+            rows: list[Row] = self.saved_search_dao.saved_searches_after(after, self.sync_batch_size, session)
+            self.percolator_service.add_synced(rows, time.monotonic())
+
+            if len(rows) < self.sync_batch_size:
+                return
+
+            after = rows[-1].id
+
+    def start(self, session_factory: Callable[[], Session]):
+        """
+        Starts the matcher thread of this worker (main.py's lifespan). Each batch of jobs runs on its own session.
+        """
+        if not self.percolator_service.enabled or self._thread is not None:
+            return
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._match_forever, args=(session_factory,), name="saved-search-matcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Matches what is still queued, then stops the matcher thread.
+        """
+        if self._thread is None:
+            return
+
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+    def stats(self) -> dict:
+        return {**self.percolator_service.stats(), "pending": len(self._pending), "dropped": self.dropped}
+
+    def _match_forever(self, session_factory: Callable[[], Session]):
+        while not self._stopping.is_set() or self._pending:
+            self._wake.wait()
+            self._wake.clear()
+
+            if not self._pending:
+                continue
+
+            try:
+                with session_factory() as session:
+                    self.match_pending(session)
+            except Exception:
+                # ex. no connection to be had, the next jobs try again. When stopping there is no next time.
+                logger.exception("Saved search matcher failed.")
+
+                if self._stopping.is_set():
+                    with self._lock:
+                        self.dropped += len(self._pending)
+                        self._pending.clear()
+
+    def _percolate(self, jobs: Iterable[Tuple[int, Any, Any, Any, Any]]) -> List[Tuple[int, int]]:
+        return [
+            (saved_search_id, job_id)
+            for job_id, title, company, location, description in jobs
+            for saved_search_id in self.percolator_service.percolate(title, company, location, description)
+        ]
+
+
+saved_search_service: SavedSearchService = SavedSearchService(
+    saved_search_dao,
+    percolator_service,
+    cursor_service,
+    max_per_user=config_object.SAVED_SEARCHES_MAX_PER_USER,
+    sync_seconds=config_object.SAVED_SEARCHES_SYNC_SECONDS,
+    sync_window_seconds=config_object.SAVED_SEARCHES_SYNC_WINDOW_SECONDS,
+    sync_batch_size=config_object.SAVED_SEARCHES_SYNC_BATCH_SIZE,
+    max_pending=config_object.SAVED_SEARCHES_PENDING_MAX
+)
@@ -0,0 +1,78 @@
+"""
+Single-flight: when many requests miss the cache for the same key at the same moment, only the first one
+(the "leader") runs the expensive load, the others wait for its result instead of all hitting the database.
+That avoids a cache stampede right after an entry expires or is invalidated.
+
+SingleFlight is for sync code (threads), AsyncSingleFlight for coroutines on one event loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = dict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            call: Optional[_Call] = self._calls.get(key)
+            is_leader: bool = call is None
+
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = dict()
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        future: Optional[asyncio.Future] = self._calls.get(key)
+
+        if future is not None:
+            # shield | a cancelled waiter must not cancel the leader's load for everybody else.
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+
+        try:
+            result: Any = await function()
+            future.set_result(result)
+            return result
+        except BaseException as error:
+            future.set_exception(error)
+            future.exception()  # mark as retrieved, nobody may be waiting.
+            raise
+        finally:
+            del self._calls[key]
@@ -0,0 +1,117 @@
+"""
+Cache of verified bearer tokens -> TokenPrincipal.
+
+A client sends the same bearer token on every request, so instead of running `jwt.decode` again and again
+we remember the result for a while.
+
+- Keyed by the SHA-256 of the token, we never keep raw tokens in memory.
+- An entry never outlives the token's own `exp`, nor TOKEN_CACHE_TTL_SECONDS.
+- `revoke_user()` is the revocation record: tokens of that user with a `ver` below the new User.token_version are
+  refused from then on, cached or decoded again (see `is_revoked()`), and their cache entries are dropped.
+  Call it when the user is deactivated or changes password. A record is kept as long as a token can live
+  (JWT_ACCESS_TOKEN_EXPIRE_MINUTES), every token it could refuse has expired by then.
+
+The cache and the revocation records are per process. Other workers keep accepting a revoked token on the stateless
+path until it expires, routes that must refuse it everywhere use the DB-backed `get_current_user_from_token`,
+which checks the token version against the database.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from api_models.token import TokenPrincipal
+from config import config_object
+from services.lru_cache import TTLLRUCache
+
+
+class TokenCacheService:
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.cache: TTLLRUCache = TTLLRUCache(max_size=max_size, default_ttl=ttl_seconds, on_evict=self._forget_key, clock=clock)
+        self.clock = clock
+
+        # user id -> token hashes, so we can drop all tokens of one user.
+        self._keys_by_user: Dict[int, Set[str]] = dict()
+        self._lock: threading.Lock = threading.Lock()
+
+        # user id -> (lowest token version still accepted, kept until), see revoke_user().
+        self._revoked_below: Dict[int, Tuple[int, float]] = dict()
+
+        self.invalidations: int = 0
+        self.revocations: int = 0
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get_principal(self, token: str) -> Optional[TokenPrincipal]:
+        return self.cache.get(self.token_key(token))
+
+    def put_principal(self, token: str, principal: TokenPrincipal, expires_at: Optional[float] = None):
+        """
+        :param expires_at: the token's `exp` claim (unix seconds).
+        """
+        key: str = self.token_key(token)
+
+        with self._lock:
+            self._keys_by_user.setdefault(principal.id, set()).add(key)
+
+        self.cache.set(key, principal, expires_at=expires_at)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            keys: Set[str] = self._keys_by_user.pop(user_id, set())
+
+        for key in keys:
+            self.cache.delete(key)
+
+        self.invalidations += 1
+
+    def revoke_user(self, user_id: int, token_version: int):
+        """
+        :param token_version: the user's token_version after the bump, tokens carrying an older `ver` are revoked.
+        """
+        now: float = self.clock()
+        keep_until: float = now + int(config_object.JWT_ACCESS_TOKEN_EXPIRE_MINUTES) * 60
+
+        with self._lock:
+            self._revoked_below = {
+                revoked_user_id: record for revoked_user_id, record in self._revoked_below.items() if record[1] > now
+            }
+
+            lowest_version: int = max(token_version, self._revoked_below.get(user_id, (0, 0.0))[0])
+            self._revoked_below[user_id] = (lowest_version, keep_until)
+
+        self.revocations += 1
+        self.invalidate_user(user_id)
+
+    def is_revoked(self, principal: TokenPrincipal) -> bool:
+        record: Optional[Tuple[int, float]] = self._revoked_below.get(principal.id)
+        return record is not None and principal.token_version < record[0]
+
+    def clear(self):
+        self.cache.clear()
+
+        with self._lock:
+            self._keys_by_user.clear()
+            self._revoked_below.clear()
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "invalidations": self.invalidations, "revocations": self.revocations}
+
+    def _forget_key(self, key: Hashable, principal: TokenPrincipal):
+        with self._lock:
+            keys: Optional[Set[str]] = self._keys_by_user.get(principal.id)
+
+            if keys is not None:
+                keys.discard(key)
+
+                if not keys:
+                    del self._keys_by_user[principal.id]
+
+
+token_cache_service: TokenCacheService = TokenCacheService(
+    max_size=config_object.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=config_object.TOKEN_CACHE_TTL_SECONDS
+)
@@ -3,7 +3,9 @@ from typing import Optional
 
 from jose import jwt
 
+from api_models.token import TokenPrincipal
 from config import config_object
+from database.orm_models.user import User
 
 
 class TokenService:
@@ -33,5 +35,49 @@ class TokenService:
 
         return encoded_jwt
 
+    def create_access_token_for_user(self, user: User, expires_delta: Optional[timedelta] = None) -> str:
+        """
+        Puts everything the routes need to authorize a request into the token, so they don't have to query the user again.
+
+        Claims:
+            sub - the email
+            uid - the user id
+            act - is_active
+            su  - is_superuser
+            ver - token_version, bumped on password change / deactivation
+        """
+        return self.create_access_token(
+            data={
+                "sub": user.email,
+                "uid": user.id,
+                "act": bool(user.is_active),
+                "su": bool(user.is_superuser),
+                "ver": user.token_version or 0,
+            },
+            expires_delta=expires_delta
+        )
+
+    def decode_access_token(self, token: str) -> dict:
+        """
+        Verifies the signature and expiry. Raises jose.JWTError when the token is not valid.
+        """
+        return jwt.decode(token, config_object.JWT_SECRET_KEY, algorithms=[config_object.JWT_ALGORITHM])
+
+    def principal_from_payload(self, payload: dict) -> Optional[TokenPrincipal]:
+        """
+        Builds the principal from verified claims. Returns None if the token does not carry the claims we need,
+        ex. tokens minted before the claims were added.
+        """
+        if payload.get("sub") is None or payload.get("uid") is None:
+            return None
+
+        return TokenPrincipal(
+            id=payload["uid"],
+            username=payload["sub"],
+            is_active=payload.get("act", False),
+            is_superuser=payload.get("su", False),
+            token_version=payload.get("ver", 0),
+        )
+
 
 token_service: TokenService = TokenService()
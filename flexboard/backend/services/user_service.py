@@ -6,15 +6,18 @@ from api_models.user import UserCreate
 from database.daos.user_dao import UserDao, user_dao
 from database.orm_models.user import User
 from services.hash_service import HashService, hash_service
+from services.token_cache_service import TokenCacheService, token_cache_service
 
 
 class UserService:
-    def __init__(self, user_dao_param: UserDao, hash_service_param: HashService):
+    def __init__(self, user_dao_param: UserDao, hash_service_param: HashService, token_cache_service_param: TokenCacheService):
         self.user_dao = user_dao_param
         self.hash_service = hash_service_param
+        self.token_cache_service = token_cache_service_param
 
     def create_new_user(self, user_create: UserCreate, db_session: Session) -> Optional[User]:
-        bcrypt_hashed_password: str = hash_service.hash(user_create.password)
+        # Goes through the bounded hash pool, raises HashServiceSaturatedError if the pool is full.
+        bcrypt_hashed_password: str = self.hash_service.hash_bounded(user_create.password)
         user: User = self.user_dao.create_new_user(user_create, bcrypt_hashed_password, db_session)
 
         if not user:
@@ -30,8 +33,42 @@ class UserService:
 
         return user
 
+    def get_user_by_id(self, user_id: int, session: Session) -> Optional[User]:
+        user: User = self.user_dao.get_user_by_id(user_id, session)
+
+        if not user:
+            return None
+
+        return user
+
+    def deactivate_user(self, user_id: int, session: Session) -> Optional[User]:
+        user: User = self.user_dao.deactivate_user(user_id, session)
+
+        if not user:
+            return None
+
+        # revocation hook | tokens issued before the bumped token_version are refused, cached or not.
+        self.token_cache_service.revoke_user(user_id, user.token_version)
+
+        return user
+
+    def change_password(self, user_id: int, new_plain_password: str, session: Session) -> Optional[User]:
+        bcrypt_hashed_password: str = self.hash_service.hash_bounded(new_plain_password)
+        user: User = self.user_dao.update_password(user_id, bcrypt_hashed_password, session)
+
+        if not user:
+            return None
+
+        # revocation hook | tokens issued with the old password are refused, cached or not.
+        self.token_cache_service.revoke_user(user_id, user.token_version)
+
+        return user
+
     def authenticate_user(self, plain_password: str, hashed_password: str) -> bool:
         return self.hash_service.verify_password(plain_password=plain_password, hashed_password=hashed_password)
 
+    async def authenticate_user_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.hash_service.verify_password_async(plain_password, hashed_password)
+
 
-user_service: UserService = UserService(user_dao, hash_service)
+user_service: UserService = UserService(user_dao, hash_service, token_cache_service)
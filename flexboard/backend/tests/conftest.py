@@ -15,6 +15,12 @@ from api.api_routes import api_router
 from database.base import Base
 from database.orm_models.user import User
 from database.session import get_database
+from services.job_cache_service import job_cache_service
+from services.job_suggest_service import job_suggest_service
+from services.job_event_service import job_event_service
+from services.percolator_service import percolator_service
+from services.saved_search_service import saved_search_service
+from services.token_cache_service import token_cache_service
 from tests.test_utils import TestUtils
 
 # sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -51,6 +57,12 @@ def app() -> Generator[FastAPI, Any, None]:
     Create a fresh database on each test case.
     """
     Base.metadata.create_all(bind=engine)  # Create the tables.
+    job_cache_service.clear()  # ids start over in the fresh tables, cached responses from the last test would be wrong.
+    job_suggest_service.clear()  # same for the typeahead index.
+    percolator_service.clear()  # and the saved searches.
+    saved_search_service.clear()  # and the jobs still waiting to be matched.
+    job_event_service.clear()  # and the change feed's buffer.
+    token_cache_service.clear()  # and the revoked tokens, a new user can get the id of a revoked one.
     _app = start_application()
     yield _app
     Base.metadata.drop_all(engine)
@@ -0,0 +1,52 @@
+import json
+from datetime import date
+
+import pytest
+
+from api_models.job import JobPage, ShowJob
+from api_models.job_serializer import InvalidFieldsError, JobSerializer, job_serializer
+from database.orm_models.job import Job
+
+
+def test_serializer_matches_response_model():
+    """
+    The fast path must produce exactly what ShowJob / JobPage would.
+    """
+    job: Job = Job(
+        id=1,
+        title="test job",
+        company="test company",
+        company_url="testurl.com",
+        location="Remote",
+        description="this is a test!",
+        date_posted=date(2024, 2, 29),
+        is_active=True,
+        owner_id=1,
+    )
+
+    expected_show_job: dict = ShowJob.model_validate(job, from_attributes=True).model_dump(mode="json")
+    expected_job_page: dict = JobPage(items=[expected_show_job], next_cursor="abc").model_dump(mode="json")
+
+    assert json.loads(job_serializer.show_job(job)) == expected_show_job
+    assert json.loads(job_serializer.job_page([job], "abc")) == expected_job_page
+
+
+def test_parse_fields_keeps_one_order():
+    # same fields in any order -> same response, same ETag.
+    assert job_serializer.parse_fields("company, title") == ("title", "company")
+    assert job_serializer.parse_fields("title,company") == ("title", "company")
+    assert job_serializer.parse_fields(None) is None
+
+    # the full description is get-job only.
+    for fields in ("description", "title,owner_id", " , "):
+        with pytest.raises(InvalidFieldsError):
+            job_serializer.parse_fields(fields)
+
+
+def test_description_snippet_ends_on_a_word():
+    serializer: JobSerializer = JobSerializer(snippet_length=20)
+
+    assert serializer.snippet("short text") == "short text"
+    assert serializer.snippet("build and run fastapi services") == "build and run…"
+    assert serializer.snippet("x" * 30) == "x" * 20 + "…"
+    assert serializer.snippet(None) is None
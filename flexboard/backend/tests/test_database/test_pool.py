@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+import database.session
+from config import config_object
+from database.pool import InstrumentedQueuePool, pool_metrics_registry
+from database.session import get_engine, get_sessionmaker
+
+
+@pytest.fixture
+def sqlite_primary_engine(monkeypatch):
+    """
+    The app's own `primary` engine, created by get_engine() like in production, but on SQLite: the tests never need
+    the POSTGRES_* settings. The module globals go back to how they were afterwards.
+    """
+    monkeypatch.setattr(config_object, "POSTGRES_DATABASE_URL", "sqlite://")
+    monkeypatch.setattr(config_object, "DATABASE_REPLICA_URLS", list())
+    monkeypatch.setattr(database.session, "engine", None)
+    monkeypatch.setattr(database.session, "session", None)
+    monkeypatch.setattr(database.session, "replica_engines", list())
+
+    engine = get_engine()
+    yield engine
+    engine.dispose()
+
+
+def test_pool_metrics_record_checkouts_and_timeouts():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test_pool",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+        snapshot: dict = pool_metrics_registry.snapshot()["test_pool"]
+        assert snapshot["in_use"] == 1
+        assert snapshot["checkouts"] == 1
+
+        # the only connection is taken, the next checkout has to time out.
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    snapshot: dict = pool_metrics_registry.snapshot()["test_pool"]
+    assert snapshot["checkout_timeouts"] == 1
+    assert snapshot["in_use"] == 0
+    assert snapshot["idle"] == 1
+
+    engine.dispose()
+
+
+def test_monitoring_db_pool_route(client, sqlite_primary_engine):
+    response = client.get("/monitoring/db-pool")
+
+    assert response.status_code == 200
+    assert "primary" in response.json()
+
+
+def test_engines_are_created_once_under_concurrent_first_use(monkeypatch):
+    monkeypatch.setattr(config_object, "POSTGRES_DATABASE_URL", "sqlite://")
+    monkeypatch.setattr(config_object, "DATABASE_REPLICA_URLS", list())
+    monkeypatch.setattr(database.session, "engine", None)
+    monkeypatch.setattr(database.session, "session", None)
+    monkeypatch.setattr(database.session, "replica_engines", list())
+
+    create_engine_once = database.session._create_engine
+    created: list = list()
+
+    def slow_create_engine(url: str, name: str):
+        created.append(name)
+        time.sleep(0.05)  # the other threads arrive while the first one is still creating
+        return create_engine_once(url, name)
+
+    monkeypatch.setattr(database.session, "_create_engine", slow_create_engine)
+    sessionmakers: list = list()
+    threads: list = [threading.Thread(target=lambda: sessionmakers.append(get_sessionmaker())) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert created == ["primary"]
+    assert len(sessionmakers) == 8 and all(maker is sessionmakers[0] for maker in sessionmakers) and sessionmakers[0] is not None
+
+    get_engine().dispose()
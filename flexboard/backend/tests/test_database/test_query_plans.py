@@ -0,0 +1,83 @@
+from datetime import date
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from api_models.job import JobFilters
+from database.daos.job_dao import JOB_VALIDATOR_COLUMNS, job_dao
+from database.daos.user_dao import user_dao
+from database.orm_models.job import Job
+
+"""
+Makes sure the hot queries are served by an index and not a full table scan.
+
+Uses SQLite's EXPLAIN QUERY PLAN, where a scan shows up as "SCAN job" and an index as "USING INDEX ix_...".
+"""
+
+
+def _query_plan(session: Session, statement: Select) -> str:
+    compiled = statement.compile(bind=session.get_bind(), compile_kwargs={"literal_binds": True})
+    rows: List = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_list_jobs_uses_partial_index(db_session):
+    first_page: str = _query_plan(db_session, job_dao._list_jobs_statement(limit=10))
+    next_page: str = _query_plan(db_session, job_dao._list_jobs_statement(limit=10, after=(date(2024, 1, 1), 10)))
+
+    for query_plan in (first_page, next_page):
+        assert "ix_job_active_date_posted_id" in query_plan
+        # read in index order, no extra sort step.
+        assert "TEMP B-TREE" not in query_plan
+
+
+def test_sparse_fieldset_never_selects_the_description(db_session):
+    statement: Select = job_dao._with_fields(job_dao._list_jobs_statement(limit=10), ("title", "description_snippet"))
+    selected: str = str(statement.compile(bind=db_session.get_bind())).split("FROM")[0]
+
+    # only the snippet of the description is read, cut by the database.
+    assert "substr(job.description" in selected
+    assert "job.description" not in selected.replace("substr(job.description", "")
+    assert "job.company" not in selected
+
+
+def test_etag_queries_are_index_only(db_session):
+    job_validator: str = _query_plan(db_session, job_dao._job_validator_statement(1))
+    page_validator: str = _query_plan(db_session, job_dao._list_jobs_statement(10, None, JOB_VALIDATOR_COLUMNS))
+
+    # SQLite keeps rows in the primary key b-tree, so the id lookup is already a single index read.
+    # Postgres uses the covering ix_job_id_version instead of visiting the table.
+    assert "COVERING INDEX" in job_validator or "INTEGER PRIMARY KEY" in job_validator
+    assert "COVERING INDEX ix_job_active_date_posted_id" in page_validator
+
+
+def test_filtered_list_jobs_use_filter_indexes(db_session):
+    for filters, index in [
+        (JobFilters(company="acme"), "ix_job_company_active_date_posted_id"),
+        (JobFilters(location="Remote", date_from=date(2024, 1, 1)), "ix_job_location_active_date_posted_id"),
+        (JobFilters(owner_id=1, is_active=False), "ix_job_owner_id_active_date_posted_id"),
+        (JobFilters(date_from=date(2024, 1, 1), date_to=date(2024, 12, 31)), "ix_job_active_date_posted_id"),
+    ]:
+        page: str = _query_plan(db_session, job_dao._list_jobs_statement(10, (date(2024, 6, 1), 10), filters=filters))
+        page_validator: str = _query_plan(db_session, job_dao._list_jobs_statement(10, None, JOB_VALIDATOR_COLUMNS, filters))
+
+        # one range of the index, in order, and the ETag query never reads the table.
+        assert index in page
+        assert "TEMP B-TREE" not in page
+        assert f"COVERING INDEX {index}" in page_validator
+
+
+def test_jobs_by_owner_use_index(db_session):
+    query_plan: str = _query_plan(db_session, select(Job).where(Job.owner_id == 1))
+
+    assert "ix_job_owner_id" in query_plan
+
+
+def test_login_lookup_uses_lower_indexes(db_session):
+    query_plan: str = _query_plan(db_session, user_dao._user_by_email_or_username_statement("Flexer@Testington.com"))
+
+    assert "ix_user_username_lower" in query_plan
+    assert "ix_user_email_lower" in query_plan
+    assert "SCAN user" not in query_plan
@@ -0,0 +1,85 @@
+from typing import Any, Generator, Tuple
+
+import pytest
+from sqlalchemy import Engine, create_engine, select, update
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from database.base import Base
+from database.daos.job_dao import job_dao
+from database.orm_models.job import Job
+from database.replicas import (
+    LeastConnectionsBalancer, RoundRobinBalancer, RoutingSession, start_read_your_writes, stop_read_your_writes
+)
+
+
+@pytest.fixture(scope="function")
+def primary_and_replica() -> Generator[Tuple[Engine, Engine], Any, None]:
+    """
+    Two separate in-memory databases, job 1 has a different title on each, so a read tells which one answered.
+    """
+    engines: list = list()
+
+    for title in ("on primary", "on replica"):
+        engine: Engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+
+        with RoutingSession(bind=engine) as session:
+            session.add(Job(id=1, title=title, company="company", description="description"))
+            session.commit()
+
+        engines.append(engine)
+
+    yield engines[0], engines[1]
+
+    for engine in engines:
+        engine.dispose()
+
+
+def test_read_only_dao_methods_read_from_a_replica(primary_and_replica):
+    primary, replica = primary_and_replica
+
+    with RoutingSession(bind=primary, replicas=[replica]) as session:
+        assert job_dao.retrieve_job(1, session).title == "on replica"
+        assert [job.title for job in job_dao.list_jobs(session, limit=10)] == ["on replica"]
+
+        # anything that is not a @read_only DAO method stays on the primary.
+        assert session.execute(select(Job.title)).scalar() == "on primary"
+
+
+def test_session_reads_its_own_writes_from_the_primary(primary_and_replica):
+    primary, replica = primary_and_replica
+
+    with RoutingSession(bind=primary, replicas=[replica]) as session:
+        session.execute(update(Job).where(Job.id == 1).values(title="updated on primary"))
+
+        assert session.wrote
+        assert job_dao.retrieve_job(1, session).title == "updated on primary"
+
+
+def test_client_that_wrote_recently_reads_from_the_primary(primary_and_replica):
+    primary, replica = primary_and_replica
+
+    read_your_writes, token = start_read_your_writes(stick_to_primary=True)
+    try:
+        with RoutingSession(bind=primary, replicas=[replica]) as session:
+            assert job_dao.retrieve_job(1, session).title == "on primary"
+    finally:
+        stop_read_your_writes(token)
+
+
+def test_round_robin_balancer_takes_turns():
+    balancer: RoundRobinBalancer = RoundRobinBalancer()
+    replicas: list = ["replica_0", "replica_1"]
+
+    assert [balancer.choose(replicas) for _ in range(4)] == ["replica_0", "replica_1", "replica_0", "replica_1"]
+
+
+def test_least_connections_balancer_picks_the_least_busy_replica():
+    busy: Engine = create_engine("sqlite://", poolclass=QueuePool)
+    idle: Engine = create_engine("sqlite://", poolclass=QueuePool)
+
+    with busy.connect():
+        assert LeastConnectionsBalancer().choose([busy, idle]) is idle
+
+    busy.dispose()
+    idle.dispose()
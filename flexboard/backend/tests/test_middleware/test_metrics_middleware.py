@@ -0,0 +1,82 @@
+import http
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+from api_models.job import JobCreate
+from database.orm_models.job import Job
+from database.orm_models.user import User
+from database.query_stats import install_query_timing
+from middleware.metrics_middleware import MetricsMiddleware, UNMATCHED_ROUTE
+from services.job_service import job_service
+from services.metrics_service import MetricsRegistry
+
+ROUTE_GET_JOB: str = "/jobs/get-job/{job_id}"
+
+
+@pytest.fixture(scope="function")
+def metrics(app: FastAPI, db_session: Session) -> MetricsRegistry:
+    """
+    A fresh registry, wired in before the first request builds the middleware stack.
+    The routes run on the test engine, so it gets the DB timing hooks too.
+    """
+    install_query_timing(db_session.get_bind().engine)
+
+    registry: MetricsRegistry = MetricsRegistry()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    return registry
+
+
+def test_requests_are_labelled_by_route_template(metrics, client, user_and_header_with_bearer_token, db_session):
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_create: JobCreate = JobCreate(title="metered job", company="test company", company_url="testurl.com", description="metrics")
+    job: Job = job_service.create_new_job(job_create, user.id, db_session)
+
+    assert client.get(f"/jobs/get-job/{job.id}", headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+    assert client.get("/jobs/get-job/999", headers=header_with_bearer_token).status_code == http.HTTPStatus.NOT_FOUND
+    client.get("/no/such/path")
+
+    requests_total = metrics.counter("http_requests_total", "")
+    assert requests_total.value("GET", ROUTE_GET_JOB, "200") == 1
+    assert requests_total.value("GET", ROUTE_GET_JOB, "404") == 1
+    assert requests_total.value("GET", UNMATCHED_ROUTE, "404") == 1
+
+    assert metrics.histogram("http_request_duration_seconds", "").count("GET", ROUTE_GET_JOB) == 2
+    assert metrics.histogram("http_request_db_duration_seconds", "").count("GET", ROUTE_GET_JOB) == 2
+    assert metrics.gauge("http_requests_in_flight", "").value("GET") == 0
+
+
+def test_database_time_is_recorded(metrics, client, user_and_header_with_bearer_token):
+    client.get("/jobs/list-jobs", headers=user_and_header_with_bearer_token[1])
+
+    rendered: str = metrics.render()
+
+    assert 'http_request_db_duration_seconds_count{method="GET",route="/jobs/list-jobs"} 1' in rendered
+    assert 'http_request_db_duration_seconds_sum{method="GET",route="/jobs/list-jobs"} 0\n' not in rendered
+
+
+def test_histogram_buckets_are_cumulative():
+    registry: MetricsRegistry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/a")
+
+    rendered: str = registry.render()
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in rendered
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in rendered
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in rendered
+    assert 'latency_seconds_count{route="/a"} 4' in rendered
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics")
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE cache_hits_total counter" in response.text
+    assert 'cache_hits_total{cache="token"}' in response.text
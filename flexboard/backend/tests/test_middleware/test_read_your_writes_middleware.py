@@ -0,0 +1,82 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.login.route_login import get_current_principal_from_token
+from api_models.token import TokenPrincipal
+from database.orm_models.user import User
+from database.replicas import current_read_your_writes
+from middleware.read_your_writes_middleware import PRIMARY_UNTIL_COOKIE, ReadYourWritesMiddleware
+from services.token_service import token_service
+
+
+def create_app(window_seconds: float) -> FastAPI:
+    app: FastAPI = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=window_seconds)
+
+    @app.post("/write")
+    def write():
+        # what RoutingSession does when it flushes / runs an INSERT, UPDATE or DELETE.
+        current_read_your_writes().wrote = True
+
+    @app.get("/read")
+    def read() -> bool:
+        return current_read_your_writes().stick_to_primary
+
+    @app.post("/write-as-user")
+    def write_as_user(principal: TokenPrincipal = Depends(get_current_principal_from_token)):
+        current_read_your_writes().wrote = True
+
+    @app.get("/read-as-user")
+    def read_as_user(principal: TokenPrincipal = Depends(get_current_principal_from_token)) -> bool:
+        return current_read_your_writes().stick_to_primary
+
+    return app
+
+
+def bearer_header(user_id: int) -> dict:
+    user: User = User(id=user_id, email=f"user{user_id}@test.com", is_active=True, is_superuser=False, token_version=0)
+    return {"Authorization": f"Bearer {token_service.create_access_token_for_user(user)}"}
+
+
+def test_reads_stick_to_the_primary_after_a_write():
+    client: TestClient = TestClient(create_app(window_seconds=60))
+
+    assert client.get("/read").json() is False
+    assert PRIMARY_UNTIL_COOKIE not in client.get("/read").cookies
+
+    response = client.post("/write")
+    assert PRIMARY_UNTIL_COOKIE in response.cookies
+
+    # the TestClient sends the cookie back, like a browser would.
+    assert client.get("/read").json() is True
+
+
+def test_stickiness_ends_after_the_window():
+    client: TestClient = TestClient(create_app(window_seconds=0))
+
+    client.post("/write")
+
+    assert client.get("/read").json() is False
+
+
+def test_bearer_clients_without_cookies_stick_to_the_primary_by_user():
+    client: TestClient = TestClient(create_app(window_seconds=60))
+
+    assert client.post("/write-as-user", headers=bearer_header(1)).status_code == 200
+
+    # an API client doesn't keep cookies, the user's window still applies.
+    client.cookies.clear()
+    assert client.get("/read-as-user", headers=bearer_header(1)).json() is True
+
+    # other users are not affected, nor requests without a token.
+    assert client.get("/read-as-user", headers=bearer_header(2)).json() is False
+    assert client.get("/read").json() is False
+
+
+def test_user_window_ends_after_the_window():
+    client: TestClient = TestClient(create_app(window_seconds=0))
+
+    client.post("/write-as-user", headers=bearer_header(1))
+    client.cookies.clear()
+
+    assert client.get("/read-as-user", headers=bearer_header(1)).json() is False
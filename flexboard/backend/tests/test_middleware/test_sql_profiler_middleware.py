@@ -0,0 +1,140 @@
+import http
+from typing import List, Tuple
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+from api_models.job import JobCreate
+from database.daos.job_dao import job_dao
+from database.orm_models.job import Job
+from database.orm_models.user import User
+from database.query_stats import QueryStats, count_queries, install_query_timing
+from middleware.sql_profiler_middleware import ROUTE_QUERY_BUDGETS, QueryBudgetExceededError, SqlProfilerMiddleware
+from services.job_service import job_service
+from services.percolator_service import percolator_service
+from tests.test_utils import TestUtils
+
+ROUTE_JOBS: str = "/jobs"
+
+
+@pytest.fixture(scope="function")
+def profiled_requests(app: FastAPI, db_session: Session) -> List[Tuple[str, str, QueryStats]]:
+    """
+    Strict query budgets on every route, and the (method, route, QueryStats) of every request made in the test.
+    """
+    install_query_timing(db_session.get_bind().engine)
+
+    requests: List[Tuple[str, str, QueryStats]] = list()
+    app.add_middleware(
+        SqlProfilerMiddleware,
+        strict=True,
+        on_request=lambda method, route, query_stats: requests.append((method, route, query_stats))
+    )
+    return requests
+
+
+def create_jobs(session: Session, owners: List[User], count: int) -> List[Job]:
+    return [
+        job_service.create_new_job(
+            JobCreate(title=f"profiled job {index}", company="test company", company_url="testurl.com", description="profiler"),
+            owners[index % len(owners)].id,
+            session
+        )
+        for index in range(count)
+    ]
+
+
+def test_job_routes_stay_within_query_budget(profiled_requests, client, user_and_header_with_bearer_token, db_session):
+    """
+    Strict budgets: any route running more statements than ROUTE_QUERY_BUDGETS raises and fails this test.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+    jobs: List[Job] = create_jobs(db_session, [user], 30)
+
+    assert client.get(f"{ROUTE_JOBS}/list-jobs?limit=30", headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+    assert client.get(f"{ROUTE_JOBS}/get-job/{jobs[0].id}", headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+    assert client.get(f"{ROUTE_JOBS}/search?q=profiled", headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+    # moves the job stats, the old values come back with the UPDATE.
+    assert client.put(f"{ROUTE_JOBS}/update-job/{jobs[1].id}", json={"company": "x"}, headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+    assert client.delete(f"{ROUTE_JOBS}/delete-job/{jobs[2].id}", headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+
+    # with a saved search to match and the catch-up sync due, both off the request.
+    assert client.post("/saved-searches/create-saved-search", json={"keywords": "profiled"}, headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+    percolator_service.synced_at = 0.0
+    job_data: dict = {"title": "profiled job", "company": "test company", "company_url": "testurl.com", "description": "profiler"}
+    assert client.post(f"{ROUTE_JOBS}/create-job", json=job_data, headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+
+    assert client.get(f"{ROUTE_JOBS}/stats", headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+    assert client.post("/login/token", data={"username": user.username, "password": "for_token"}).status_code == http.HTTPStatus.OK
+
+    query_counts: dict = {route: query_stats.count for _, route, query_stats in profiled_requests}
+    assert set(ROUTE_QUERY_BUDGETS) <= set(query_counts)  # every budgeted route was checked
+    assert query_counts[f"{ROUTE_JOBS}/list-jobs"] == 2  # ETag query + the page, not one per job
+
+    # the facet counts come with the ETag query: 2 on a miss, 1 for a 304.
+    response = client.get(f"{ROUTE_JOBS}/list-jobs?facets=true", headers=header_with_bearer_token)
+    assert response.json()["facets"]["company"] == [{"value": "test company", "count": 29}, {"value": "x", "count": 1}]
+    assert profiled_requests[-1][2].count == 2
+
+    response = client.get(f"{ROUTE_JOBS}/list-jobs?facets=true", headers={**header_with_bearer_token, "If-None-Match": response.headers["etag"]})
+    assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+    assert profiled_requests[-1][2].count == 1
+    assert query_counts[f"{ROUTE_JOBS}/create-job"] == 2  # INSERT ... RETURNING + the stats upsert
+    assert query_counts[f"{ROUTE_JOBS}/update-job/{{job_id}}"] == 2  # UPDATE ... RETURNING old and new + the stats upsert
+
+
+def test_route_query_budgets_are_pinned():
+    """
+    Raising a budget to fit a feature hides the regression the budget is there to catch, fix the route instead.
+    """
+    assert ROUTE_QUERY_BUDGETS == {
+        "/jobs/create-job": 2,
+        "/jobs/get-job/{job_id}": 2,
+        "/jobs/list-jobs": 2,
+        "/jobs/search": 1,
+        "/jobs/stats": 1,
+        "/jobs/update-job/{job_id}": 2,
+        "/jobs/delete-job/{job_id}": 2,
+        "/login/token": 1,
+    }
+
+
+def test_server_timing_header(profiled_requests, client, user_and_header_with_bearer_token, db_session):
+    create_jobs(db_session, [user_and_header_with_bearer_token[0]], 1)
+
+    response = client.get(f"{ROUTE_JOBS}/list-jobs", headers=user_and_header_with_bearer_token[1])
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="2 queries"')
+
+
+@pytest.fixture(scope="function")
+def zero_list_jobs_budget(app: FastAPI, db_session: Session):
+    install_query_timing(db_session.get_bind().engine)
+    app.add_middleware(SqlProfilerMiddleware, strict=True, budgets={f"{ROUTE_JOBS}/list-jobs": 0})
+
+
+def test_over_budget_raises(zero_list_jobs_budget, client, user_and_header_with_bearer_token):
+    with pytest.raises(QueryBudgetExceededError):
+        client.get(f"{ROUTE_JOBS}/list-jobs", headers=user_and_header_with_bearer_token[1])
+
+
+def test_list_jobs_is_one_query_and_lazy_owners_are_an_n_plus_one(db_session):
+    owners: List[User] = [TestUtils.create_random_user(db_session, email=f"owner{index}@test.com") for index in range(5)]
+    create_jobs(db_session, owners, 10)
+    db_session.expunge_all()  # forget the owners, so touching job.owner has to load them.
+
+    with count_queries() as query_stats:
+        jobs: List[Job] = job_dao.list_jobs(db_session, limit=10)
+
+    assert query_stats.count == 1
+
+    with count_queries() as query_stats:
+        for job in jobs:
+            assert job.owner is not None
+
+    # one SELECT per owner, the same statement every time.
+    assert query_stats.count == 5
+    assert list(query_stats.repeated_statements(threshold=5).values()) == [5]
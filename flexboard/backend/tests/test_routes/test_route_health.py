@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+
+import main
+from config import config_object
+from database.session import get_database
+from services.health_service import health_service
+
+"""
+Tests for route_health.py and the startup / shutdown of main.py
+"""
+
+
+def test_healthz_is_ok_without_startup(client):
+    response = client.get("/healthz")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_readyz_waits_for_startup(client):
+    assert client.get("/readyz").status_code == 503
+
+    health_service.mark_started()
+    try:
+        response = client.get("/readyz")
+    finally:
+        health_service.mark_stopped()
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+def test_app_factory_is_ready_between_startup_and_shutdown(db_session, monkeypatch):
+    # The test database is already there, no tables to create nor a real pool to warm.
+    monkeypatch.setattr(config_object, "DATABASE_CREATE_TABLES", False)
+    monkeypatch.setattr(config_object, "DB_POOL_WARM_UP_CONNECTIONS", 0)
+    monkeypatch.setattr(config_object, "JOB_SUGGEST_ENABLED", False)
+    monkeypatch.setattr(config_object, "SAVED_SEARCHES_ENABLED", False)
+    monkeypatch.setattr(config_object, "JOB_STATS_RECONCILE_SECONDS", 0)
+
+    app = main.create_app()
+    app.dependency_overrides[get_database] = lambda: db_session
+
+    with TestClient(app) as client:  # `with` runs the lifespan
+        assert health_service.started
+        assert client.get("/readyz").status_code == 200
+
+    assert not health_service.started
@@ -1,12 +1,19 @@
+import csv
 import http
+import io
 import json
+from datetime import date
 from typing import List
 
 from api_models.job import JobCreate
+from config import config_object
 from database.orm_models.job import Job
 from database.orm_models.user import User
 from tests.test_utils import TestUtils
+from services.job_cache_service import job_cache_service
+from services.job_import_service import job_import_service
 from services.job_service import job_service
+from services.job_stats_service import job_stats_service
 
 ROUTE_JOBS: str = "/jobs"
 
@@ -110,6 +117,185 @@ def test_retrieve_job_by_id(client, user_and_header_with_bearer_token, db_sessio
     assert response_json.get('location') == job.location
 
 
+def test_retrieve_job_is_cached_until_updated(client, user_and_header_with_bearer_token, db_session):
+    """
+    get-job is served from the response cache, an update gives the job a new ETag so the old entry is not used anymore.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_create: JobCreate = JobCreate(title="cached job", company="test company", company_url="testurl.com", description="cache test")
+    job: Job = job_service.create_new_job(job_create, user.id, db_session)
+
+    hits_before: int = job_cache_service.stats()["hits"]
+    assert client.get(f"{ROUTE_JOBS}/get-job/{job.id}", headers=header_with_bearer_token).json()["title"] == "cached job"
+    assert client.get(f"{ROUTE_JOBS}/get-job/{job.id}", headers=header_with_bearer_token).json()["title"] == "cached job"
+    assert job_cache_service.stats()["hits"] == hits_before + 1
+
+    response = client.put(f"{ROUTE_JOBS}/update-job/{job.id}", json={"title": "renamed job"}, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.OK
+
+    assert client.get(f"{ROUTE_JOBS}/get-job/{job.id}", headers=header_with_bearer_token).json()["title"] == "renamed job"
+    assert client.get(f"{ROUTE_JOBS}/list-jobs", headers=header_with_bearer_token).json()["items"][0]["title"] == "renamed job"
+
+
+def test_retrieve_job_conditional_get(client, user_and_header_with_bearer_token, db_session):
+    """
+    get-job answers If-None-Match / If-Modified-Since with 304 until the job changes.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_create: JobCreate = JobCreate(title="polled job", company="test company", company_url="testurl.com", description="etag test")
+    job: Job = job_service.create_new_job(job_create, user.id, db_session)
+
+    response = client.get(f"{ROUTE_JOBS}/get-job/{job.id}", headers=header_with_bearer_token)
+    etag: str = response.headers["etag"]
+    last_modified: str = response.headers["last-modified"]
+
+    not_modified = client.get(f"{ROUTE_JOBS}/get-job/{job.id}", headers={**header_with_bearer_token, "If-None-Match": etag})
+    assert not_modified.status_code == http.HTTPStatus.NOT_MODIFIED
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    not_modified = client.get(f"{ROUTE_JOBS}/get-job/{job.id}", headers={**header_with_bearer_token, "If-Modified-Since": last_modified})
+    assert not_modified.status_code == http.HTTPStatus.NOT_MODIFIED
+
+    client.put(f"{ROUTE_JOBS}/update-job/{job.id}", json={"title": "changed job"}, headers=header_with_bearer_token)
+
+    modified = client.get(f"{ROUTE_JOBS}/get-job/{job.id}", headers={**header_with_bearer_token, "If-None-Match": etag})
+    assert modified.status_code == http.HTTPStatus.OK
+    assert modified.headers["etag"] != etag
+    assert modified.json()["title"] == "changed job"
+
+
+def test_list_jobs_conditional_get(client, user_and_header_with_bearer_token, db_session):
+    """
+    A list-jobs page answers If-None-Match with 304 until one of its jobs changes.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    for index in range(3):
+        job_create: JobCreate = JobCreate(title=f"listed job {index}", company="test company", company_url="testurl.com", description="etag test")
+        job_service.create_new_job(job_create, user.id, db_session)
+
+    etag: str = client.get(f"{ROUTE_JOBS}/list-jobs?limit=2", headers=header_with_bearer_token).headers["etag"]
+
+    not_modified = client.get(f"{ROUTE_JOBS}/list-jobs?limit=2", headers={**header_with_bearer_token, "If-None-Match": etag})
+    assert not_modified.status_code == http.HTTPStatus.NOT_MODIFIED
+
+    # same rows, different page size -> different body, different ETag.
+    assert client.get(f"{ROUTE_JOBS}/list-jobs?limit=3", headers=header_with_bearer_token).headers["etag"] != etag
+
+    client.delete(f"{ROUTE_JOBS}/delete-job/3", headers=header_with_bearer_token)
+
+    modified = client.get(f"{ROUTE_JOBS}/list-jobs?limit=2", headers={**header_with_bearer_token, "If-None-Match": etag})
+    assert modified.status_code == http.HTTPStatus.OK
+    assert "last-modified" not in modified.headers
+
+
+def test_list_jobs_sparse_fieldset(client, user_and_header_with_bearer_token, db_session):
+    """
+    `fields=` narrows the items, lists get a snippet instead of the full description.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_create: JobCreate = JobCreate(title="long job", company="test company", company_url="testurl.com", description="word " * 500)
+    job_service.create_new_job(job_create, user.id, db_session)
+
+    response = client.get(f"{ROUTE_JOBS}/list-jobs?fields=description_snippet,title", headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.OK
+
+    item: dict = response.json()["items"][0]
+    assert list(item) == ["title", "description_snippet"]
+    assert item["description_snippet"].endswith("…")
+    assert len(item["description_snippet"]) <= config_object.JOB_DESCRIPTION_SNIPPET_LENGTH + 1
+
+    # another representation of the same page -> another ETag (and cache entry).
+    full_page = client.get(f"{ROUTE_JOBS}/list-jobs", headers=header_with_bearer_token)
+    assert full_page.json()["items"][0]["description"] == job_create.description
+    assert full_page.headers["etag"] != response.headers["etag"]
+
+    assert client.get(f"{ROUTE_JOBS}/list-jobs?fields=description", headers=header_with_bearer_token).status_code == http.HTTPStatus.BAD_REQUEST
+
+
+def test_suggest_jobs(client, user_and_header_with_bearer_token, db_session):
+    """
+    Jobs created / deleted through JobService show up in / leave /jobs/suggest right away.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    for title in ("Python Developer", "Python Developer", "Senior Python Engineer"):
+        job_service.create_new_job(JobCreate(title=title, company="test company", company_url="testurl.com", description="d"), user.id, db_session)
+
+    response = client.get(f"{ROUTE_JOBS}/suggest?prefix=pyth&field=title", headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.json() == {"suggestions": [
+        {"field": "title", "value": "Python Developer", "count": 2},
+        {"field": "title", "value": "Senior Python Engineer", "count": 1},
+    ]}
+
+    job: Job = db_session.query(Job).filter(Job.title == "Senior Python Engineer").one()
+    client.delete(f"{ROUTE_JOBS}/delete-job/{job.id}", headers=header_with_bearer_token)
+    assert client.get(f"{ROUTE_JOBS}/suggest?prefix=engin", headers=header_with_bearer_token).json() == {"suggestions": []}
+
+    assert client.get(f"{ROUTE_JOBS}/suggest?prefix=py&field=description", headers=header_with_bearer_token).status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_job_stats(client, user_and_header_with_bearer_token, db_session):
+    """
+    Creates, updates and deletes move the /jobs/stats counters, only active jobs are counted.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    for company in ("acme", "acme", "globex"):
+        job_service.create_new_job(JobCreate(title="t", company=company, company_url="u", description="d", date_posted="2024-05-01"), user.id, db_session)
+
+    job_service.create_new_jobs([JobCreate(title="t", company="acme", company_url="u", description="d", location="Berlin", date_posted="2024-05-02")], user.id, db_session)
+
+    jobs: List[Job] = db_session.query(Job).filter(Job.company == "acme").order_by(Job.id).all()
+    client.put(f"{ROUTE_JOBS}/update-job/{jobs[0].id}", json={"company": "initech"}, headers=header_with_bearer_token)
+    client.put(f"{ROUTE_JOBS}/update-job/{jobs[1].id}", json={"is_active": False}, headers=header_with_bearer_token)
+    client.delete(f"{ROUTE_JOBS}/delete-job/{jobs[2].id}", headers=header_with_bearer_token)
+
+    response = client.get(f"{ROUTE_JOBS}/stats", headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.json() == {
+        "company": [{"value": "globex", "count": 1}, {"value": "initech", "count": 1}],
+        "location": [{"value": "Remote", "count": 2}],
+        "date_posted": [{"value": "2024-05-01", "count": 2}],
+    }
+
+    assert client.get(f"{ROUTE_JOBS}/stats?limit=1", headers=header_with_bearer_token).json()["company"] == [{"value": "globex", "count": 1}]
+
+    # nothing was off, the reconciliation has nothing to fix.
+    assert job_stats_service.reconcile(db_session) == 0
+
+
+def test_job_stats_reconcile_fixes_drift(client, user_and_header_with_bearer_token, db_session):
+    """
+    Jobs written around JobDao aren't counted until the reconciliation recounts them.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_service.create_new_job(JobCreate(title="t", company="acme", company_url="u", description="d"), user.id, db_session)
+    db_session.add(Job(title="t", company="hooli", company_url="u", description="d", location="Remote", owner_id=user.id))
+    db_session.commit()
+
+    companies = lambda: client.get(f"{ROUTE_JOBS}/stats", headers=header_with_bearer_token).json()["company"]
+    assert companies() == [{"value": "acme", "count": 1}]
+
+    # hooli is missing, "Remote" is off by one and so is the date hooli got from the column's server default.
+    assert job_stats_service.reconcile(db_session) == 3
+    assert companies() == [{"value": "acme", "count": 1}, {"value": "hooli", "count": 1}]
+    assert job_stats_service.stats()["drifted"] == 3
+
+
 def test_list_jobs(client, user_and_header_with_bearer_token, db_session):
     """
     Tests the /jobs/list-jobs endpoint.
@@ -134,7 +320,7 @@ def test_list_jobs(client, user_and_header_with_bearer_token, db_session):
     job_title_names_added: List[str] = [added_job.title for added_job in added_jobs]
 
     response = client.get(f"{ROUTE_JOBS}/list-jobs", headers=header_with_bearer_token)
-    response_json = response.json()
+    response_json = response.json().get("items")
 
     job_title_names: List[str] = list()
     for response_json_show_job_dict in response_json:
@@ -147,6 +333,136 @@ def test_list_jobs(client, user_and_header_with_bearer_token, db_session):
     for job_title_name in job_title_names:
         assert job_title_name in job_title_names_added
 
+    assert response.json().get("next_cursor") is None
+
+
+def test_list_jobs_filters_and_facets(client, user_and_header_with_bearer_token, db_session):
+    """
+    Filters of /jobs/list-jobs are AND-ed, `facets=true` counts over every matching job, both are in the ETag.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+    other_user: User = TestUtils.create_random_user(db_session, email="other@testington.com")
+
+    for company, location, date_posted, owner in [
+        ("acme", "Berlin", "2024-05-01", user),
+        ("acme", "Remote", "2024-05-02", user),
+        ("acme", "Remote", "2024-05-03", other_user),
+        ("globex", "Remote", "2024-05-03", user),
+    ]:
+        job_service.create_new_job(JobCreate(title=f"{company} {location}", company=company, company_url="u", description="d", location=location, date_posted=date_posted), owner.id, db_session)
+
+    def titles(query: str) -> List[str]:
+        response = client.get(f"{ROUTE_JOBS}/list-jobs?{query}", headers=header_with_bearer_token)
+        return [show_job["title"] for show_job in response.json()["items"]] if response.status_code == http.HTTPStatus.OK else []
+
+    assert titles("company=acme") == ["acme Remote", "acme Remote", "acme Berlin"]
+    assert titles("company=acme&location=Remote&limit=1") == ["acme Remote"]
+    assert titles(f"owner_id={user.id}&date_from=2024-05-02") == ["globex Remote", "acme Remote"]
+    assert titles("date_to=2024-05-01") == ["acme Berlin"]
+    assert titles("company=initech") == []
+
+    job: Job = db_session.query(Job).filter(Job.location == "Berlin").one()
+    client.put(f"{ROUTE_JOBS}/update-job/{job.id}", json={"is_active": False}, headers=header_with_bearer_token)
+    assert titles("company=acme&is_active=false") == ["acme Berlin"]
+
+    response = client.get(f"{ROUTE_JOBS}/list-jobs?company=acme&limit=1&facets=true", headers=header_with_bearer_token)
+    assert response.json()["facets"] == {
+        "company": [{"value": "acme", "count": 2}],
+        "location": [{"value": "Remote", "count": 2}],
+        "date_posted": [{"value": "2024-05-02", "count": 1}, {"value": "2024-05-03", "count": 1}],
+    }
+    assert "facets" not in client.get(f"{ROUTE_JOBS}/list-jobs?company=acme&limit=1", headers=header_with_bearer_token).json()
+
+    # a filtered page never answers for the unfiltered one, even with the same rows.
+    etag: str = client.get(f"{ROUTE_JOBS}/list-jobs?company=acme", headers=header_with_bearer_token).headers["etag"]
+    assert client.get(f"{ROUTE_JOBS}/list-jobs?location=Remote", headers=header_with_bearer_token).headers["etag"] != etag
+    assert client.get(f"{ROUTE_JOBS}/list-jobs?company=acme", headers={**header_with_bearer_token, "If-None-Match": etag}).status_code == http.HTTPStatus.NOT_MODIFIED
+
+    # a new job after the first page moves the facet counts, not the page: the ETag with facets changes anyway.
+    faceted_etag: str = response.headers["etag"]
+    job_service.create_new_job(JobCreate(title="acme old", company="acme", company_url="u", description="d", date_posted="2020-01-01"), user.id, db_session)
+    response = client.get(f"{ROUTE_JOBS}/list-jobs?company=acme&limit=1&facets=true", headers={**header_with_bearer_token, "If-None-Match": faceted_etag})
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.json()["facets"]["company"] == [{"value": "acme", "count": 3}]
+
+
+def test_list_jobs_with_cursor(client, user_and_header_with_bearer_token, db_session):
+    """
+    Tests walking through /jobs/list-jobs page by page with `limit` and `cursor`.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    total_count: int = 5
+    for index in range(total_count):
+        job_create: JobCreate = JobCreate(
+            title=f"test job: {index}",
+            company=f"test company {index}",
+            company_url=f"testurl-index-{index}.com",
+            description="this is a cursor test!",
+        )
+        job_service.create_new_job(job_create, user.id, db_session)
+
+    job_title_names: List[str] = list()
+    cursor = None
+    pages: int = 0
+
+    while True:
+        params: dict = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+
+        response = client.get(f"{ROUTE_JOBS}/list-jobs", params=params, headers=header_with_bearer_token)
+        assert response.status_code == http.HTTPStatus.OK
+
+        pages += 1
+        job_title_names.extend(show_job.get("title") for show_job in response.json().get("items"))
+        cursor = response.json().get("next_cursor")
+
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert len(job_title_names) == total_count
+    assert len(set(job_title_names)) == total_count
+
+    response = client.get(f"{ROUTE_JOBS}/list-jobs", params={"cursor": "not-a-cursor"}, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+def test_list_jobs_with_cursor_past_jobs_posted_without_a_date(client, user_and_header_with_bearer_token, db_session):
+    """
+    A job created with `date_posted: null`, or inserted without one, is dated (today) and pages like any other.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_data: dict = {"title": "t", "company": "c", "company_url": "u", "description": "d"}
+    client.post(f"{ROUTE_JOBS}/create-job", json={**job_data, "date_posted": "2024-05-02"}, headers=header_with_bearer_token)
+    client.post(f"{ROUTE_JOBS}/create-job", json={**job_data, "date_posted": None}, headers=header_with_bearer_token)
+    client.post(f"{ROUTE_JOBS}/create-job", json={**job_data, "date_posted": "2024-05-01"}, headers=header_with_bearer_token)
+    db_session.add(Job(**job_data, owner_id=user.id))
+    db_session.commit()
+
+    assert db_session.query(Job).filter(Job.date_posted.is_(None)).count() == 0
+
+    dates: List[str] = list()
+    params: dict = {"limit": 1}
+
+    while True:
+        response = client.get(f"{ROUTE_JOBS}/list-jobs", params=params, headers=header_with_bearer_token)
+        assert response.status_code == http.HTTPStatus.OK
+
+        dates.extend(show_job.get("date_posted") for show_job in response.json().get("items"))
+        params["cursor"] = response.json().get("next_cursor")
+
+        if not params["cursor"]:
+            break
+
+    assert len(dates) == 4
+    assert dates[2:] == ["2024-05-02", "2024-05-01"]
+
 
 def test_delete_job(client, user_and_header_with_bearer_token, db_session):
     """
@@ -176,3 +492,209 @@ def test_delete_job(client, user_and_header_with_bearer_token, db_session):
     retrieved_job: Job = job_service.retrieve_job(job.id, db_session)
 
     assert retrieved_job is None
+
+
+def test_update_job(client, user_and_header_with_bearer_token, db_session):
+    """
+    Tests the /jobs/update-job endpoint, including a falsy value (is_active=False).
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_create: JobCreate = JobCreate(
+        title="test job",
+        company="test company",
+        company_url="testurl.com",
+        description="this is a test!"
+    )
+
+    job: Job = job_service.create_new_job(job_create, user.id, db_session)
+
+    response = client.put(f"{ROUTE_JOBS}/update-job/{job.id}", json={"title": "updated", "is_active": False}, headers=header_with_bearer_token)
+    response_json = response.json()
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert response_json.get("title") == "updated"
+    assert response_json.get("company") == job_create.company
+    assert response_json.get("is_active") is False
+
+    response = client.put(f"{ROUTE_JOBS}/update-job/{job.id + 1}", json={"title": "missing"}, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+
+def test_update_and_delete_job_of_other_user(client, user_and_header_with_bearer_token, db_session):
+    """
+    Only the owner (or a superuser) can update / delete a job.
+    """
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+    other_user: User = TestUtils.create_random_user(db_session, email='other@testington.com')
+
+    job_create: JobCreate = JobCreate(
+        title="test job",
+        company="test company",
+        company_url="testurl.com",
+        description="this is a test!"
+    )
+
+    job: Job = job_service.create_new_job(job_create, other_user.id, db_session)
+
+    response = client.put(f"{ROUTE_JOBS}/update-job/{job.id}", json={"title": "updated"}, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    response = client.delete(f"{ROUTE_JOBS}/delete-job/{job.id}", headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    assert job_service.retrieve_job(job.id, db_session).title == "test job"
+
+
+def test_search_jobs(client, user_and_header_with_bearer_token, db_session):
+    """
+    Tests the /jobs/search endpoint (FTS5 index on SQLite).
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job_creates: List[JobCreate] = [
+        JobCreate(title="Python Developer", company="Snake Corp", company_url="snake.com", description="Write FastAPI services.", location="Denver"),
+        JobCreate(title="Java Developer", company="Bean Inc", company_url="bean.com", description="Spring Boot, some python scripting.", location="Remote"),
+        JobCreate(title="Designer", company="Pixel LLC", company_url="pixel.com", description="Figma all day.", location="Denver"),
+    ]
+    jobs: List[Job] = [job_service.create_new_job(job_create, user.id, db_session) for job_create in job_creates]
+
+    response = client.get(f"{ROUTE_JOBS}/search", params={"q": "python"}, headers=header_with_bearer_token)
+    titles: List[str] = [show_job.get("title") for show_job in response.json().get("items")]
+
+    assert response.status_code == http.HTTPStatus.OK
+    # a match in the title ranks above a match in the description.
+    assert titles == ["Python Developer", "Java Developer"]
+
+    response = client.get(f"{ROUTE_JOBS}/search", params={"q": "denver", "limit": 1}, headers=header_with_bearer_token)
+    assert len(response.json().get("items")) == 1
+
+    next_cursor: str = response.json().get("next_cursor")
+    response = client.get(f"{ROUTE_JOBS}/search", params={"q": "denver", "limit": 1, "cursor": next_cursor}, headers=header_with_bearer_token)
+    assert len(response.json().get("items")) == 1
+    assert response.json().get("next_cursor") is None
+
+    # updates are picked up by the index, inactive jobs are filtered out by default.
+    client.put(f"{ROUTE_JOBS}/update-job/{jobs[2].id}", json={"is_active": False}, headers=header_with_bearer_token)
+    response = client.get(f"{ROUTE_JOBS}/search", params={"q": "figma"}, headers=header_with_bearer_token)
+    assert response.json().get("items") == []
+
+    response = client.get(f"{ROUTE_JOBS}/search", params={"q": "figma", "is_active": False}, headers=header_with_bearer_token)
+    assert [show_job.get("title") for show_job in response.json().get("items")] == ["Designer"]
+
+
+def test_bulk_create_jobs(client, user_and_header_with_bearer_token, db_session):
+    """
+    Tests the /jobs/bulk-create endpoint with a JSON array and with NDJSON, bad items are reported by index.
+    """
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    job: dict = {
+        "title": "bulk job",
+        "company": "bulk company",
+        "company_url": "bulkurl.com",
+        "description": "this is a bulk test!"
+    }
+    items: List = [job, {"title": "missing fields"}, dict(job, title="bulk job 2")]
+
+    response = client.post(f"{ROUTE_JOBS}/bulk-create", json=items, headers=header_with_bearer_token)
+    response_json: dict = response.json()
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert response_json.get("created") == 2
+    assert [error.get("index") for error in response_json.get("errors")] == [1]
+    assert job_service.retrieve_job(response_json.get("ids")[1], db_session).title == "bulk job 2"
+
+    ndjson_body: str = "\n".join([json.dumps(job), "not json", json.dumps(dict(job, title="bulk job 3"))]) + "\n"
+    response = client.post(
+        f"{ROUTE_JOBS}/bulk-create",
+        content=ndjson_body,
+        headers={**header_with_bearer_token, "Content-Type": "application/x-ndjson"}
+    )
+    response_json = response.json()
+
+    assert response_json.get("created") == 2
+    assert response_json.get("errors") == [{"index": 1, "detail": "Invalid JSON."}]
+
+    response = client.post(f"{ROUTE_JOBS}/bulk-create", json={"not": "a list"}, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+def test_bulk_create_jobs_body_limits(client, user_and_header_with_bearer_token, monkeypatch):
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+    monkeypatch.setattr(job_import_service, "max_body_bytes", 100)
+
+    job: dict = {"title": "bulk job", "company": "bulk company", "company_url": "bulkurl.com", "description": "d" * 100}
+
+    response = client.post(f"{ROUTE_JOBS}/bulk-create", json=[job], headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+    # NDJSON is streamed, only the line length is capped.
+    monkeypatch.setattr(job_import_service, "max_line_bytes", 200)
+    ndjson_body: str = "\n".join([json.dumps(job), json.dumps(dict(job, description="d" * 300)), json.dumps(job)])
+    response = client.post(
+        f"{ROUTE_JOBS}/bulk-create",
+        content=ndjson_body,
+        headers={**header_with_bearer_token, "Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.json().get("created") == 2
+    assert response.json().get("errors") == [{"index": 1, "detail": "Line longer than 200 bytes."}]
+
+
+def test_export_jobs(client, user_and_header_with_bearer_token, db_session):
+    """
+    Tests the /jobs/export endpoint in NDJSON, CSV and gzip-ed NDJSON.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    total_count: int = 3
+    for index in range(total_count):
+        job_create: JobCreate = JobCreate(
+            title=f"export job {index}",
+            company="export company",
+            company_url="exporturl.com",
+            description="line one, \"quoted\"\nline two",
+        )
+        job_service.create_new_job(job_create, user.id, db_session)
+
+    response = client.get(f"{ROUTE_JOBS}/export", headers=header_with_bearer_token)
+    exported_jobs: List[dict] = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [exported_job.get("title") for exported_job in exported_jobs] == [f"export job {index}" for index in range(total_count)]
+    assert exported_jobs[0].get("owner_id") == user.id
+
+    response = client.get(f"{ROUTE_JOBS}/export", params={"format": "csv"}, headers=header_with_bearer_token)
+    csv_rows: List[List[str]] = list(csv.reader(io.StringIO(response.text)))
+
+    assert csv_rows[0][:3] == ["id", "title", "company"]
+    assert len(csv_rows) == total_count + 1
+    assert csv_rows[1][5] == "line one, \"quoted\"\nline two"
+
+    # httpx decodes Content-Encoding: gzip for us.
+    response = client.get(f"{ROUTE_JOBS}/export", params={"gzip": True}, headers=header_with_bearer_token)
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == total_count
+
+
+def test_job_create_dates_a_missing_or_null_date_posted_today(monkeypatch):
+    """
+    Missing or null, date_posted is the day the request is validated, not the day the module was imported.
+    """
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date(2030, 1, 2)
+
+    job_data: dict = {"title": "t", "company": "c", "company_url": "u", "description": "d"}
+    assert JobCreate(**job_data).date_posted == JobCreate(**job_data, date_posted=None).date_posted == date.today()
+    assert JobCreate(**job_data, date_posted="2024-05-01").date_posted == date(2024, 5, 1)
+
+    monkeypatch.setattr("api_models.job.date", Tomorrow)
+    assert JobCreate(**job_data, date_posted=None).date_posted == date(2030, 1, 2)
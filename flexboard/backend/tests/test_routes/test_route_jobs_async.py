@@ -0,0 +1,103 @@
+import asyncio
+import http
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from api.v1.jobs import route_jobs_async
+from api_models.user import UserCreate
+from database.base import Base
+from database.daos.user_dao import user_dao
+from database.orm_models.saved_search import SavedSearch, SavedSearchMatch
+from database.orm_models.user import User
+from database.session import get_async_database
+from services.hash_service import hash_service
+from services.percolator_service import percolator_service
+from services.saved_search_service import saved_search_service
+from services.token_service import token_service
+
+"""
+Tests for route_jobs_async.py (DATABASE_ASYNC_MODE).
+
+Runs against an in-memory aiosqlite database, StaticPool keeps the single connection alive between sessions.
+"""
+
+ROUTE_JOBS: str = "/jobs"
+
+
+async def _exercise_async_job_routes():
+    engine: AsyncEngine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    test_async_session: async_sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async def _get_test_async_database():
+        async with test_async_session() as database:
+            yield database
+
+    app: FastAPI = FastAPI()
+    app.include_router(route_jobs_async.router, prefix=ROUTE_JOBS)
+    app.dependency_overrides[get_async_database] = _get_test_async_database
+
+    async with test_async_session() as session:
+        user_create: UserCreate = UserCreate(username="async_user", email="async@testington.com", password="password")
+        user: User = await user_dao.create_new_user_async(user_create, hash_service.hash("password"), session)
+        assert (await user_dao.get_user_by_email_or_username_async("async@testington.com", session)).id == user.id
+
+        # picked up by the matcher's catch-up sync, see services/saved_search_service.py.
+        session.add(SavedSearch(owner_id=user.id, keywords="async"))
+        await session.commit()
+        percolator_service.clear()
+
+    headers: dict = {"Authorization": f"Bearer {token_service.create_access_token_for_user(user)}"}
+    data: dict = {
+        "title": "async job",
+        "company": "async company",
+        "company_url": "asyncurl.com",
+        "description": "this is an async test!"
+    }
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(f"{ROUTE_JOBS}/create-job", json=data, headers=headers)
+        assert response.status_code == http.HTTPStatus.OK
+
+        async with test_async_session() as session:
+            # the matcher thread isn't running in tests.
+            await session.run_sync(saved_search_service.match_pending)
+            assert [match.job_id for match in (await session.scalars(select(SavedSearchMatch))).all()] == [1]
+
+        response = await client.get(f"{ROUTE_JOBS}/list-jobs", headers=headers)
+        assert response.status_code == http.HTTPStatus.OK
+        assert [show_job["title"] for show_job in response.json()["items"]] == ["async job"]
+
+        response = await client.get(f"{ROUTE_JOBS}/list-jobs", params={"company": "async company", "facets": "true"}, headers=headers)
+        assert response.json()["facets"]["company"] == [{"value": "async company", "count": 1}]
+
+        response = await client.get(f"{ROUTE_JOBS}/list-jobs", params={"company": "other company"}, headers=headers)
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+        response = await client.put(f"{ROUTE_JOBS}/update-job/1", json={"title": "updated", "company": "moved"}, headers=headers)
+        assert response.json().get("title") == "updated"
+
+        response = await client.get(f"{ROUTE_JOBS}/stats", headers=headers)
+        assert response.json()["company"] == [{"value": "moved", "count": 1}]
+
+        response = await client.delete(f"{ROUTE_JOBS}/delete-job/1", headers=headers)
+        assert response.json() == "Success, job 1 has been deleted."
+
+        response = await client.get(f"{ROUTE_JOBS}/stats", headers=headers)
+        assert response.json() == {"company": [], "location": [], "date_posted": []}
+
+        response = await client.get(f"{ROUTE_JOBS}/get-job/1", headers=headers)
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    await engine.dispose()
+    percolator_service.clear()
+
+
+def test_async_job_routes():
+    asyncio.run(_exercise_async_job_routes())
@@ -0,0 +1,135 @@
+import asyncio
+import http
+
+import pytest
+from fastapi import HTTPException
+
+from api.v1.login.route_login import get_current_principal_from_token, get_current_user_from_token
+from api_models.token import TokenPrincipal
+from database.orm_models.user import User
+from services.token_cache_service import token_cache_service
+from services.token_service import token_service
+from services.user_service import user_service
+from tests.test_utils import TestUtils
+
+ROUTE_LOGIN: str = "/login"
+
+
+def test_login_token_carries_claims(client, db_session):
+    password: str = 'for_token'
+    user: User = TestUtils.create_random_user(db_session, password=password)
+
+    response = client.post(f"{ROUTE_LOGIN}/token", data={"username": user.username, "password": password})
+    assert response.status_code == http.HTTPStatus.OK
+
+    payload: dict = token_service.decode_access_token(response.json().get("access_token"))
+
+    assert payload.get("sub") == user.email
+    assert payload.get("uid") == user.id
+    assert payload.get("act") is True
+    assert payload.get("su") is False
+    assert payload.get("ver") == 0
+
+
+def test_login_wrong_password(client, db_session):
+    user: User = TestUtils.create_random_user(db_session, password='for_token')
+
+    response = client.post(f"{ROUTE_LOGIN}/token", data={"username": user.username, "password": 'wrong'})
+
+    assert response.status_code == http.HTTPStatus.UNAUTHORIZED
+
+
+def test_login_lookup_runs_off_the_event_loop(client, db_session, monkeypatch):
+    password: str = 'for_token'
+    user: User = TestUtils.create_random_user(db_session, password=password)
+    lookup = user_service.get_user_by_email_or_username
+    on_event_loop: list = list()
+
+    def recording_lookup(username_or_email: str, session):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+
+        return lookup(username_or_email, session)
+
+    monkeypatch.setattr(user_service, "get_user_by_email_or_username", recording_lookup)
+
+    response = client.post(f"{ROUTE_LOGIN}/token", data={"username": user.username, "password": password})
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert on_event_loop == [False]
+
+
+def test_principal_from_token_without_database(db_session):
+    user: User = TestUtils.create_random_user(db_session)
+    token: str = token_service.create_access_token_for_user(user)
+
+    principal: TokenPrincipal = asyncio.run(get_current_principal_from_token(token))
+
+    assert principal.id == user.id
+    assert principal.username == user.email
+
+    legacy_token: str = token_service.create_access_token(data={"sub": user.email})
+    with pytest.raises(HTTPException):
+        asyncio.run(get_current_principal_from_token(legacy_token))
+
+
+def test_full_user_rejects_revoked_token(db_session):
+    user: User = TestUtils.create_random_user(db_session)
+    principal: TokenPrincipal = token_service.principal_from_payload(
+        token_service.decode_access_token(token_service.create_access_token_for_user(user))
+    )
+
+    assert asyncio.run(get_current_user_from_token(principal, db_session)).id == user.id
+
+    user.token_version += 1
+    db_session.commit()
+
+    with pytest.raises(HTTPException):
+        asyncio.run(get_current_user_from_token(principal, db_session))
+
+
+def test_deactivated_user_token_is_rejected(client, user_and_header_with_bearer_token, db_session):
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+    job_data: dict = {"title": "t", "company": "c", "company_url": "u", "description": "d"}
+
+    # first request puts the token in the cache.
+    response = client.post("/jobs/create-job", json=job_data, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.OK
+    assert client.get(f"{ROUTE_LOGIN}/token-cache-stats").json().get("size") >= 1
+
+    user_service.deactivate_user(user.id, db_session)
+
+    token: str = header_with_bearer_token["Authorization"].split(" ")[1]
+    assert token_cache_service.get_principal(token) is None
+
+    # the stateless path decodes the token again, its claims still say active, the revocation record refuses it.
+    response = client.post("/jobs/create-job", json=job_data, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.UNAUTHORIZED
+
+    principal: TokenPrincipal = token_service.principal_from_payload(token_service.decode_access_token(token))
+    with pytest.raises(HTTPException):
+        asyncio.run(get_current_user_from_token(principal, db_session))
+
+
+def test_changed_password_revokes_old_tokens(client, user_and_header_with_bearer_token, db_session):
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+    job_data: dict = {"title": "t", "company": "c", "company_url": "u", "description": "d"}
+
+    assert client.post("/jobs/create-job", json=job_data, headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+
+    user_service.change_password(user.id, "new_password", db_session)
+
+    response = client.post("/jobs/create-job", json=job_data, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.UNAUTHORIZED
+
+    # a token from a login with the new password carries the new version, it is accepted.
+    response = client.post(f"{ROUTE_LOGIN}/token", data={"username": user.username, "password": "new_password"})
+    new_header: dict = {"Authorization": f"Bearer {response.json().get('access_token')}"}
+
+    assert client.post("/jobs/create-job", json=job_data, headers=new_header).status_code == http.HTTPStatus.OK
+    assert client.get(f"{ROUTE_LOGIN}/token-cache-stats").json().get("revocations") >= 1
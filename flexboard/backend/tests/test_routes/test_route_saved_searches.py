@@ -0,0 +1,108 @@
+import http
+
+from api_models.job import JobCreate
+from database.orm_models.saved_search import SavedSearch
+from database.orm_models.user import User
+from services.job_service import job_service
+from services.percolator_service import percolator_service
+from services.saved_search_service import saved_search_service
+
+ROUTE_SAVED_SEARCHES: str = "/saved-searches"
+
+
+def create_job(title: str, owner_id: int, session, location: str = "Remote"):
+    return job_service.create_new_job(
+        JobCreate(title=title, company="test company", company_url="testurl.com", description="this is a test!", location=location),
+        owner_id,
+        session
+    )
+
+
+def test_new_jobs_are_matched_against_saved_searches(client, user_and_header_with_bearer_token, db_session):
+    """
+    Tests /saved-searches: create, matches recorded by create-job and bulk-create, paging, delete.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    response = client.post(f"{ROUTE_SAVED_SEARCHES}/create-saved-search", json={"keywords": "python", "location": "Berlin"}, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.OK
+    saved_search_id: int = response.json()["id"]
+
+    create_job("Python Developer", user.id, db_session, location="Berlin")
+    create_job("Python Developer", user.id, db_session, location="Remote")
+    create_job("Go Developer", user.id, db_session, location="Berlin")
+
+    items: list = [
+        {"title": "Senior Python Engineer", "company": "c", "company_url": "u", "description": "d", "location": "Berlin, DE"},
+        {"title": "Designer", "company": "c", "company_url": "u", "description": "d", "location": "Berlin"},
+    ]
+    assert client.post("/jobs/bulk-create", json=items, headers=header_with_bearer_token).status_code == http.HTTPStatus.OK
+
+    # the matcher thread isn't running in tests, match what create-job / bulk-create queued.
+    assert saved_search_service.match_pending(db_session) == 2
+
+    first_page = client.get(f"{ROUTE_SAVED_SEARCHES}/list-matches?limit=1", headers=header_with_bearer_token).json()
+    assert [(item["title"], item["saved_search_id"]) for item in first_page["items"]] == [("Senior Python Engineer", saved_search_id)]
+
+    second_page = client.get(f"{ROUTE_SAVED_SEARCHES}/list-matches?limit=1&cursor={first_page['next_cursor']}", headers=header_with_bearer_token).json()
+    assert [(item["title"], item["location"]) for item in second_page["items"]] == [("Python Developer", "Berlin")]
+    assert second_page["next_cursor"] is None
+
+    response = client.delete(f"{ROUTE_SAVED_SEARCHES}/delete-saved-search/{saved_search_id}", headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.OK
+    assert client.get(f"{ROUTE_SAVED_SEARCHES}/list-matches", headers=header_with_bearer_token).json()["items"] == []
+    assert client.get(f"{ROUTE_SAVED_SEARCHES}/list-saved-searches", headers=header_with_bearer_token).json() == []
+    assert client.delete(f"{ROUTE_SAVED_SEARCHES}/delete-saved-search/{saved_search_id}", headers=header_with_bearer_token).status_code == http.HTTPStatus.NOT_FOUND
+
+
+def test_saved_searches_of_other_workers_are_picked_up(client, user_and_header_with_bearer_token, db_session):
+    """
+    A saved search inserted without going through this worker's index is read by the catch-up sync.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    db_session.add(SavedSearch(owner_id=user.id, keywords="rust"))
+    db_session.commit()
+    percolator_service.synced_at = 0.0  # as if SAVED_SEARCHES_SYNC_SECONDS went by
+
+    create_job("Rust Developer", user.id, db_session)
+    saved_search_service.match_pending(db_session)
+
+    items: list = client.get(f"{ROUTE_SAVED_SEARCHES}/list-matches", headers=header_with_bearer_token).json()["items"]
+    assert [item["title"] for item in items] == ["Rust Developer"]
+
+
+def test_saved_searches_committed_after_a_higher_id_are_picked_up(client, user_and_header_with_bearer_token, db_session):
+    """
+    Ids are handed out before commit: a saved search can become visible after one with a higher id was already synced.
+    The catch-up reads the recently created ones again.
+    """
+    user: User = user_and_header_with_bearer_token[0]
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    db_session.add(SavedSearch(id=5, owner_id=user.id, keywords="rust"))
+    db_session.commit()
+    saved_search_service.sync(db_session, force=True)
+    assert percolator_service.synced_id == 5
+
+    db_session.add(SavedSearch(id=3, owner_id=user.id, keywords="kotlin"))
+    db_session.commit()
+    percolator_service.synced_at = 0.0  # as if SAVED_SEARCHES_SYNC_SECONDS went by
+
+    create_job("Kotlin Developer", user.id, db_session)
+    saved_search_service.match_pending(db_session)
+
+    items: list = client.get(f"{ROUTE_SAVED_SEARCHES}/list-matches", headers=header_with_bearer_token).json()["items"]
+    assert [(item["title"], item["saved_search_id"]) for item in items] == [("Kotlin Developer", 3)]
+
+
+def test_create_saved_search_validation(client, user_and_header_with_bearer_token):
+    header_with_bearer_token: dict = user_and_header_with_bearer_token[1]
+
+    response = client.post(f"{ROUTE_SAVED_SEARCHES}/create-saved-search", json={"keywords": " !? "}, headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+
+    response = client.get(f"{ROUTE_SAVED_SEARCHES}/list-matches?cursor=nope", headers=header_with_bearer_token)
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
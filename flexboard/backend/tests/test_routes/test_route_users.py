@@ -1,6 +1,11 @@
 # We will use pytest for testing
 import json
 
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from api_models.user import UserCreate
+from database.daos.user_dao import user_dao
 from database.orm_models.user import User
 from services.user_service import user_service
 from tests.test_utils import TestUtils
@@ -54,3 +59,31 @@ def test_get_user_by_email(db_session):
     user: User = TestUtils.create_random_user(db_session)
     retrieved_user: User = user_service.get_user_by_email_or_username(user.email, db_session)
     assert user.email == retrieved_user.email
+
+
+def test_get_user_by_email_is_case_insensitive(db_session):
+    user: User = TestUtils.create_random_user(db_session)
+    retrieved_user: User = user_service.get_user_by_email_or_username(user.email.upper(), db_session)
+    assert user.id == retrieved_user.id
+
+
+def test_create_user_is_case_insensitive(client, db_session):
+    # a mixed case email stored around UserDao still blocks the same email in another case.
+    # (the rollback empties the test database again)
+    TestUtils.create_random_user(db_session, email="Bob@Email.com")
+    with pytest.raises(IntegrityError):
+        user_dao.create_new_user(UserCreate(username="other", email="BOB@email.com", password="p"), "hashed", db_session)
+    db_session.rollback()
+
+    data: dict = {"username": "Bob", "email": "Bob@Email.com", "password": "test_password"}
+
+    response = client.post(f"{ROUTE_USERS}/create-user", json=data)
+    assert response.status_code == 200
+    assert response.json() == {"username": "bob", "email": "bob@email.com", "is_active": True}
+
+    response = client.post("/login/token", data={"username": "BOB", "password": "test_password"})
+    assert response.status_code == 200
+
+    # the same username in another case, the route answers 400.
+    response = client.post(f"{ROUTE_USERS}/create-user", json={**data, "username": "BOB", "email": "other@email.com"})
+    assert response.status_code == 400
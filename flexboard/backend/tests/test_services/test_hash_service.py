@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from services.hash_service import HashService, HashServiceSaturatedError
+
+
+def test_verify_password_async():
+    service: HashService = HashService(max_workers=1, max_pending=4)
+    hashed_password: str = service.hash("password")
+
+    assert asyncio.run(service.verify_password_async("password", hashed_password))
+    assert not asyncio.run(service.verify_password_async("wrong", hashed_password))
+    # scheme prefix, ex. "{bcrypt}$2b$...", is stripped before verifying.
+    assert asyncio.run(service.verify_password_async("password", "{bcrypt}" + hashed_password))
+    assert service.pending == 0
+
+    service.shutdown()
+
+
+def test_hash_async_rejects_when_saturated():
+    service: HashService = HashService(max_workers=1, max_pending=1)
+
+    async def hash_twice():
+        first = asyncio.ensure_future(service.hash_async("password"))
+        await asyncio.sleep(0)  # let the first hash take the only slot.
+
+        with pytest.raises(HashServiceSaturatedError):
+            await service.hash_async("password")
+
+        return await first
+
+    assert service.verify_password("password", asyncio.run(hash_twice()))
+    service.shutdown()
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+from services.cache_backends import InMemoryCacheBackend, RedisCacheBackend
+from services.job_cache_service import JobCacheService
+from services.single_flight import SingleFlight
+
+
+class FakeRedis:
+    """
+    The handful of Redis commands RedisCacheBackend uses, on a dict. No expiry.
+    """
+
+    def __init__(self):
+        self.data: Dict[str, bytes] = dict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        self.data[key] = value
+
+    def delete(self, key: str):
+        self.data.pop(key, None)
+
+    def scan_iter(self, match: str):
+        return [key for key in list(self.data) if key.startswith(match.rstrip("*"))]
+
+
+def make_cache_service(backend=None) -> JobCacheService:
+    return JobCacheService(backend=backend or InMemoryCacheBackend(max_size=100), job_ttl_seconds=60, list_ttl_seconds=60)
+
+
+def test_read_through_caches_per_etag():
+    cache_service: JobCacheService = make_cache_service()
+    loads: List[int] = list()
+
+    def loader() -> bytes:
+        loads.append(1)
+        return f'{{"id":1,"version":{len(loads)}}}'.encode()
+
+    assert cache_service.get_job(1, '"job-1-a"', loader) == b'{"id":1,"version":1}'
+    assert cache_service.get_job(1, '"job-1-a"', loader) == b'{"id":1,"version":1}'
+    assert len(loads) == 1
+
+    # a write gives the job a new ETag, the old entry is never read again.
+    assert cache_service.get_job(1, '"job-1-b"', loader) == b'{"id":1,"version":2}'
+    assert cache_service.stats()["hits"] == 1
+
+
+def test_missing_job_is_not_cached():
+    cache_service: JobCacheService = make_cache_service()
+
+    assert cache_service.get_job(1, '"job-1-a"', lambda: None) is None
+    assert cache_service.get_job(1, '"job-1-a"', lambda: b"{}") == b"{}"
+
+
+def test_redis_compatible_backend():
+    cache_service: JobCacheService = make_cache_service(RedisCacheBackend(FakeRedis()))
+
+    assert cache_service.get_list_page('"jobs-a"', lambda: b"page") == b"page"
+    assert cache_service.get_list_page('"jobs-a"', lambda: b"not loaded") == b"page"
+    assert cache_service.get_list_page('"jobs-b"', lambda: b"changed page") == b"changed page"
+
+    cache_service.clear()
+    assert cache_service.backend.client.data == dict()
+
+
+def test_single_flight_runs_one_load_for_concurrent_misses():
+    single_flight: SingleFlight = SingleFlight()
+    loads: List[int] = list()
+    results: List[str] = list()
+    started: threading.Event = threading.Event()
+
+    def slow_load() -> str:
+        loads.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "value"
+
+    def worker():
+        results.append(single_flight.do("key", slow_load))
+
+    leader: threading.Thread = threading.Thread(target=worker)
+    leader.start()
+    started.wait()
+
+    followers: List[threading.Thread] = [threading.Thread(target=worker) for _ in range(5)]
+    for follower in followers:
+        follower.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(loads) == 1
+    assert results == ["value"] * 6
+
+
+def test_async_single_flight_runs_one_load_for_concurrent_misses():
+    cache_service: JobCacheService = make_cache_service()
+    loads: List[int] = list()
+
+    async def slow_load() -> bytes:
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return b"job"
+
+    async def run() -> list:
+        return await asyncio.gather(*[cache_service.get_job_async(1, '"job-1-a"', slow_load) for _ in range(10)])
+
+    assert asyncio.run(run()) == [b"job"] * 10
+    assert len(loads) == 1
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, List, Tuple
+
+from api_models.job import JobBulkCreateResult, JobCreate
+import pytest
+
+from services.job_import_service import ImportBodyTooLargeError, ImportItemError, JobImportService
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_import_jobs_in_batches():
+    service: JobImportService = JobImportService(batch_size=2, max_items=4, max_body_bytes=1024, max_line_bytes=1024)
+    batch_sizes: List[int] = list()
+
+    async def insert_batch(jobs: List[JobCreate]):
+        batch_sizes.append(len(jobs))
+        # pretend the database rejects the job titled "bad".
+        return ["Job could not be inserted." if job.title == "bad" else len(batch_sizes) * 10 + index for index, job in enumerate(jobs)]
+
+    line: bytes = b'{"title": "%s", "company": "c", "company_url": "u", "description": "d"}\n'
+    # NDJSON split across chunks in the middle of a line, 5 items but max_items is 4.
+    body: bytes = b"".join([line % b"a", line % b"bad", line % b"c", line % b"d", line % b"e"])
+    chunks = _chunks(body[:30], body[30:100], body[100:])
+
+    result: JobBulkCreateResult = asyncio.run(
+        service.import_jobs(service.iter_items("application/x-ndjson", chunks), insert_batch)
+    )
+
+    assert batch_sizes == [2, 2]
+    assert result.created == 3
+    assert result.ids == [10, 20, 21]
+    assert [(error.index, error.detail) for error in result.errors] == [(1, "Job could not be inserted.")]
+    assert result.truncated
+
+
+async def _collect(items) -> List[Tuple[int, Any]]:
+    return [item async for item in items]
+
+
+def test_import_body_limits():
+    service: JobImportService = JobImportService(batch_size=2, max_items=10, max_body_bytes=64, max_line_bytes=16)
+
+    # a JSON array is read until it is over the limit, not further.
+    read: List[bytes] = list()
+
+    async def json_chunks():
+        for chunk in (b"[" + b"1," * 20, b"2," * 20, b"3]"):
+            read.append(chunk)
+            yield chunk
+
+    with pytest.raises(ImportBodyTooLargeError):
+        asyncio.run(_collect(service.iter_items("application/json", json_chunks())))
+    assert len(read) == 2
+
+    # an NDJSON line over the limit is one bad item, even when it spans several chunks, the next lines still go in.
+    body: bytes = b'{"a": 1}\n' + b'{"b": "' + b"x" * 40 + b'"}\n' + b'{"c": 3}\n' + b"y" * 20
+    items: List[Tuple[int, Any]] = asyncio.run(
+        _collect(service.iter_items("application/x-ndjson", _chunks(body[:12], body[12:30], body[30:])))
+    )
+
+    assert [index for index, _ in items] == [0, 1, 2, 3]
+    assert items[0][1] == {"a": 1} and items[2][1] == {"c": 3}
+    assert isinstance(items[1][1], ImportItemError) and isinstance(items[3][1], ImportItemError)
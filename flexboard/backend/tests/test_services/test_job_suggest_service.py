@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from services.job_suggest_service import JobSuggestService
+
+
+def row(job_id: int, title: str, company: str = "Acme", location: str = "Remote") -> SimpleNamespace:
+    return SimpleNamespace(id=job_id, title=title, company=company, location=location)
+
+
+def build() -> JobSuggestService:
+    service: JobSuggestService = JobSuggestService(max_limit=10)
+    service.rebuild([
+        [row(1, "Python Developer"), row(2, "Senior Python Developer"), row(3, "python developer")],
+        [row(4, "Product Manager", company="Pyramid Inc", location="Paris")],
+    ])
+    return service
+
+
+def test_most_jobs_first_and_word_starts():
+    service: JobSuggestService = build()
+
+    assert service.suggest("py", 10, field="title") == [
+        {"field": "title", "value": "Python Developer", "count": 2},  # case insensitive, counted once per value
+        {"field": "title", "value": "Senior Python Developer", "count": 1},
+    ]
+    assert [suggestion["value"] for suggestion in service.suggest("PY", 10)] == [
+        "Python Developer", "Pyramid Inc", "Senior Python Developer"
+    ]
+    assert service.suggest("dev", 1) == [{"field": "title", "value": "Python Developer", "count": 2}]
+    assert service.suggest("ython", 10) == []
+
+
+def test_updates_and_deletes_refresh_cached_prefixes():
+    service: JobSuggestService = build()
+    assert service.suggest("p", 10, field="location") == [{"field": "location", "value": "Paris", "count": 1}]
+
+    service.index_job(5, "Go Developer", "Acme", "Porto")
+    assert [suggestion["value"] for suggestion in service.suggest("p", 10, field="location")] == ["Paris", "Porto"]
+
+    service.index_job(4, "Product Manager", "Pyramid Inc", "Lyon")  # update: the old values go away
+    assert service.suggest("p", 10, field="location") == [{"field": "location", "value": "Porto", "count": 1}]
+
+    service.index_job(5, "Go Developer", "Acme", "Porto", is_active=False)
+    service.remove_job(1)
+    assert service.suggest("p", 10, field="location") == []
+    assert service.suggest("python d", 10, field="title")[0] == {"field": "title", "value": "Python Developer", "count": 1}
+    assert service.stats() == {"enabled": True, "built": True, "jobs": 3, "values": 7}
+
+
+def test_limit_is_capped_and_disabled_suggests_nothing():
+    service: JobSuggestService = build()
+    service.index_job(10, "Dummy", "Acme", "Remote")
+
+    for job_id in range(20):
+        service.index_job(100 + job_id, f"Role {job_id}", "Acme", "Remote")
+
+    assert len(service.suggest("role", 50)) == 10
+
+    disabled: JobSuggestService = JobSuggestService(enabled=False)
+    disabled.index_job(1, "Python Developer", "Acme", "Remote")
+    assert disabled.suggest("py", 10) == []
@@ -0,0 +1,40 @@
+from services.percolator_service import PercolatorService
+
+
+def percolate(service: PercolatorService, title: str, company: str = "Acme", location: str = "Remote", description: str = "") -> set:
+    return set(service.percolate(title, company, location, description))
+
+
+def test_every_term_must_match_in_its_field():
+    service: PercolatorService = PercolatorService()
+    service.add(1, "python", None, None)
+    service.add(2, "Python, FastAPI", "remote", None)
+    service.add(3, None, "Paris", "Acme")
+    service.add(4, "acme", None, None)  # a keyword can be anywhere, also in the company
+
+    assert percolate(service, "Python Developer", description="We use FastAPI.") == {1, 2, 4}
+    assert percolate(service, "Python Developer", location="Paris, France") == {1, 3, 4}
+    assert percolate(service, "Go Developer", company="Other", location="Remote", description="acme python") == {1, 4}
+    assert percolate(service, "Designer", company="Paris Acme") == {4}  # "paris" is in the company, not the location
+
+
+def test_re_adding_and_removing_saved_searches():
+    service: PercolatorService = PercolatorService()
+    service.add(1, "python", None, None)
+    service.add(1, "golang", None, None)
+    service.add(2, "golang", "berlin", None)
+
+    assert percolate(service, "Python Developer") == set()
+    assert percolate(service, "Golang Developer", location="Berlin") == {1, 2}
+
+    service.remove(1)
+    service.remove(2)
+    assert percolate(service, "Golang Developer", location="Berlin") == set()
+    assert service.stats()["saved_searches"] == 0 and service.stats()["anchors"] == 0
+
+
+def test_disabled_matches_nothing():
+    service: PercolatorService = PercolatorService(enabled=False)
+    service.add(1, "python", None, None)
+
+    assert percolate(service, "Python Developer") == set()
@@ -0,0 +1,86 @@
+import threading
+from contextlib import nullcontext
+from typing import List, Tuple
+
+from api_models.job import JobCreate
+from services.cursor_service import cursor_service
+from services.percolator_service import PercolatorService
+from services.saved_search_service import SavedSearchService
+
+
+class RecordingSavedSearchDao:
+    """
+    Just what the matcher needs, no database: nothing to catch up on, and the recorded matches.
+    """
+    def __init__(self):
+        self.matches: List[Tuple[int, int]] = list()
+
+    def first_saved_search_id_since(self, since, session):
+        return None
+
+    def saved_searches_after(self, after_id: int, limit: int, session) -> list:
+        return list()
+
+    def record_matches(self, matches: List[Tuple[int, int]], session):
+        self.matches.extend(matches)
+
+
+def make_job(title: str) -> JobCreate:
+    return JobCreate(title=title, company="Acme", company_url="acme.com", description="d")
+
+
+def test_matcher_thread_matches_what_is_queued_before_stopping():
+    dao: RecordingSavedSearchDao = RecordingSavedSearchDao()
+    percolator: PercolatorService = PercolatorService()
+    percolator.add(1, "python", None, None)
+    service: SavedSearchService = SavedSearchService(dao, percolator, cursor_service)
+
+    service.start(lambda: nullcontext(None))
+    service.match_new_jobs([(10, make_job("Python Developer")), (11, make_job("Designer"))])
+    service.stop()
+
+    assert dao.matches == [(1, 10)]
+    assert service.stats()["pending"] == 0
+
+
+def test_pending_jobs_are_bounded():
+    dao: RecordingSavedSearchDao = RecordingSavedSearchDao()
+    percolator: PercolatorService = PercolatorService()
+    percolator.add(1, "python", None, None)
+    service: SavedSearchService = SavedSearchService(dao, percolator, cursor_service, max_pending=2)
+
+    service.match_new_jobs([(job_id, make_job("Python Developer")) for job_id in (10, 11, 12)])
+
+    assert service.stats()["dropped"] == 1
+    assert service.match_pending(None) == 2
+    assert dao.matches == [(1, 11), (1, 12)]
+
+
+def test_queueing_while_the_matcher_drains_loses_no_job():
+    dao: RecordingSavedSearchDao = RecordingSavedSearchDao()
+    percolator: PercolatorService = PercolatorService()
+    percolator.add(1, "python", None, None)
+    service: SavedSearchService = SavedSearchService(dao, percolator, cursor_service, max_pending=5)
+    job: JobCreate = make_job("Python Developer")
+    errors: list = list()
+
+    def create_jobs(first_id: int):
+        try:
+            for job_id in range(first_id, first_id + 2000):
+                service.match_new_jobs([(job_id, job)])
+        except Exception as error:
+            errors.append(error)
+
+    threads: List[threading.Thread] = [threading.Thread(target=create_jobs, args=(first_id,)) for first_id in (0, 10000)]
+
+    for thread in threads:
+        thread.start()
+
+    while any(thread.is_alive() for thread in threads):
+        service.match_pending(None)
+
+    service.match_pending(None)
+
+    # every job is either matched or counted as dropped, and queueing never failed a create.
+    assert errors == []
+    assert len(dao.matches) + service.stats()["dropped"] == 4000
@@ -0,0 +1,80 @@
+from api_models.token import TokenPrincipal
+from config import config_object
+from services.lru_cache import TTLLRUCache
+from services.token_cache_service import TokenCacheService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_principal(user_id: int, token_version: int = 0) -> TokenPrincipal:
+    return TokenPrincipal(id=user_id, username=f"user{user_id}@test.com", is_active=True, is_superuser=False, token_version=token_version)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: TTLLRUCache = TTLLRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # 'b' is now the least recently used
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_never_outlives_expires_at():
+    clock: FakeClock = FakeClock()
+    cache: TTLLRUCache = TTLLRUCache(max_size=10, default_ttl=300, clock=clock)
+    cache.set("token", "principal", expires_at=clock.now + 10)
+
+    clock.now += 9
+    assert cache.get("token") == "principal"
+
+    clock.now += 1
+    assert cache.get("token") is None
+
+    stats: dict = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+def test_invalidate_user_drops_all_tokens_of_user():
+    token_cache: TokenCacheService = TokenCacheService(max_size=10, ttl_seconds=300)
+    token_cache.put_principal("token-1", make_principal(1))
+    token_cache.put_principal("token-2", make_principal(1))
+    token_cache.put_principal("token-3", make_principal(2))
+
+    token_cache.invalidate_user(1)
+
+    assert token_cache.get_principal("token-1") is None
+    assert token_cache.get_principal("token-2") is None
+    assert token_cache.get_principal("token-3").id == 2
+    assert token_cache.stats()["invalidations"] == 1
+
+
+def test_revoke_user_refuses_older_token_versions_until_they_expire(monkeypatch):
+    monkeypatch.setattr(config_object, "JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    clock: FakeClock = FakeClock()
+    token_cache: TokenCacheService = TokenCacheService(max_size=10, ttl_seconds=300, clock=clock)
+    token_cache.put_principal("token-1", make_principal(1))
+
+    token_cache.revoke_user(1, token_version=1)
+
+    assert token_cache.get_principal("token-1") is None
+    assert token_cache.is_revoked(make_principal(1, token_version=0))
+    assert not token_cache.is_revoked(make_principal(1, token_version=1))
+    assert not token_cache.is_revoked(make_principal(2, token_version=0))
+
+    # an older revocation never lowers the record.
+    token_cache.revoke_user(1, token_version=0)
+    assert token_cache.is_revoked(make_principal(1, token_version=0))
+
+    # every token the record could refuse has expired by then, the next revocation drops it.
+    clock.now += 30 * 60 + 1
+    token_cache.revoke_user(2, token_version=1)
+    assert not token_cache.is_revoked(make_principal(1, token_version=0))
@@ -10,7 +10,7 @@ from services.hash_service import hash_service
 class TestUtils:
     # db_session is a fixture inside conftest.py
     @classmethod
-    def create_random_user(cls, session: Session, password: Optional[str] = None) -> User:
+    def create_random_user(cls, session: Session, password: Optional[str] = None, email: Optional[str] = None) -> User:
         modified_password: str = 'Testington!1'
         if password:
             modified_password: str = password
@@ -18,7 +18,7 @@ class TestUtils:
         new_user: User = User(
             username='Flexer Testington' + str(random.randint(0, 9999)),
             hashed_password=hash_service.hash(modified_password),
-            email='flexer@testington.com'
+            email=email or 'flexer@testington.com'
         )
 
         session.add(new_user)